@@ -7,6 +7,11 @@ from common import (
     Function,
     Set,
 )
+from common.instrumentation import instrument
+
+
+def _group_sizes(group) -> dict:
+    return {'elements': len(group), 'products': len(group._products)}
 
 
 class Group(Set):
@@ -38,6 +43,7 @@ class Group(Set):
         return self._products
         
     @property
+    @instrument('Group.closed_under_products', sizes=_group_sizes)
     def closed_under_products(self) -> bool:
         '''Check for closure under products'''
         # Check that nothing is included that is not in the group
@@ -86,6 +92,7 @@ class Group(Set):
         return inverses
 
     @property
+    @instrument('Group.is_associative', sizes=_group_sizes)
     def is_associative(self) -> bool:
         '''Check that the group operation is associative'''
         triples = itertools.product(self, repeat=3)
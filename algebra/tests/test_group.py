@@ -0,0 +1,52 @@
+import itertools
+import logging
+
+import pytest
+
+from common import instrumentation
+
+from ..group import Group, Set
+from ..samples import Dn, Zn
+
+
+def test_construction_records_closure_and_associativity():
+    with instrumentation.recording() as stats:
+        group = Zn(4)
+    assert len(group) == 4
+    assert stats['Group.closed_under_products']['calls'] == 1
+    assert stats['Group.is_associative']['calls'] == 1
+    assert stats['Group.is_associative']['seconds'] == stats['Group.is_associative']['max_seconds']
+
+def test_checks_are_recorded_each_time_they_run():
+    group = Dn(3)
+    with instrumentation.recording() as stats:
+        assert group.closed_under_products
+        assert group.is_associative
+        assert group.is_associative
+    assert stats['Group.closed_under_products']['calls'] == 1
+    assert stats['Group.is_associative']['calls'] == 2
+
+def test_failed_closure_check_stops_before_associativity():
+    elements = Set(0, 1)
+    products = {(a, b): (a + b) % 3 for a, b in itertools.product(elements, repeat=2)}
+    with instrumentation.recording() as stats:
+        with pytest.raises(ValueError):
+            Group(elements, products)
+    assert stats['Group.closed_under_products']['calls'] == 1
+    assert 'Group.is_associative' not in stats
+
+def test_slow_group_checks_are_logged_with_sizes(caplog):
+    with caplog.at_level(logging.WARNING, logger='common.instrumentation'):
+        with instrumentation.recording(slow_threshold=0) as stats:
+            Zn(5)
+    sizes = {'elements': 5, 'products': 25}
+    assert [call['sizes'] for call in stats.slow] == [sizes, sizes]
+    assert [call['phase'] for call in stats.slow] == ['Group.closed_under_products', 'Group.is_associative']
+    assert 'Group.is_associative took' in caplog.text
+
+def test_trace_memory_records_peaks():
+    with instrumentation.recording(trace_memory=True) as stats:
+        Dn(4)
+    for phase in ['Group.closed_under_products', 'Group.is_associative']:
+        assert isinstance(stats[phase]['peak_bytes'], int)
+        assert stats[phase]['peak_bytes'] >= 0
@@ -1,3 +1,4 @@
+from . import instrumentation
 from .function import Function
 from .set import Set
 
@@ -1,3 +1,4 @@
+from .instrumentation import instrument
 from .set import Set
 
 
@@ -57,6 +58,7 @@ class Function:
         mapping = {v: k for k, v in self.mapping.items()}
         return Function(mapping, self.codomain, self.domain)
 
+    @instrument('Function.fiber', sizes=lambda self, value: {'domain': len(self.domain)})
     def fiber(self, value):
         '''Get the preimage of a single value in the codomain'''
         if value not in self.codomain:
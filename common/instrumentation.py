@@ -0,0 +1,192 @@
+'''Opt-in instrumentation of hot code paths
+
+Functions decorated with instrument record their call count and wall time,
+but only while a recording is active. Otherwise the wrapper costs one global
+lookup and a branch per call.
+
+    with instrumentation.recording(slow_threshold=0.5, trace_memory=True) as stats:
+        Group(group_set, products)
+    print(stats.to_json())
+
+Calls slower than slow_threshold seconds are logged as warnings along with
+the sizes of their inputs, and kept in stats.slow.
+
+Each phase also gets net_blocks, the change in sys.getallocatedblocks() over
+its calls. That is cheap but only counts what is left allocated: a call that
+allocates and frees a million objects can still show 0, and a negative value
+means more was freed than kept. With trace_memory, tracemalloc also measures
+peak_bytes, the most memory any one call had allocated on top of what existed
+when it started. Tracing slows allocation-heavy code down severalfold.
+'''
+
+import contextlib
+import functools
+import json
+import logging
+import sys
+import time
+import tracemalloc
+
+logger = logging.getLogger(__name__)
+
+# The Stats being recorded into, or None when instrumentation is off
+_active = None
+
+# [traced memory at the start, highest peak seen so far] for each traced call in
+# progress, innermost last. tracemalloc has a single peak, which each call resets,
+# so the peak before the reset is carried over to the calls around it.
+_memory_frames = []
+
+
+class Stats:
+    '''Statistics collected while recording
+
+    Attributes:
+        phases (dict): name -> {'calls', 'seconds', 'max_seconds', 'net_blocks'}, plus
+            'peak_bytes' when tracing memory
+        slow (list): {'phase', 'seconds', 'sizes'} for each call over slow_threshold
+        slow_threshold (float): seconds above which a call is logged, or None
+        trace_memory (bool): whether peak_bytes is measured with tracemalloc
+    '''
+
+    def __init__(self, slow_threshold: float = None, trace_memory: bool = False) -> None:
+        self.phases = {}
+        self.slow = []
+        self.slow_threshold = slow_threshold
+        self.trace_memory = trace_memory
+        self._started_tracing = False
+
+    def _record(self, name: str, seconds: float, net_blocks: int, peak_bytes: int, sizes) -> None:
+        phase = self.phases.get(name)
+        if phase is None:
+            phase = self.phases[name] = {'calls': 0, 'seconds': 0.0, 'max_seconds': 0.0,
+                                         'net_blocks': 0}
+            if self.trace_memory:
+                phase['peak_bytes'] = 0
+        phase['calls'] += 1
+        phase['seconds'] += seconds
+        phase['max_seconds'] = max(phase['max_seconds'], seconds)
+        phase['net_blocks'] += net_blocks
+        if peak_bytes is not None:
+            phase['peak_bytes'] = max(phase['peak_bytes'], peak_bytes)
+        if self.slow_threshold is not None and seconds > self.slow_threshold:
+            self.slow.append({'phase': name, 'seconds': seconds, 'sizes': sizes})
+            logger.warning('%s took %.3fs (input sizes: %s)', name, seconds, sizes)
+
+    def __getitem__(self, name: str) -> dict:
+        return self.phases[name]
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.phases
+
+    def __repr__(self):
+        return 'Stats({})'.format(', '.join(['{}: {} calls, {:.6f}s'.format(name, phase['calls'], phase['seconds'])
+                                             for name, phase in self.phases.items()]))
+
+    def to_dict(self) -> dict:
+        return {'phases': {name: dict(phase) for name, phase in self.phases.items()},
+                'slow': [dict(call) for call in self.slow],
+                'slow_threshold': self.slow_threshold,
+                'trace_memory': self.trace_memory}
+
+    def _start(self) -> None:
+        if self.trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracing = True
+
+    def _stop(self) -> None:
+        if self._started_tracing:
+            tracemalloc.stop()
+            self._started_tracing = False
+
+    def to_json(self, path: str = None, **kwargs) -> str:
+        '''Serialize the statistics as JSON, also writing them to path if given'''
+        text = json.dumps(self.to_dict(), **kwargs)
+        if path is not None:
+            with open(path, 'w') as f:
+                f.write(text)
+        return text
+
+
+def instrument(name: str, sizes=None):
+    '''Decorator recording calls of a function under name while a recording is active
+
+    sizes, if given, is called with the same arguments as the function to
+    describe its inputs (for example lambda self: {'elements': len(self)}).
+    It is only evaluated when slow calls are being logged.
+    '''
+    def decorator(function):
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            stats = _active
+            if stats is None:
+                return function(*args, **kwargs)
+            # Measure the sizes first, since some functions consume or extend their inputs
+            described = (sizes(*args, **kwargs)
+                         if sizes is not None and stats.slow_threshold is not None else None)
+            traced = stats.trace_memory and tracemalloc.is_tracing()
+            if traced:
+                current, peak = tracemalloc.get_traced_memory()
+                if _memory_frames:
+                    _memory_frames[-1][1] = max(_memory_frames[-1][1], peak)
+                tracemalloc.reset_peak()
+                _memory_frames.append([current, current])
+            blocks = sys.getallocatedblocks()
+            start = time.perf_counter()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                seconds = time.perf_counter() - start
+                net_blocks = sys.getallocatedblocks() - blocks
+                peak_bytes = None
+                if traced:
+                    start_bytes, peak = _memory_frames.pop()
+                    peak = max(peak, tracemalloc.get_traced_memory()[1])
+                    if _memory_frames:
+                        _memory_frames[-1][1] = max(_memory_frames[-1][1], peak)
+                    peak_bytes = peak - start_bytes
+                stats._record(name, seconds, net_blocks, peak_bytes, described)
+        return wrapper
+    return decorator
+
+
+def enable(slow_threshold: float = None, trace_memory: bool = False) -> Stats:
+    '''Start recording into a new Stats object, which is returned
+
+    With trace_memory, tracemalloc is started if it is not already running.
+    '''
+    global _active
+    disable()
+    _active = Stats(slow_threshold, trace_memory)
+    _active._start()
+    return _active
+
+
+def disable() -> Stats:
+    '''Stop recording and return what was recorded (None if nothing was)
+
+    tracemalloc is stopped again if enable started it.
+    '''
+    global _active
+    stats, _active = _active, None
+    if stats is not None:
+        stats._stop()
+    return stats
+
+
+@contextlib.contextmanager
+def recording(slow_threshold: float = None, trace_memory: bool = False):
+    '''Record instrumented calls made inside the with block into the Stats it yields
+
+    Any recording already active resumes afterwards, without the block's calls.
+    With trace_memory, tracemalloc runs for the duration of the block.
+    '''
+    global _active
+    previous = _active
+    stats = _active = Stats(slow_threshold, trace_memory)
+    stats._start()
+    try:
+        yield stats
+    finally:
+        _active = previous
+        stats._stop()
@@ -0,0 +1,110 @@
+import json
+import logging
+import tracemalloc
+
+from .. import instrumentation
+from ..instrumentation import instrument
+
+_kept = []
+
+
+@instrument('square', sizes=lambda n: {'n': n})
+def square(n):
+    return n * n
+
+@instrument('churn')
+def churn(count):
+    # Allocates count objects and frees them all again
+    return len([object() for _ in range(count)])
+
+@instrument('keep')
+def keep(count):
+    _kept.extend([object() for _ in range(count)])
+
+@instrument('buffer')
+def buffer(size, then=None):
+    data = bytearray(size)
+    del data
+    if then is not None:
+        then()
+
+
+def test_nothing_recorded_outside_a_recording():
+    with instrumentation.recording() as stats:
+        pass
+    assert square(3) == 9
+    assert stats.phases == {}
+    assert instrumentation.disable() is None
+
+def test_records_calls_and_time():
+    with instrumentation.recording() as stats:
+        square(2)
+        square(3)
+    phase = stats['square']
+    assert phase['calls'] == 2
+    assert 0 <= phase['max_seconds'] <= phase['seconds']
+    assert 'peak_bytes' not in phase
+    exported = json.loads(stats.to_json())
+    assert exported['phases']['square']['calls'] == 2
+    assert exported['slow'] == []
+    assert exported['trace_memory'] is False
+
+def test_nested_recordings():
+    with instrumentation.recording() as outer:
+        square(1)
+        with instrumentation.recording() as inner:
+            churn(10)
+        square(1)
+    assert outer['square']['calls'] == 2
+    assert 'churn' not in outer
+    assert inner['churn']['calls'] == 1
+
+def test_enable_and_disable():
+    stats = instrumentation.enable()
+    square(2)
+    assert instrumentation.disable() is stats
+    square(2)
+    assert stats['square']['calls'] == 1
+
+def test_slow_calls_are_logged(caplog):
+    with caplog.at_level(logging.WARNING, logger='common.instrumentation'):
+        with instrumentation.recording(slow_threshold=0) as stats:
+            square(7)
+    assert stats.slow == [{'phase': 'square', 'seconds': stats['square']['seconds'], 'sizes': {'n': 7}}]
+    assert 'square took' in caplog.text
+
+def test_net_blocks_only_counts_what_is_kept():
+    with instrumentation.recording() as stats:
+        churn(10000)
+        keep(10000)
+    assert abs(stats['churn']['net_blocks']) < 1000
+    assert stats['keep']['net_blocks'] >= 9000
+    del _kept[:]
+
+def test_trace_memory_measures_peak_bytes():
+    assert not tracemalloc.is_tracing()
+    with instrumentation.recording(trace_memory=True) as stats:
+        assert tracemalloc.is_tracing()
+        buffer(10 ** 6)
+        churn(10000)
+    assert not tracemalloc.is_tracing()
+    assert stats['buffer']['peak_bytes'] >= 10 ** 6
+    assert abs(stats['buffer']['net_blocks']) < 100
+    assert stats['churn']['peak_bytes'] > 10000 * 16
+
+def test_nested_traced_calls_keep_their_peaks():
+    with instrumentation.recording(trace_memory=True) as stats:
+        # The outer call's peak comes before the inner call resets tracemalloc's peak
+        buffer(2 * 10 ** 6, then=lambda: buffer(10 ** 6))
+    assert stats['buffer']['calls'] == 2
+    assert stats['buffer']['peak_bytes'] >= 2 * 10 ** 6
+
+def test_trace_memory_leaves_running_tracemalloc_alone():
+    tracemalloc.start()
+    try:
+        with instrumentation.recording(trace_memory=True) as stats:
+            buffer(10 ** 6)
+        assert tracemalloc.is_tracing()
+        assert stats['buffer']['peak_bytes'] >= 10 ** 6
+    finally:
+        tracemalloc.stop()
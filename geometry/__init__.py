@@ -0,0 +1,34 @@
+from .geometry import (
+    Point,
+    PointView,
+    Points,
+    Line,
+    Polygon,
+    DynamicHull,
+    isClockwise,
+    plotLines,
+    hullIndices,
+)
+
+from .delaunay import (
+    Triangulation,
+    Voronoi,
+)
+
+from .incircle import (
+    incircle,
+    circleSide,
+    INSIDE,
+    OUTSIDE,
+    COCIRCULAR,
+)
+
+from .index import GridIndex
+
+from .orient2d import (
+    orient2d,
+    orientation,
+    LEFT,
+    RIGHT,
+    COLLINEAR,
+)
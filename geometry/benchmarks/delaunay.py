@@ -0,0 +1,44 @@
+'''Benchmark Points.delaunay and the structures derived from it
+
+Run from the repository root:
+
+    python -m geometry.benchmarks.delaunay [size ...]
+'''
+
+import sys
+import time
+
+import numpy as np
+
+from geometry.benchmarks.hull import DISTRIBUTIONS
+from geometry.geometry import Points
+
+
+def benchmark(sizes, seed=0):
+    rng = np.random.default_rng(seed)
+    results = []
+    for name, distribution in DISTRIBUTIONS.items():
+        for n in sizes:
+            points = Points.fromNPArray(*distribution(n, rng))
+            start = time.perf_counter()
+            triangulation = points.delaunay()
+            triangulated = time.perf_counter()
+            triangulation.voronoi()
+            voronoi = time.perf_counter()
+            triangulation.mst()
+            mst = time.perf_counter()
+            results.append({'distribution': name, 'n': n, 'triangles': len(triangulation.triangles),
+                            'delaunay': triangulated - start, 'voronoi': voronoi - triangulated,
+                            'mst': mst - voronoi, 'points_per_second': n / (triangulated - start)})
+    return results
+
+
+def main(argv):
+    sizes = [int(float(arg)) for arg in argv] or [10**4, 10**5]
+    for result in benchmark(sizes):
+        print('{distribution:>8} n={n:>7} triangles={triangles:>7} delaunay {delaunay:7.3f}s '
+              'voronoi {voronoi:6.3f}s mst {mst:6.3f}s {points_per_second:9.0f} points/s'.format(**result))
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
@@ -0,0 +1,109 @@
+'''Benchmark and cross-check the Points and Polygon hot paths on every distribution
+
+For each distribution and size this times building Points (wrapping arrays
+and copying them in with extend), appending and popping points one by one,
+convexHull (with its throughput in points per second), isConvex on the hull
+and rendering the points and hull on Agg. It also records the peak memory
+allocated by convexHull (from tracemalloc, which slows Python code down a
+lot, so only up to memoryLimit points). Up to checkLimit points, the hull is
+compared vertex for vertex with referenceHull, so faster hull implementations
+can be verified against a simple one.
+
+Run from the repository root:
+
+    python -m geometry.benchmarks.harness [size ...]
+'''
+
+import sys
+import time
+import tracemalloc
+
+import matplotlib
+
+matplotlib.use('Agg')
+
+import numpy as np  # noqa: E402
+
+from geometry.benchmarks.hull import DISTRIBUTIONS, referenceHull  # noqa: E402
+from geometry.benchmarks.render import render  # noqa: E402
+from geometry.geometry import Point, Points  # noqa: E402
+
+
+def timed(function):
+    '''Run function once, returning its result and the seconds it took'''
+    start = time.perf_counter()
+    result = function()
+    return result, time.perf_counter() - start
+
+
+def peakMemory(function):
+    '''Peak number of bytes allocated while running function once'''
+    tracemalloc.start()
+    try:
+        function()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def appendPop(x, y, count):
+    '''Seconds to append count points one at a time to a copy of (x, y), then pop them'''
+    points = Points.fromNPArray(x, y)
+    new = [Point(x[idx].item(), y[idx].item()) for idx in range(count)]
+    start = time.perf_counter()
+    for point in new:
+        points.append(point)
+    appended = time.perf_counter()
+    for _ in range(count):
+        points.pop()
+    return appended - start, time.perf_counter() - appended
+
+
+def matchesReference(hull, x, y):
+    return list(zip(hull.points.npx.tolist(), hull.points.npy.tolist())) == referenceHull(x, y)
+
+
+def benchmark(sizes, distributions=None, seed=0, checkLimit=10**6, memoryLimit=10**6, draw=True):
+    rng = np.random.default_rng(seed)
+    results = []
+    for name in distributions or DISTRIBUTIONS:
+        for n in sizes:
+            x, y = DISTRIBUTIONS[name](n, rng)
+            points, wrap = timed(lambda: Points.fromNPArray(x, y))
+            _, extend = timed(lambda: Points().extend(x, y))
+            count = min(n, 10**4)
+            append, pop = appendPop(x, y, count)
+            hull, hullSeconds = timed(points.convexHull)
+            convex, isConvex = timed(hull.isConvex)
+            result = {'distribution': name, 'n': n, 'hull_size': len(hull.points),
+                      'wrap': wrap, 'extend': extend, 'append': append / count, 'pop': pop / count,
+                      'hull': hullSeconds, 'points_per_second': n / hullSeconds,
+                      'is_convex': isConvex, 'convex': convex,
+                      'points_bytes': points.npx.nbytes + points.npy.nbytes,
+                      'hull_peak_bytes': peakMemory(points.convexHull) if n <= memoryLimit else None,
+                      'render': None, 'matches_reference': None}
+            if draw:
+                result['render'] = render(lambda axes: (points.plot(axes, decimate=True),
+                                                        hull.plotBoundary(axes)))
+            if n <= checkLimit:
+                result['matches_reference'] = matchesReference(hull, x, y)
+            results.append(result)
+    return results
+
+
+def main(argv):
+    sizes = [int(float(arg)) for arg in argv] or [10**3, 10**4, 10**5, 10**6, 10**7]
+    failed = False
+    for result in benchmark(sizes):
+        print('{distribution:>9} n={n:>8} hull={hull_size:>8} extend {extend:7.4f}s append {append:.1e}s '
+              'pop {pop:.1e}s hull {hull:7.3f}s ({points_per_second:10.0f} points/s) isConvex '
+              '{is_convex:7.4f}s render {render:6.3f}s hull peak {hull_peak_bytes!s:>11} bytes '
+              'reference {matches_reference!s}'.format(**result))
+        # Hulls of three or more vertices must be strictly convex
+        failed |= result['matches_reference'] is False or (result['hull_size'] > 2 and not result['convex'])
+    if failed:
+        sys.exit('hull differs from referenceHull or is not convex')
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
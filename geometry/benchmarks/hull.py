@@ -0,0 +1,104 @@
+'''Benchmark Points.convexHull on large random inputs
+
+Run from the repository root:
+
+    python -m geometry.benchmarks.hull [size ...]
+'''
+
+import sys
+import time
+
+import numpy as np
+
+from geometry.geometry import Points
+from geometry.orient2d import RIGHT, orientation
+
+
+def uniformSquare(n, rng):
+    return rng.random(n), rng.random(n)
+
+
+def uniformDisk(n, rng):
+    r = np.sqrt(rng.random(n))
+    theta = 2 * np.pi * rng.random(n)
+    return r * np.cos(theta), r * np.sin(theta)
+
+
+def circle(n, rng):
+    '''Points on the unit circle, so (up to rounding) every point is a hull vertex'''
+    theta = 2 * np.pi * rng.random(n)
+    return np.cos(theta), np.sin(theta)
+
+
+def clustered(n, rng, clusters=10, spread=0.02):
+    '''Tight Gaussian clusters around random centres in the unit square'''
+    centres = rng.random((clusters, 2))
+    labels = rng.integers(clusters, size=n)
+    return (centres[labels, 0] + spread * rng.normal(size=n),
+            centres[labels, 1] + spread * rng.normal(size=n))
+
+
+def collinear(n, rng):
+    '''Points exactly on the line y = 2x (doubling is exact), so the hull is a segment'''
+    x = rng.random(n)
+    return x, 2 * x
+
+
+DISTRIBUTIONS = {
+    'square': uniformSquare,
+    'disk': uniformDisk,
+    'circle': circle,
+    'clustered': clustered,
+    'collinear': collinear,
+}
+
+
+def referenceHull(x, y):
+    '''Hull vertices of the points as a list of (x, y), by a plain monotone chain
+
+    This is the straightforward algorithm convexHull started out as, with the
+    exact orientation predicate: no filtering and no vectorization, so it is
+    slow but easy to trust. Its output has the same convention as convexHull
+    (clockwise from the smallest point, collinear points dropped).
+    '''
+    points = sorted(zip(np.asarray(x, dtype=float).tolist(), np.asarray(y, dtype=float).tolist()))
+    if len(points) < 3:
+        return points
+
+    def chain(ordered):
+        kept = []
+        for point in ordered:
+            while len(kept) > 1 and orientation(*kept[-2], *kept[-1], *point) != RIGHT:
+                kept.pop()
+            kept.append(point)
+        return kept
+
+    upper = chain(points)
+    lower = chain(reversed(points))
+    return upper + lower[1:-1]
+
+
+def benchmark(sizes, seed=0):
+    rng = np.random.default_rng(seed)
+    results = []
+    for name, distribution in DISTRIBUTIONS.items():
+        for n in sizes:
+            x, y = distribution(n, rng)
+            points = Points.fromNPArray(x, y)
+            start = time.perf_counter()
+            hull = points.convexHull()
+            elapsed = time.perf_counter() - start
+            results.append({'distribution': name, 'n': n, 'seconds': elapsed,
+                            'hull_size': len(hull.points), 'points_per_second': n / elapsed})
+    return results
+
+
+def main(argv):
+    sizes = [int(float(arg)) for arg in argv] or [10**6, 10**7]
+    for result in benchmark(sizes):
+        print('{distribution:>8} n={n:>9} {seconds:8.3f}s hull={hull_size:>4} '
+              '{points_per_second:12.0f} points/s'.format(**result))
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
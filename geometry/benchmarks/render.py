@@ -0,0 +1,69 @@
+'''Benchmark Polygon and Points plotting on the headless Agg backend
+
+Run from the repository root:
+
+    python -m geometry.benchmarks.render [size ...]
+'''
+
+import sys
+import time
+
+import matplotlib
+
+matplotlib.use('Agg')
+
+import matplotlib.pyplot as plt  # noqa: E402
+import numpy as np  # noqa: E402
+
+from geometry.geometry import Line, Points, Polygon  # noqa: E402
+
+
+def regularPolygon(n):
+    theta = -2 * np.pi * np.arange(n) / n
+    return Polygon(Points.fromNPArray(np.cos(theta), np.sin(theta)))
+
+
+def plotEdgeByEdge(polygon, destination):
+    '''The unbatched drawing: one Line, and so three artists, per edge'''
+    points = list(polygon.points) + [polygon.points[0]]
+    for p1, p2 in zip(points, points[1:]):
+        Line(p1, p2).plot(destination)
+
+
+def render(draw):
+    '''Seconds to build the artists with draw(axes) and render the figure'''
+    figure, axes = plt.subplots(figsize=(8, 8), dpi=100)
+    start = time.perf_counter()
+    draw(axes)
+    figure.canvas.draw()
+    elapsed = time.perf_counter() - start
+    plt.close(figure)
+    return elapsed
+
+
+def benchmark(sizes, seed=0, edgeByEdgeLimit=2000):
+    rng = np.random.default_rng(seed)
+    results = []
+    for n in sizes:
+        polygon = regularPolygon(n)
+        results.append({'case': 'plotBoundary', 'n': n, 'seconds': render(polygon.plotBoundary)})
+        if n <= edgeByEdgeLimit:
+            results.append({'case': 'edge by edge', 'n': n,
+                            'seconds': render(lambda axes: plotEdgeByEdge(polygon, axes))})
+        points = Points.fromNPArray(rng.normal(size=n), rng.normal(size=n))
+        results.append({'case': 'Points.plot', 'n': n, 'seconds': render(points.plot)})
+        results.append({'case': 'decimated', 'n': n,
+                        'seconds': render(lambda axes: points.plot(axes, decimate=True))})
+        results.append({'case': 'density', 'n': n,
+                        'seconds': render(lambda axes: points.plot(axes, bins=200))})
+    return results
+
+
+def main(argv):
+    sizes = [int(float(arg)) for arg in argv] or [10**3, 10**4, 10**5, 10**6]
+    for result in benchmark(sizes):
+        print('{case:>13} n={n:>8} {seconds:8.3f}s'.format(**result))
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
@@ -0,0 +1,338 @@
+'''Delaunay triangulation by randomized incremental insertion
+
+Points are inserted in random order, and each new point is located with the
+history DAG of every triangle ever created: a destroyed triangle points to
+the two or three triangles that replaced it, so locating a point walks down
+from the root in expected O(log n) steps. Edges made illegal by the new point
+are then flipped.
+
+Rather than an enclosing super-triangle, whose finite vertices can break the
+Delaunay property near the hull, the triangulation has a vertex at infinity
+(-1). Every hull edge has a ghost triangle joining it to that vertex, whose
+"circumcircle" is the open half-plane beyond the edge (plus the edge itself).
+For point location the region of a ghost triangle is the part of that
+half-plane in the wedge from a fixed interior point through the edge, so the
+regions of all triangles tile the plane.
+'''
+
+import numpy as np
+
+from .incircle import INSIDE, circleSide
+from .orient2d import COLLINEAR, ERRBOUND, LEFT, RIGHT, orientation
+
+INFINITE = -1
+
+
+def _triangulate(xs, ys, order):
+    '''Delaunay triangles (and their neighbours) of distinct points, not all collinear
+
+    order is the insertion order, starting with three points that are not
+    collinear. Returns the vertex and neighbour triples of the finite leaf
+    triangles of the history DAG, with the leaves' DAG ids.
+    '''
+    a, b, c = order[:3]
+    if orientation(xs[a], ys[a], xs[b], ys[b], xs[c], ys[c]) != LEFT:
+        b, c = c, b
+    # Ghost triangles (x, y, INFINITE) have the outside of the hull to the left of x -> y
+    vertices = [None, (a, b, c), (b, a, INFINITE), (c, b, INFINITE), (a, c, INFINITE)]
+    neighbours = [None, [3, 4, 2], [4, 3, 1], [2, 4, 1], [3, 2, 1]]
+    children = [(1, 2, 3, 4), None, None, None, None]
+    # How each node's region is divided among its children: the segment (x, y) for
+    # two children, or the new point and the old corners for three
+    splits = [None] * 5
+    # The wedges of the ghost triangles all start at this point inside the hull
+    cx, cy = (xs[a] + xs[b] + xs[c]) / 3, (ys[a] + ys[b] + ys[c]) / 3
+
+    def left(a, b, p):
+        '''Side of the line a -> b that p is on (LEFT, RIGHT or COLLINEAR)
+
+        The line from a point to the infinite vertex is the ray from the
+        wedges' apex through that point.
+        '''
+        if b == INFINITE:
+            ax, ay, bx, by = cx, cy, xs[a], ys[a]
+        elif a == INFINITE:
+            ax, ay, bx, by = xs[b], ys[b], cx, cy
+        else:
+            ax, ay, bx, by = xs[a], ys[a], xs[b], ys[b]
+        px, py = xs[p], ys[p]
+        # Inline the certified floating point case of orientation
+        detLeft = (bx - ax) * (py - ay)
+        detRight = (by - ay) * (px - ax)
+        det = detLeft - detRight
+        bound = ERRBOUND * (abs(detLeft) + abs(detRight))
+        if det > bound:
+            return LEFT
+        if -det > bound:
+            return RIGHT
+        return orientation(ax, ay, bx, by, px, py)
+
+    def locate(p):
+        t = 0
+        while children[t] is not None:
+            below = children[t]
+            if len(below) == 2:
+                x, y = splits[t]
+                t = below[0] if left(x, y, p) >= 0 else below[1]
+            elif len(below) == 3:
+                # Children (r, b, c), (r, c, a) and (r, a, b) fan around the new point r
+                r, a, b, c = splits[t]
+                if left(r, a, p) >= 0:
+                    t = below[2] if left(r, b, p) <= 0 else below[0] if left(r, c, p) <= 0 else below[1]
+                else:
+                    t = below[1] if left(r, c, p) >= 0 else below[0]
+            else:
+                for child in below:
+                    a, b, c = vertices[child]
+                    if left(a, b, p) >= 0 and left(b, c, p) >= 0 and left(c, a, p) >= 0:
+                        t = child
+                        break
+        return t
+
+    def new(triangle, adjacent):
+        vertices.append(triangle)
+        neighbours.append(adjacent)
+        children.append(None)
+        splits.append(None)
+        return len(vertices) - 1
+
+    def relink(t, old, replacement):
+        '''Point the neighbour t at replacement instead of old'''
+        adjacent = neighbours[t]
+        adjacent[adjacent.index(old)] = replacement
+
+    def inGhostCircle(a, b, p):
+        '''Whether p is in the circumcircle of the ghost triangle on the edge a -> b'''
+        side = orientation(xs[a], ys[a], xs[b], ys[b], xs[p], ys[p])
+        if side != COLLINEAR:
+            return side == LEFT
+        # On the edge's line, only the open edge itself is inside
+        return min((xs[a], ys[a]), (xs[b], ys[b])) < (xs[p], ys[p]) < max((xs[a], ys[a]), (xs[b], ys[b]))
+
+    def illegal(a, b, r, d):
+        '''Whether the edge ab between triangles (r, a, b) and (d, b, a) must be flipped'''
+        if d == INFINITE:
+            return False
+        if a == INFINITE:
+            return inGhostCircle(d, b, r)
+        if b == INFINITE:
+            return inGhostCircle(a, d, r)
+        return circleSide(xs[r], ys[r], xs[a], ys[a], xs[b], ys[b], xs[d], ys[d]) == INSIDE
+
+    def legalize(stack):
+        # Every triangle on the stack has the new point first, facing the edge to check
+        while stack:
+            t = stack.pop()
+            if children[t] is not None:
+                continue
+            u = neighbours[t][0]
+            j = neighbours[u].index(t)
+            r, a, b = vertices[t]
+            d = vertices[u][j]
+            if not illegal(a, b, r, d):
+                continue
+            uAcrossA = neighbours[u][(j + 2) % 3]
+            uAcrossB = neighbours[u][(j + 1) % 3]
+            tAcrossA, tAcrossB = neighbours[t][1], neighbours[t][2]
+            e = new((r, a, d), [uAcrossB, -1, tAcrossB])
+            f = new((r, d, b), [uAcrossA, tAcrossA, e])
+            neighbours[e][1] = f
+            relink(uAcrossB, u, e)
+            relink(tAcrossB, t, e)
+            relink(uAcrossA, u, f)
+            relink(tAcrossA, t, f)
+            children[t] = children[u] = (f, e)
+            splits[t] = splits[u] = (r, d)
+            stack.extend([e, f])
+
+    for p in order[3:]:
+        t = locate(p)
+        a, b, c = vertices[t]
+        if INFINITE in (a, b, c):
+            # Only the finite edge of a ghost triangle is a real edge to split
+            k = (a, b, c).index(INFINITE)
+            x, y = (b, c) if k == 0 else (c, a) if k == 1 else (a, b)
+            if left(x, y, p) != COLLINEAR:
+                k = None
+        else:
+            sides = (left(b, c, p), left(c, a, p), left(a, b, p))
+            k = sides.index(COLLINEAR) if COLLINEAR in sides else None
+        if k is None:
+            na, nb, nc = neighbours[t]
+            t1 = new((p, b, c), [na, -1, -1])
+            t2 = new((p, c, a), [nb, -1, t1])
+            t3 = new((p, a, b), [nc, t1, t2])
+            neighbours[t1][1:] = [t2, t3]
+            neighbours[t2][1] = t3
+            relink(na, t, t1)
+            relink(nb, t, t2)
+            relink(nc, t, t3)
+            children[t] = (t1, t2, t3)
+            splits[t] = (p, a, b, c)
+            legalize([t1, t2, t3])
+            continue
+        # The point is on the edge opposite vertex k: split t and the triangle across it
+        a, b, c = vertices[t][k], vertices[t][(k + 1) % 3], vertices[t][(k + 2) % 3]
+        u = neighbours[t][k]
+        nb, nc = neighbours[t][(k + 1) % 3], neighbours[t][(k + 2) % 3]
+        j = neighbours[u].index(t)
+        d = vertices[u][j]
+        uAcrossC, uAcrossB = neighbours[u][(j + 1) % 3], neighbours[u][(j + 2) % 3]
+        A = new((p, c, a), [nb, -1, -1])
+        B = new((p, a, b), [nc, -1, A])
+        C = new((p, b, d), [uAcrossC, -1, B])
+        D = new((p, d, c), [uAcrossB, A, C])
+        neighbours[A][1:] = [B, D]
+        neighbours[B][1] = C
+        neighbours[C][1] = D
+        relink(nb, t, A)
+        relink(nc, t, B)
+        relink(uAcrossC, u, C)
+        relink(uAcrossB, u, D)
+        children[t] = (B, A)
+        children[u] = (D, C)
+        splits[t] = (p, a)
+        splits[u] = (p, d)
+        legalize([A, B, C, D])
+
+    leaves = [t for t in range(1, len(vertices))
+              if children[t] is None and INFINITE not in vertices[t]]
+    return [vertices[t] for t in leaves], [neighbours[t] for t in leaves], leaves
+
+
+def _startingTriangle(xs, ys, order):
+    '''The first two points of the order and the next one that makes a proper triangle
+    with them, or None if the points are collinear
+
+    The triangle's centroid (computed in floating point) must be strictly
+    inside it, since it anchors the ghost triangles' wedges.
+    '''
+    if len(order) < 3:
+        return None
+    a, b = order[:2]
+    for c in order[2:]:
+        cx, cy = (xs[a] + xs[b] + xs[c]) / 3, (ys[a] + ys[b] + ys[c]) / 3
+        sides = {orientation(xs[a], ys[a], xs[b], ys[b], cx, cy),
+                 orientation(xs[b], ys[b], xs[c], ys[c], cx, cy),
+                 orientation(xs[c], ys[c], xs[a], ys[a], cx, cy)}
+        if len(sides) == 1 and COLLINEAR not in sides:
+            return [a, b, c]
+    return None
+
+
+class Voronoi:
+    '''Voronoi diagram dual to a Delaunay triangulation
+
+    vertices holds the circumcentre of each Delaunay triangle. Each ridge
+    separates the two input points ridgePoints[i] and joins the vertices
+    ridgeVertices[i]; unbounded ridges have -1 as their second vertex and leave
+    their first vertex in the direction directions[i] (zero for bounded ones).
+    '''
+    def __init__(self, vertices, ridgePoints, ridgeVertices, directions):
+        self.vertices = vertices
+        self.ridgePoints = ridgePoints
+        self.ridgeVertices = ridgeVertices
+        self.directions = directions
+
+
+class Triangulation:
+    '''Delaunay triangulation of a set of points, as compact index arrays
+
+    triangles is an (m, 3) array of point indices in counterclockwise order and
+    neighbors[t, k] is the triangle across the edge opposite triangles[t, k], or
+    -1 on the convex hull. Repeated points are triangulated once, through their
+    first occurrence. Collinear input has no triangles.
+    '''
+    def __init__(self, x, y, seed=0):
+        self.x = np.asarray(x, dtype=float)
+        self.y = np.asarray(y, dtype=float)
+        if self.x.shape != self.y.shape or self.x.ndim != 1:
+            raise ValueError('x and y must be one-dimensional arrays of the same length')
+        n = len(self.x)
+        lexicographic = np.lexsort((self.x, self.y))
+        sortedX, sortedY = self.x[lexicographic], self.y[lexicographic]
+        distinct = np.ones(n, dtype=bool)
+        distinct[1:] = (sortedX[1:] != sortedX[:-1]) | (sortedY[1:] != sortedY[:-1])
+        # Each point's first occurrence, so repeated points can be tied back to it
+        self.representative = np.empty(n, dtype=np.intp)
+        firsts = np.minimum.reduceat(lexicographic, np.flatnonzero(distinct)) if n else lexicographic
+        self.representative[lexicographic] = np.repeat(firsts, np.diff(np.append(np.flatnonzero(distinct), n)))
+        unique = np.sort(firsts)
+        order = np.random.default_rng(seed).permutation(unique).tolist()
+        xs, ys = self.x.tolist(), self.y.tolist()
+        start = _startingTriangle(xs, ys, order)
+        if start is None:
+            triangles, neighbors = [], []
+        else:
+            order = start + [p for p in order if p not in start]
+            triangles, neighbors, leaves = _triangulate(xs, ys, order)
+            # Renumber neighbours from history DAG ids to positions in the result
+            position = {t: idx for idx, t in enumerate(leaves)}
+            neighbors = [[position.get(t, -1) for t in adjacent] for adjacent in neighbors]
+        self.triangles = np.array(triangles, dtype=np.intp).reshape(-1, 3)
+        self.neighbors = np.array(neighbors, dtype=np.intp).reshape(-1, 3)
+
+    def edges(self):
+        '''Unique Delaunay edges as an (e, 2) array of point indices, smaller index first'''
+        if not len(self.triangles):
+            # Collinear points: the Delaunay graph is the path through them in order
+            unique = np.unique(self.representative)
+            order = unique[np.lexsort((self.y[unique], self.x[unique]))]
+            return np.sort(np.stack([order[:-1], order[1:]], axis=1), axis=1)
+        t = self.triangles
+        pairs = np.concatenate([t[:, [0, 1]], t[:, [1, 2]], t[:, [2, 0]]])
+        return np.unique(np.sort(pairs, axis=1), axis=0)
+
+    def circumcenters(self):
+        ax, ay = self.x[self.triangles[:, 0]], self.y[self.triangles[:, 0]]
+        bx, by = self.x[self.triangles[:, 1]] - ax, self.y[self.triangles[:, 1]] - ay
+        cx, cy = self.x[self.triangles[:, 2]] - ax, self.y[self.triangles[:, 2]] - ay
+        d = 2 * (bx * cy - by * cx)
+        b2, c2 = bx * bx + by * by, cx * cx + cy * cy
+        return np.stack([ax + (cy * b2 - by * c2) / d, ay + (bx * c2 - cx * b2) / d], axis=1)
+
+    def voronoi(self):
+        '''Voronoi diagram of the points, as the dual of the triangulation'''
+        t = np.repeat(np.arange(len(self.triangles)), 3)
+        k = np.tile(np.arange(3), len(self.triangles))
+        across = self.neighbors.ravel()
+        # Each interior edge is seen from both sides, so keep it once
+        keep = (across < 0) | (t < across)
+        t, k, across = t[keep], k[keep], across[keep]
+        a = self.triangles[t, (k + 1) % 3]
+        b = self.triangles[t, (k + 2) % 3]
+        # Hull edges run counterclockwise, so the outward normal is on their right
+        directions = np.where((across < 0)[:, None],
+                              np.stack([self.y[b] - self.y[a], self.x[a] - self.x[b]], axis=1), 0.0)
+        return Voronoi(self.circumcenters(), np.stack([a, b], axis=1),
+                       np.stack([t, across], axis=1), directions)
+
+    def mst(self):
+        '''Euclidean minimum spanning tree as an (n - 1, 2) array of point index pairs
+
+        The tree only uses Delaunay edges, so Kruskal's algorithm runs on O(n)
+        candidate edges. Repeated points join their first occurrence by a zero
+        length edge.
+        '''
+        edges = self.edges()
+        lengths = np.hypot(self.x[edges[:, 0]] - self.x[edges[:, 1]],
+                           self.y[edges[:, 0]] - self.y[edges[:, 1]])
+        parent = list(range(len(self.x)))
+
+        def find(i):
+            while parent[i] != i:
+                parent[i] = parent[parent[i]]
+                i = parent[i]
+            return i
+
+        tree = [(int(i), int(first)) for i, first in enumerate(self.representative) if i != first]
+        for i, j in edges[np.argsort(lengths, kind='stable')].tolist():
+            ri, rj = find(i), find(j)
+            if ri != rj:
+                parent[ri] = rj
+                tree.append((i, j))
+        return np.array(tree, dtype=np.intp).reshape(-1, 2)
+
+    def plot(self, destination):
+        if len(self.triangles):
+            destination.triplot(self.x, self.y, self.triangles, c="black")
@@ -1,5 +1,15 @@
+import bisect
+import concurrent.futures
+import os
+import weakref
+
 import numpy as np
 import matplotlib.pyplot as plt
+from matplotlib.collections import LineCollection
+
+from .delaunay import Triangulation
+from .index import GridIndex
+from .orient2d import COLLINEAR, ERRBOUND, LEFT, RIGHT, orient2d, orientation
 
 class Point:
     def __init__(self, x: float, y: float):
@@ -42,53 +52,267 @@ class Point:
         destination.scatter(self.x, self.y, c="black", marker='.')
         
         
-class Points(list):
-    def __init__(self, *points):
-        super().__init__(*points)
-        self.nparray()
-        
+class PointView(Point):
+    '''A Point backed by one row of a Points container
+
+    Reads and writes go straight to the container's coordinate arrays. A view
+    refers to a position, so it follows whatever point is stored there.
+    '''
+    def __init__(self, points, index: int):
+        self._points = points
+        self._index = index
+
+    @property
+    def x(self):
+        return float(self._points._x[self._index])
+
+    @x.setter
+    def x(self, value):
+        self._points._own()
+        self._points._x[self._index] = value
+        self._points._rebuildHulls()
+
+    @property
+    def y(self):
+        return float(self._points._y[self._index])
+
+    @y.setter
+    def y(self, value):
+        self._points._own()
+        self._points._y[self._index] = value
+        self._points._rebuildHulls()
+
+
+class Points:
+    '''Collection of points stored as columns of x and y coordinates
+
+    Coordinates live in two float64 arrays (16 bytes per point) with spare capacity
+    that grows geometrically, so appending n points costs O(n) overall. Point
+    objects are only created on access, as views into the arrays. Arrays handed
+    to fromNPArray are used without copying until the container is modified.
+    '''
+    def __init__(self, points=()):
+        points = list(points)
+        self._x = np.array([point.x for point in points], dtype=float)
+        self._y = np.array([point.y for point in points], dtype=float)
+        self._size = len(points)
+        self._owned = True
+        self._path = None
+        self._hulls = weakref.WeakSet()
+
+    @property
+    def npx(self):
+        return self._x[:self._size]
+
+    @property
+    def npy(self):
+        return self._y[:self._size]
+
+    def __len__(self):
+        return self._size
+
+    def __iter__(self):
+        for idx in range(self._size):
+            yield PointView(self, idx)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return Points.fromNPArray(self.npx[index].copy(), self.npy[index].copy())
+        if index < 0:
+            index += self._size
+        if not 0 <= index < self._size:
+            raise IndexError('point index out of range')
+        return PointView(self, index)
+
+    def __eq__(self, other):
+        return (len(self) == len(other)
+                and np.array_equal(self.npx, other.npx)
+                and np.array_equal(self.npy, other.npy))
+
+    def __repr__(self):
+        return 'Points([{}])'.format(', '.join(map(repr, self)))
+
+    def __getstate__(self):
+        # Pickle the points themselves: not spare capacity, the file they were mapped
+        # from (which may not exist where they are loaded), or hulls following them
+        state = dict(self.__dict__)
+        state.update(_x=self.npx.copy(), _y=self.npy.copy(), _owned=True, _path=None)
+        del state['_hulls']
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._hulls = weakref.WeakSet()
+
+    def __copy__(self):
+        '''Independent points with the same coordinates, followed by no hulls'''
+        copy = Points.fromNPArray(self.npx.copy(), self.npy.copy())
+        copy._owned = True
+        return copy
+
+    def _own(self):
+        '''Copy borrowed arrays before they are modified in place'''
+        if not self._owned:
+            self._x = self._x[:self._size].copy()
+            self._y = self._y[:self._size].copy()
+            self._owned = True
+
+    def _reserve(self, size: int):
+        '''Make room for size points, at least doubling the capacity when growing'''
+        if size <= len(self._x) and self._owned:
+            return
+        capacity = max(size, 2 * len(self._x), 16)
+        x = np.empty(capacity)
+        y = np.empty(capacity)
+        x[:self._size] = self.npx
+        y[:self._size] = self.npy
+        self._x, self._y = x, y
+        self._owned = True
+
     def append(self, point):
-        super().append(point)
-        self.npx = np.append(self.npx, point.x)
-        self.npy = np.append(self.npy, point.y)
-        
-    def pop(self, index):
-        super().pop(index)
-        self.npx = np.delete(self.npx, index) 
-        self.npy = np.delete(self.npy, index)
+        self._reserve(self._size + 1)
+        self._x[self._size] = point.x
+        self._y[self._size] = point.y
+        self._size += 1
+        for hull in self._hulls:
+            hull.add(point.x, point.y)
+
+    def extend(self, x, y=None):
+        '''Append many points, given as x and y arrays or as an iterable of Points'''
+        if y is None:
+            if isinstance(x, Points):
+                x, y = x.npx, x.npy
+            else:
+                points = list(x)
+                x = [point.x for point in points]
+                y = [point.y for point in points]
+        x = np.asarray(x, dtype=float).ravel()
+        y = np.asarray(y, dtype=float).ravel()
+        if len(x) != len(y):
+            raise ValueError('x and y must have the same length')
+        self._reserve(self._size + len(x))
+        self._x[self._size:self._size + len(x)] = x
+        self._y[self._size:self._size + len(y)] = y
+        self._size += len(x)
+        for hull in self._hulls:
+            hull.extend(x, y)
+
+    def pop(self, index=-1):
+        if index < 0:
+            index += self._size
+        if not 0 <= index < self._size:
+            raise IndexError('pop index out of range')
+        self._own()
+        point = Point(self.npx[index].item(), self.npy[index].item())
+        # Shift the tail down in place rather than reallocating
+        self._x[index:self._size - 1] = self._x[index + 1:self._size]
+        self._y[index:self._size - 1] = self._y[index + 1:self._size]
+        self._size -= 1
+        self._rebuildHulls()
+        return point
     
-    def plot(self, destination):
-        destination.scatter(self.npx, self.npy, c="black", marker='.')
+    def plot(self, destination, decimate=False, bins=None):
+        '''Scatter the points, optionally thinned for large collections
+
+        With decimate, only one point is drawn per pixel of the axes (as the view
+        will be once these points are autoscaled in), plus the extremal points,
+        which looks the same but keeps the number of drawn markers bounded by the
+        screen size. Destinations other than an Axes or pyplot draw every point.
+        With bins, a hexagonal density map with that many bins across is drawn
+        instead of individual points.
+        '''
+        x, y = self.npx, self.npy
+        if bins is not None:
+            destination.hexbin(x, y, gridsize=bins, bins='log', cmap='Greys', mincnt=1)
+            return
+        axes = _axes(destination)
+        if decimate and len(x) and axes is not None:
+            idx = _decimated(axes, x, y)
+            x, y = x[idx], y[idx]
+        destination.scatter(x, y, c="black", marker='.')
             
     def nparray(self):
-        self.npx = np.array([point.x for point in self])
-        self.npy = np.array([point.y for point in self])
-            
-    def convexHull(self):
-        sorted_points = sorted(self)
-        L_upper = sorted_points[0:2]
-        for idx in range(2, len(sorted_points)):
-            L_upper.append(sorted_points[idx])
-            while len(L_upper) > 2 and not isClockwise(*L_upper[-3:]):
-                L_upper.pop(-2)
-        L_lower = sorted_points[-1:-3:-1]
-        for idx in range(len(sorted_points) - 3, -1, -1):
-            L_lower.append(sorted_points[idx])
-            while len(L_lower) > 2 and not isClockwise(*L_lower[-3:]):
-                L_lower.pop(-2)
-        L_lower.pop(0)
-        L_lower.pop(-1)
-        hull_points = Points(L_upper + L_lower)
-        hull = Polygon(hull_points)
+        return self.npx, self.npy
+
+    def dynamicHull(self, chunkSize=None):
+        '''Get a DynamicHull of the points that is kept up to date as points are added
+
+        Appended and extended points are inserted into the hull incrementally.
+        Popping or moving a point rebuilds it from scratch.
+        '''
+        hull = DynamicHull(self.npx, self.npy, chunkSize)
+        self._hulls.add(hull)
         return hull
+
+    def _rebuildHulls(self):
+        for hull in self._hulls:
+            hull.rebuild(self.npx, self.npy)
+
+    def delaunay(self, seed=0):
+        '''Delaunay triangulation of the points, with its Voronoi diagram and MST'''
+        return Triangulation(self.npx, self.npy, seed)
+
+    def gridIndex(self, cellSize=None):
+        '''Build a uniform grid index over a snapshot of the points'''
+        return GridIndex(self.npx, self.npy, cellSize)
+            
+    def convexHull(self, chunkSize=None, processes=None):
+        '''Get the convex hull as a Polygon, clockwise from the smallest point
+
+        With chunkSize (or processes) set, the hull of each chunk of points is
+        computed separately, on a pool of processes if processes > 1, and the
+        chunk hulls are merged. Working memory is then proportional to the chunk
+        size, so memory-mapped points never need to be read in all at once.
+        Workers map the file themselves when the points came from fromFile.
+        '''
+        if chunkSize is None and not processes:
+            idx = hullIndices(self.npx, self.npy)
+            hull_points = Points.fromNPArray(self.npx[idx], self.npy[idx])
+            hull = Polygon(hull_points)
+            return hull
+        if chunkSize is None:
+            chunkSize = -(-len(self) // processes)
+        chunkSize = max(int(chunkSize), 1)
+        # Unmodified points from a file are still exactly the file's contents
+        fromFile = self._path is not None and not self._owned
+        tasks = [(self._path, start, start + chunkSize) if fromFile
+                 else ((self.npx[start:start + chunkSize], self.npy[start:start + chunkSize]), 0, None)
+                 for start in range(0, len(self), chunkSize)]
+        if processes and processes > 1:
+            with concurrent.futures.ProcessPoolExecutor(processes) as executor:
+                hulls = list(executor.map(_chunkHull, tasks))
+        else:
+            hulls = [_chunkHull(task) for task in tasks]
+        x = np.concatenate([np.empty(0)] + [hx for hx, _ in hulls])
+        y = np.concatenate([np.empty(0)] + [hy for _, hy in hulls])
+        idx = hullIndices(x, y)
+        return Polygon(Points.fromNPArray(x[idx], y[idx]))
     
     @classmethod
     def fromNPArray(cls, x, y):
+        '''Wrap x and y coordinate arrays without copying them'''
+        x = np.asarray(x, dtype=float)
+        y = np.asarray(y, dtype=float)
+        if x.shape != y.shape or x.ndim != 1:
+            raise ValueError('x and y must be one-dimensional arrays of the same length')
         points = cls()
-        for idx, _ in enumerate(x):
-            points.append(Point(x[idx], y[idx]))
-        points.npx = x
-        points.npy = y
+        points._x = x
+        points._y = y
+        points._size = len(x)
+        points._owned = False
+        return points
+
+    @classmethod
+    def fromFile(cls, path, mmap=True):
+        '''Load points from a .npy file of shape (n, 2) or a raw file of float64 x, y pairs
+
+        With mmap the file is memory-mapped read-only, so points are only read
+        from disk when used, and modifying the container copies them into memory.
+        '''
+        path = os.fspath(path)
+        points = cls.fromNPArray(*_loadFile(path, mmap))
+        if mmap:
+            points._path = path
         return points
             
 class Line:
@@ -119,31 +343,645 @@ class Polygon:
         return 'Polygon({})'.format(', '.join(map(repr, self.points)))
     
     def __str__(self):
-        return ' -> '.join(map(str, self.points + [self.points[0]]))
+        return ' -> '.join(map(str, list(self.points) + [self.points[0]]))
     
     def plot(self, destination):
         self.plotBoundary(destination)
         destination.fill(self.points.npx, self.points.npy, '#0F0F0F2F')
         
     def plotBoundary(self, destination):
-        tmp_points = self.points + [self.points[0]]
-        for idx, _ in enumerate(self.points):
-            p1 = tmp_points[idx]
-            p2 = tmp_points[idx + 1]
-            l = Line(p1, p2)
-            l.plot(destination)
+        # One closed path for the edges and one scatter for the vertices
+        x, y = self.points.npx, self.points.npy
+        destination.plot(np.append(x, x[:1]), np.append(y, y[:1]), c="black")
+        destination.scatter(x, y, c="black", marker='.')
             
     def isConvex(self):
-        points = self.points + [self.points[0], self.points[1]]
-        for idx, _ in enumerate(points[:-2]):
-            if not isClockwise(points[idx], points[idx + 1], points[idx + 2]):
-                return False
-        return True
+        # Every consecutive triple of vertices must turn clockwise
+        x, y = self.points.npx, self.points.npy
+        turns = orient2d(x, y, np.roll(x, -1), np.roll(y, -1), np.roll(x, -2), np.roll(y, -2))
+        return bool(np.all(turns == RIGHT))
+
+    def contains(self, x, y=None):
+        '''Test which query points lie in the polygon, given as x and y arrays or Points
+
+        Convex polygons use a binary search over the fan of triangles around the
+        first vertex (O(log n) per query) and count their boundary as inside. Other
+        polygons use a vectorized crossing-number test, where points on the
+        boundary may go either way.
+        '''
+        if isinstance(x, Point):
+            return bool(self.contains([x.x], [x.y])[0])
+        if y is None:
+            x, y = x.npx, x.npy
+        qx = np.asarray(x, dtype=float).ravel()
+        qy = np.asarray(y, dtype=float).ravel()
+        px, py = self.points.npx, self.points.npy
+        if len(px) >= 3:
+            turns = orient2d(px, py, np.roll(px, -1), np.roll(py, -1), np.roll(px, -2), np.roll(py, -2))
+            if np.all(turns == RIGHT):
+                # Reverse into counterclockwise order, keeping the first vertex first
+                return _fanContains(np.roll(px[::-1], 1), np.roll(py[::-1], 1), qx, qy)
+            if np.all(turns == LEFT):
+                return _fanContains(px, py, qx, qy)
+        return _crossingContains(px, py, qx, qy)
+
+    def area(self):
+        x, y = self.points.npx, self.points.npy
+        return abs(_signedArea(x, y))
+
+    def perimeter(self):
+        x, y = self.points.npx, self.points.npy
+        return float(np.hypot(np.roll(x, -1) - x, np.roll(y, -1) - y).sum())
+
+    def centroid(self):
+        '''Centroid of the enclosed region, or of the vertices if it has no area'''
+        x, y = self.points.npx, self.points.npy
+        if not len(x):
+            return Point(float(x.mean()), float(y.mean()))
+        # Work relative to the first vertex, as _signedArea does, and move back after
+        x0, y0 = x[0], y[0]
+        x, y = x - x0, y - y0
+        cross = x * np.roll(y, -1) - np.roll(x, -1) * y
+        area = cross.sum() / 2
+        if area == 0:
+            return Point(float(x.mean() + x0), float(y.mean() + y0))
+        return Point(float(((x + np.roll(x, -1)) * cross).sum() / (6 * area) + x0),
+                     float(((y + np.roll(y, -1)) * cross).sum() / (6 * area) + y0))
+
+    def intersection(self, other):
+        '''Intersection of two convex polygons in O(n + m) time (O'Rourke's algorithm)
+
+        Like the hull, the result is clockwise from its lexicographically smallest
+        vertex. Polygons that only touch give a degenerate result of one or two
+        points, and disjoint ones give an empty Polygon. Boundaries that meet other
+        than by crossing are clipped instead, in O(n * m).
+        '''
+        px, py = _convexCounterclockwise(self)
+        qx, qy = _convexCounterclockwise(other)
+        if _touchingBoundaries(px, py, qx, qy):
+            # The walk assumes general position, which shared vertices, vertices on
+            # the other boundary and overlapping edges break. Clip instead, in a
+            # fixed order so that P & Q rounds exactly like Q & P
+            if list(zip(qx.tolist(), qy.tolist())) < list(zip(px.tolist(), py.tolist())):
+                px, py, qx, qy = qx, qy, px, py
+            return _normalizedPolygon(*_clipConvex(px, py, qx, qy))
+        return _normalizedPolygon(*_convexIntersection(px, py, qx, qy))
+
+    def clip(self, window):
+        '''Clip this polygon to a convex window (Sutherland-Hodgman)
+
+        This polygon need not be convex. Each window edge clips all vertices at
+        once, so the cost is O(n * m) in vectorized steps.
+        '''
+        wx, wy = _convexCounterclockwise(window)
+        return _normalizedPolygon(*_clipConvex(self.points.npx, self.points.npy, wx, wy))
+
+    def minkowskiSum(self, other):
+        '''Minkowski sum of two convex polygons, by merging their edges by angle'''
+        px, py = _convexCounterclockwise(self)
+        qx, qy = _convexCounterclockwise(other)
+        px, py = _fromLowest(px, py)
+        qx, qy = _fromLowest(qx, qy)
+        edges = []
+        for x, y in ((px, py), (qx, qy)):
+            dx, dy = np.roll(x, -1) - x, np.roll(y, -1) - y
+            # From the lowest vertex, counterclockwise edge angles increase from 0 to 2 pi
+            edges.append((np.mod(np.arctan2(dy, dx), 2 * np.pi), dx, dy))
+        (pa, pdx, pdy), (qa, qdx, qdy) = edges
+        # Merge the two sorted angle sequences: each edge's place is its own index
+        # plus the number of edges of the other polygon that come before it
+        order = np.empty(len(pa) + len(qa), dtype=np.intp)
+        order[np.arange(len(pa)) + np.searchsorted(qa, pa, side='left')] = np.arange(len(pa))
+        order[np.arange(len(qa)) + np.searchsorted(pa, qa, side='right')] = len(pa) + np.arange(len(qa))
+        dx = np.concatenate([pdx, qdx])[order]
+        dy = np.concatenate([pdy, qdy])[order]
+        x = px[0] + qx[0] + np.concatenate([[0.0], np.cumsum(dx[:-1])])
+        y = py[0] + qy[0] + np.concatenate([[0.0], np.cumsum(dy[:-1])])
+        return _normalizedPolygon(x, y)
             
             
-def isClockwise(p1: Point, p2: Point, p3: Point):
-    det = (p2.x - p1.x) * (p3.y - p1.y) - (p2.y - p1.y) * (p3.x - p1.x)
-    if det < 0:
-        return True
+def _fanContains(px, py, qx, qy, strict=False):
+    '''Point in convex polygon (counterclockwise vertices) by binary search over the fan
+
+    The boundary counts as inside unless strict is set.
+    '''
+    n = len(px)
+
+    def within(turns, outside):
+        '''Whether turns keep the queries off the outside of an edge (and off the edge
+        itself when strict)'''
+        if strict:
+            return turns == -outside
+        return turns != outside
+
+    inside = (within(orient2d(px[0], py[0], px[1], py[1], qx, qy), RIGHT)
+              & within(orient2d(px[0], py[0], px[-1], py[-1], qx, qy), LEFT))
+    lo = np.ones(qx.shape, dtype=np.intp)
+    hi = np.full(qx.shape, n - 1, dtype=np.intp)
+    # Find the fan triangle (p0, p[lo], p[lo + 1]) whose wedge holds each query
+    while np.any(hi - lo > 1):
+        mid = (lo + hi) // 2
+        left = orient2d(px[0], py[0], px[mid], py[mid], qx, qy) != RIGHT
+        lo = np.where(left, mid, lo)
+        hi = np.where(left, hi, mid)
+    return inside & within(orient2d(px[lo], py[lo], px[lo + 1], py[lo + 1], qx, qy), RIGHT)
+
+
+def _touchingBoundaries(px, py, qx, qy):
+    '''Whether a vertex of either convex polygon lies on the other's boundary
+
+    Shared vertices and overlapping edges always put some vertex on the other
+    boundary, so this is exactly when the boundaries meet other than by crossing.
+    '''
+    for ax, ay, bx, by in ((px, py, qx, qy), (qx, qy, px, py)):
+        onBoundary = _fanContains(ax, ay, bx, by) & ~_fanContains(ax, ay, bx, by, strict=True)
+        if onBoundary.any():
+            return True
+    return False
+
+
+def _clipConvex(x, y, wx, wy):
+    '''Sutherland-Hodgman: clip a polygon to a counterclockwise convex window'''
+    for ax, ay, bx, by in zip(wx, wy, np.roll(wx, -1), np.roll(wy, -1)):
+        if not len(x):
+            break
+        # Vertices on the window edge count as inside
+        inside = orient2d(ax, ay, bx, by, x, y) != RIGHT
+        nx, ny, nextInside = np.roll(x, -1), np.roll(y, -1), np.roll(inside, -1)
+        side = (bx - ax) * (y - ay) - (by - ay) * (x - ax)
+        nextSide = np.roll(side, -1)
+        crossing = inside != nextInside
+        with np.errstate(divide='ignore', invalid='ignore'):
+            # The float sides can both round to the same value where the exact
+            # predicate still sees a crossing; either end of the edge is then right
+            t = np.clip(np.where(crossing & (side != nextSide), side / (side - nextSide), 0), 0, 1)
+        # Each subject edge emits its crossing point (if any), then its end (if inside)
+        x = np.stack([x + t * (nx - x), nx], axis=1).ravel()
+        y = np.stack([y + t * (ny - y), ny], axis=1).ravel()
+        keep = np.stack([crossing, nextInside], axis=1).ravel()
+        x, y = x[keep], y[keep]
+    return x, y
+
+
+def _crossingContains(px, py, qx, qy):
+    '''Point in polygon by the parity of crossings of a ray to the right of each query'''
+    inside = np.zeros(qx.shape, dtype=bool)
+    for ax, ay, bx, by in zip(px, py, np.roll(px, -1), np.roll(py, -1)):
+        # Upward edges cross the ray when the query is to their left, downward ones
+        # when it is to their right, which the exact predicate decides consistently
+        upward = (ay <= qy) & (qy < by)
+        downward = (by <= qy) & (qy < ay)
+        candidates = np.flatnonzero(upward | downward)
+        if not len(candidates):
+            continue
+        turns = orient2d(ax, ay, bx, by, qx[candidates], qy[candidates])
+        crossing = np.where(upward[candidates], turns == LEFT, turns == RIGHT)
+        inside[candidates[crossing]] ^= True
+    return inside
+
+
+def _signedArea(x, y):
+    '''Shoelace area, positive for counterclockwise vertices'''
+    if not len(x):
+        return 0.0
+    # Products of coordinates far from the origin would cancel catastrophically, so
+    # measure them from the first vertex instead
+    x, y = x - x[0], y - y[0]
+    return float(np.dot(x, np.roll(y, -1)) - np.dot(np.roll(x, -1), y)) / 2
+
+
+def _convexCounterclockwise(polygon):
+    '''Vertex arrays of a convex polygon in counterclockwise order'''
+    x, y = polygon.points.npx, polygon.points.npy
+    turns = orient2d(x, y, np.roll(x, -1), np.roll(y, -1), np.roll(x, -2), np.roll(y, -2))
+    if len(x) < 3 or not (np.all(turns == LEFT) or np.all(turns == RIGHT)):
+        raise ValueError('expected a strictly convex polygon with at least 3 vertices')
+    if turns[0] == RIGHT:
+        return x[::-1], y[::-1]
+    return x, y
+
+
+def _fromLowest(x, y):
+    '''Rotate a vertex cycle to start at its lowest (then leftmost) vertex'''
+    start = np.lexsort((x, y))[0]
+    return np.roll(x, -start), np.roll(y, -start)
+
+
+def _normalizedPolygon(x, y):
+    '''Polygon in the hull's form: clockwise from the smallest vertex, with no
+    repeated or collinear vertices'''
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    keep = (x != np.roll(x, 1)) | (y != np.roll(y, 1))
+    if len(x) and not keep.any():
+        # A single point, possibly repeated, is kept once
+        keep[0] = True
+    x, y = x[keep], y[keep]
+    if len(x) > 2:
+        turns = orient2d(np.roll(x, 1), np.roll(y, 1), x, y, np.roll(x, -1), np.roll(y, -1))
+        x, y = x[turns != 0], y[turns != 0]
+    if _signedArea(x, y) > 0:
+        x, y = x[::-1], y[::-1]
+    if len(x):
+        start = np.lexsort((y, x))[0]
+        x, y = np.roll(x, -start), np.roll(y, -start)
+    return Polygon(Points.fromNPArray(np.ascontiguousarray(x), np.ascontiguousarray(y)))
+
+
+def _segmentIntersection(a, b, c, d):
+    '''Intersect the segments ab and cd
+
+    Returns '0' and None if they do not meet, 'e' and None if they overlap along
+    a line, 'v' and the point if they meet at an endpoint of either, and '1' and
+    the point if they cross properly.
+    '''
+    o1, o2 = orientation(*a, *b, *c), orientation(*a, *b, *d)
+    o3, o4 = orientation(*c, *d, *a), orientation(*c, *d, *b)
+    if o1 == o2 == 0:
+        # Collinear: they overlap if their projections onto the line do
+        axis = (b[0] - a[0], b[1] - a[1])
+
+        def project(p):
+            return (p[0] - a[0]) * axis[0] + (p[1] - a[1]) * axis[1]
+
+        low, high = sorted([project(c), project(d)])
+        return ('e', None) if low <= project(b) and high >= 0 else ('0', None)
+    if o1 * o2 > 0 or o3 * o4 > 0:
+        return '0', None
+    for orient, point in ((o1, c), (o2, d), (o3, a), (o4, b)):
+        if orient == 0:
+            return 'v', point
+    # Compute the crossing from a canonical order of the segments and their ends,
+    # so intersecting P with Q rounds exactly like intersecting Q with P
+    (a, b), (c, d) = sorted([sorted((a, b)), sorted((c, d))])
+    ex, ey = b[0] - a[0], b[1] - a[1]
+    fx, fy = d[0] - c[0], d[1] - c[1]
+    t = ((c[0] - a[0]) * fy - (c[1] - a[1]) * fx) / (ex * fy - ey * fx)
+    return '1', (a[0] + t * ex, a[1] + t * ey)
+
+
+def _convexIntersection(px, py, qx, qy):
+    '''O'Rourke's convex polygon intersection on counterclockwise vertex arrays
+
+    Advances one edge of either polygon at a time, chasing the other polygon's
+    edge, so each polygon is walked around at most twice. Returns vertex lists.
+    '''
+    P = list(zip(px.tolist(), py.tolist()))
+    Q = list(zip(qx.tolist(), qy.tolist()))
+    n, m = len(P), len(Q)
+    a = b = advancedA = advancedB = 0
+    inside = None  # 'P' or 'Q' once the first crossing says which boundary is inner
+    first = True
+    out = []
+    while (advancedA < n or advancedB < m) and advancedA < 2 * n and advancedB < 2 * m:
+        a1, b1 = (a - 1) % n, (b - 1) % m
+        A = (P[a][0] - P[a1][0], P[a][1] - P[a1][1])
+        B = (Q[b][0] - Q[b1][0], Q[b][1] - Q[b1][1])
+        cross = orientation(0.0, 0.0, *A, *B)
+        aHB = orientation(*Q[b1], *Q[b], *P[a])
+        bHA = orientation(*P[a1], *P[a], *Q[b])
+        code, point = _segmentIntersection(P[a1], P[a], Q[b1], Q[b])
+        if code in '1v':
+            if inside is None and first:
+                advancedA = advancedB = 0
+                first = False
+            out.append(point)
+            if aHB > 0:
+                inside = 'P'
+            elif bHA > 0:
+                inside = 'Q'
+        if code == 'e' and A[0] * B[0] + A[1] * B[1] < 0:
+            # Edges overlapping in opposite directions: the polygons only share a segment
+            ends = sorted([P[a1], P[a], Q[b1], Q[b]])
+            return [p[0] for p in ends[1:3]], [p[1] for p in ends[1:3]]
+        if cross == 0 and aHB < 0 and bHA < 0:
+            return [], []
+        if cross == 0 and aHB == 0 and bHA == 0:
+            advanceA = inside != 'P'
+        elif cross >= 0:
+            advanceA = bHA > 0
+        else:
+            advanceA = aHB <= 0
+        if advanceA:
+            if inside == 'P':
+                out.append(P[a])
+            a, advancedA = (a + 1) % n, advancedA + 1
+        else:
+            if inside == 'Q':
+                out.append(Q[b])
+            b, advancedB = (b + 1) % m, advancedB + 1
+    if inside is None:
+        # The boundaries never cross, so one polygon holds the other or they are apart
+        if np.all(_fanContains(qx, qy, px, py)):
+            return px, py
+        if np.all(_fanContains(px, py, qx, qy)):
+            return qx, qy
+        return [], []
+    return [p[0] for p in out], [p[1] for p in out]
+
+
+def _loadFile(path, mmap=True):
+    '''Get the x and y columns of a point file, as views of one (n, 2) array'''
+    if path.endswith('.npy'):
+        data = np.load(path, mmap_mode='r' if mmap else None)
+    elif os.path.getsize(path) == 0:
+        # np.memmap cannot map an empty file
+        data = np.empty((0, 2))
     else:
-        return False
\ No newline at end of file
+        data = np.memmap(path, dtype=np.float64, mode='r') if mmap else np.fromfile(path, dtype=np.float64)
+        if len(data) % 2:
+            raise ValueError('{} holds an odd number of coordinates'.format(path))
+        data = data.reshape(-1, 2)
+    if data.ndim != 2 or data.shape[1] != 2:
+        raise ValueError('{} does not hold an (n, 2) array of points'.format(path))
+    if data.dtype != np.float64:
+        raise ValueError('{} holds {} coordinates, not float64'.format(path, data.dtype))
+    return data[:, 0], data[:, 1]
+
+
+def _chunkHull(task):
+    '''Coordinates of the hull vertices of one chunk of points, read from a file or given'''
+    source, start, stop = task
+    x, y = _loadFile(source) if isinstance(source, str) else source
+    x, y = x[start:stop], y[start:stop]
+    idx = hullIndices(x, y)
+    return x[idx], y[idx]
+
+
+def plotLines(lines, destination):
+    '''Plot many Lines as one LineCollection and their endpoints as one scatter'''
+    segments = np.array([[line.start.asTuple(), line.end.asTuple()] for line in lines]).reshape(-1, 2, 2)
+    axes = _axes(destination) or destination
+    axes.add_collection(LineCollection(segments, colors="black"))
+    destination.scatter(segments[:, :, 0].ravel(), segments[:, :, 1].ravel(), c="black", marker='.')
+    axes.autoscale_view()
+
+
+def _axes(destination):
+    '''The Axes a destination draws on: itself, the current Axes for pyplot, or None'''
+    if hasattr(destination, 'transData'):
+        return destination
+    if destination is plt:
+        return plt.gca()
+    return None
+
+
+def _decimated(axes, x, y):
+    '''Indices of one point per pixel of the axes, plus the extremal points'''
+    if axes.get_autoscale_on():
+        # Take the view the axes will have once these points are in its data limits
+        axes.update_datalim([(x.min(), y.min()), (x.max(), y.max())])
+        axes.autoscale_view()
+    bbox = axes.bbox
+    pixels = axes.transData.transform(np.column_stack([x, y]))
+    return _pixelRepresentatives(pixels[:, 0] - bbox.x0, pixels[:, 1] - bbox.y0,
+                                 int(np.ceil(bbox.width)), int(np.ceil(bbox.height)))
+
+
+def _pixelRepresentatives(px, py, width: int, height: int):
+    '''Indices of one point in each occupied pixel of a width by height view, given
+    pixel coordinates from its corner, plus the points with extreme coordinates
+
+    Points outside the view are not drawn, so they share the ring of pixels
+    around it. Keeping the extremes keeps the data limits the same.
+    '''
+    width, height = max(width, 1), max(height, 1)
+    column = np.clip(np.floor(px), -1, width).astype(np.intp) + 1
+    row = np.clip(np.floor(py), -1, height).astype(np.intp) + 1
+    cells = row * (width + 2) + column
+    # Any one of the indices written to a cell survives, which is all that is needed
+    representative = np.full((width + 2) * (height + 2), -1, dtype=np.intp)
+    representative[cells] = np.arange(len(px))
+    extremes = [np.argmin(px), np.argmax(px), np.argmin(py), np.argmax(py)]
+    return np.union1d(representative[representative >= 0], extremes)
+
+
+def isClockwise(p1: Point, p2: Point, p3: Point):
+    return orientation(p1.x, p1.y, p2.x, p2.y, p3.x, p3.y) == RIGHT
+
+
+def octagonFilter(x, y):
+    '''Indices of the points not strictly inside the Akl-Toussaint octagon
+
+    The octagon joins the extreme points in the eight compass directions, so
+    nothing strictly inside it can be a hull vertex. Points are only discarded
+    when every edge test is positive beyond its floating point error bound.
+    '''
+    extremes = [np.argmin(x), np.argmin(x + y), np.argmin(y), np.argmax(x - y),
+                np.argmax(x), np.argmax(x + y), np.argmax(y), np.argmin(x - y)]
+    corners = []
+    for idx in extremes:
+        if not corners or (x[idx], y[idx]) != (x[corners[-1]], y[corners[-1]]):
+            corners.append(idx)
+    if len(corners) > 1 and (x[corners[0]], y[corners[0]]) == (x[corners[-1]], y[corners[-1]]):
+        corners.pop()
+    if len(corners) < 3:
+        return np.arange(len(x))
+    inside = np.ones(len(x), dtype=bool)
+    for a, b in zip(corners, corners[1:] + corners[:1]):
+        # The octagon is counterclockwise, so interior points are strictly left of every edge
+        left = (x[b] - x[a]) * (y - y[a])
+        right = (y[b] - y[a]) * (x - x[a])
+        inside &= left - right > ERRBOUND * (np.abs(left) + np.abs(right))
+    return np.flatnonzero(~inside)
+
+
+def hullIndices(x, y):
+    '''Indices of the convex hull vertices of the points (x, y)
+
+    The hull is returned clockwise from the lexicographically smallest point, as
+    the monotone chain algorithm produces it. Points are first thinned with the
+    octagon filter and sorted with np.lexsort, so the chain only runs on the
+    survivors.
+    '''
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    candidates = octagonFilter(x, y) if len(x) > 8 else np.arange(len(x))
+    candidates = candidates[np.lexsort((y[candidates], x[candidates]))]
+    if len(candidates) < 3:
+        return candidates
+    # Nothing was filtered out, so the octagon may be degenerate. On exactly collinear
+    # points every turn in the chain would go to the scalar exact predicate, so check
+    # for that case first, with one middle point and then with a single orient2d call.
+    first, middle, last = candidates[0], candidates[len(candidates) // 2], candidates[-1]
+    if (len(candidates) == len(x)
+            and orientation(x[first], y[first], x[last], y[last], x[middle], y[middle]) == COLLINEAR
+            and not np.any(orient2d(x[first], y[first], x[last], y[last], x[candidates], y[candidates]))):
+        return candidates[[0, -1]]
+    xs = x[candidates].tolist()
+    ys = y[candidates].tolist()
+
+    def chain(order):
+        kept = []
+        for idx in order:
+            while len(kept) > 1:
+                a, b = kept[-2], kept[-1]
+                # Only keep strictly clockwise turns. The float determinant decides
+                # unless it is within its error bound, when the exact predicate does.
+                left = (xs[b] - xs[a]) * (ys[idx] - ys[a])
+                right = (ys[b] - ys[a]) * (xs[idx] - xs[a])
+                if right - left > ERRBOUND * (abs(left) + abs(right)):
+                    break
+                if (left - right <= ERRBOUND * (abs(left) + abs(right))
+                        and orientation(xs[a], ys[a], xs[b], ys[b], xs[idx], ys[idx]) == RIGHT):
+                    break
+                kept.pop()
+            kept.append(idx)
+        return kept
+
+    upper = chain(range(len(xs)))
+    lower = chain(range(len(xs) - 1, -1, -1))
+    return candidates[upper + lower[1:-1]]
+
+
+class _Chain:
+    '''Upper hull of a point set as a sorted list of (x, y) tuples
+
+    The chain turns strictly clockwise from its lexicographically smallest point
+    to its largest. Insertion finds the position by bisection and deletes the
+    vertices the new point hides, each of which was inserted once, so an
+    insertion is amortized O(log h) comparisons plus the list shift.
+    '''
+    def __init__(self, vertices=()):
+        self.vertices = list(vertices)
+
+    def insert(self, point):
+        vertices = self.vertices
+        idx = bisect.bisect_left(vertices, point)
+        if idx < len(vertices) and vertices[idx] == point:
+            return
+        if 0 < idx < len(vertices):
+            (ax, ay), (bx, by) = vertices[idx - 1], vertices[idx]
+            # Points on or below the chain are not vertices
+            if orientation(ax, ay, bx, by, point[0], point[1]) != LEFT:
+                return
+        vertices.insert(idx, point)
+        while idx > 1 and orientation(*vertices[idx - 2], *vertices[idx - 1], *point) != RIGHT:
+            del vertices[idx - 1]
+            idx -= 1
+        while idx + 2 < len(vertices) and orientation(*point, *vertices[idx + 1], *vertices[idx + 2]) != RIGHT:
+            del vertices[idx + 1]
+
+    def extreme(self, dx, dy):
+        '''Vertex maximizing dx * x + dy * y, for directions with dy > 0'''
+        vertices = self.vertices
+        lo, hi = 0, len(vertices) - 1
+        # Edge directions turn clockwise along the chain, so their projections onto
+        # the direction change sign once, at the extreme vertex
+        while lo < hi:
+            mid = (lo + hi) // 2
+            (ax, ay), (bx, by) = vertices[mid], vertices[mid + 1]
+            if (bx - ax) * dx + (by - ay) * dy > 0:
+                lo = mid + 1
+            else:
+                hi = mid
+        return vertices[lo]
+
+
+class DynamicHull:
+    '''Convex hull of a growing set of points
+
+    The upper and lower chains are kept separately; the lower chain is stored
+    as the upper chain of the points rotated by half a turn, so both use the
+    same code. Points are inserted one at a time, or with chunkSize set they
+    are buffered and each full buffer is merged with the current hull by
+    hullIndices, which is faster for large streams. Queries flush the buffer.
+    '''
+    def __init__(self, x=(), y=(), chunkSize=None):
+        self.chunkSize = chunkSize
+        self._upper = _Chain()
+        self._lower = _Chain()
+        self._pending = []
+        self.extend(x, y)
+
+    def add(self, x: float, y: float):
+        x, y = float(x), float(y)
+        if self.chunkSize:
+            self._pending.append((x, y))
+            if len(self._pending) >= self.chunkSize:
+                self._flush()
+        else:
+            self._upper.insert((x, y))
+            self._lower.insert((-x, -y))
+
+    def extend(self, x, y):
+        x = np.asarray(x, dtype=float).ravel()
+        y = np.asarray(y, dtype=float).ravel()
+        if len(x) != len(y):
+            raise ValueError('x and y must have the same length')
+        if self.chunkSize:
+            self._flush()
+            for start in range(0, len(x), self.chunkSize):
+                self._merge(x[start:start + self.chunkSize], y[start:start + self.chunkSize])
+        else:
+            for px, py in zip(x.tolist(), y.tolist()):
+                self._upper.insert((px, py))
+                self._lower.insert((-px, -py))
+
+    def rebuild(self, x, y):
+        '''Recompute the hull from scratch, after points were removed or moved'''
+        self._upper = _Chain()
+        self._lower = _Chain()
+        self._pending = []
+        self._merge(np.asarray(x, dtype=float), np.asarray(y, dtype=float))
+
+    def _flush(self):
+        if self._pending:
+            x, y = np.array(self._pending).T
+            self._pending = []
+            self._merge(x, y)
+
+    def _merge(self, x, y):
+        '''Replace both chains with the hull of the current vertices and a batch of points'''
+        hx, hy = self._vertexArrays()
+        x = np.concatenate([hx, x])
+        y = np.concatenate([hy, y])
+        if not len(x):
+            return
+        idx = hullIndices(x, y).tolist()
+        if len(idx) == 2 and (x[idx[0]], y[idx[0]]) == (x[idx[1]], y[idx[1]]):
+            idx = idx[:1]
+        # hullIndices starts at the smallest point and goes clockwise, so the upper
+        # chain runs up to the largest point and the lower chain comes back
+        last = max(range(len(idx)), key=lambda k: (x[idx[k]], y[idx[k]]))
+        upper = idx[:last + 1]
+        lower = idx[last:] + idx[:1] if last else idx[:1]
+        x, y = x.tolist(), y.tolist()
+        self._upper = _Chain([(x[k], y[k]) for k in upper])
+        self._lower = _Chain([(-x[k], -y[k]) for k in lower])
+
+    def _vertexArrays(self):
+        upper = self._upper.vertices
+        lower = self._lower.vertices[1:-1]
+        x = np.array([px for px, _ in upper] + [-px for px, _ in lower])
+        y = np.array([py for _, py in upper] + [-py for _, py in lower])
+        return x, y
+
+    def __len__(self):
+        self._flush()
+        return len(self._vertexArrays()[0])
+
+    def hull(self):
+        '''Current hull as a Polygon, clockwise from its lexicographically smallest vertex'''
+        self._flush()
+        return Polygon(Points.fromNPArray(*self._vertexArrays()))
+
+    def area(self):
+        self._flush()
+        x, y = self._vertexArrays()
+        # The vertices are clockwise, so the signed area is negative (or zero)
+        return abs(_signedArea(x, y))
+
+    def extreme(self, dx: float, dy: float):
+        '''Hull vertex furthest in the direction (dx, dy)'''
+        self._flush()
+        if not self._upper.vertices:
+            raise ValueError('the hull is empty')
+        if dy > 0:
+            x, y = self._upper.extreme(dx, dy)
+        elif dy < 0:
+            x, y = self._lower.extreme(-dx, -dy)
+            x, y = -x, -y
+        else:
+            x, y = self._upper.vertices[-1 if dx > 0 else 0]
+        return Point(x, y)
@@ -0,0 +1,101 @@
+'''Robust in-circle predicates for quadruples of points
+
+incircle reports whether d lies inside, outside or on the circle through a, b
+and c, given counterclockwise. The floating point determinant (with d
+translated to the origin) is used whenever Shewchuk's error bound certifies
+its sign. The remaining (nearly cocircular) cases are decided exactly in
+integer arithmetic: every float is an integer times a power of two, so the
+coordinates are scaled to integers by a common power of two first.
+'''
+
+import math
+
+import numpy as np
+
+INSIDE = 1
+OUTSIDE = -1
+COCIRCULAR = 0
+
+# Relative error bound of the floating point determinant (Shewchuk's iccerrboundA)
+ICCERRBOUND = (10.0 + 96.0 * 2.0 ** -53) * 2.0 ** -53
+
+# Below this the floating point terms may have lost precision to underflow
+_TINY = 2.0 ** -600
+
+
+def _sign(value):
+    return (value > 0) - (value < 0)
+
+
+def _exactInCircle(ax, ay, bx, by, cx, cy, dx, dy):
+    '''Exact sign of the in-circle determinant of eight finite Python floats'''
+    ratios = [v.as_integer_ratio() for v in (ax, ay, bx, by, cx, cy, dx, dy)]
+    # Denominators are powers of two, so the largest one is a multiple of the rest
+    scale = max([den for _, den in ratios])
+    ax, ay, bx, by, cx, cy, dx, dy = [num * (scale // den) for num, den in ratios]
+    adx, ady = ax - dx, ay - dy
+    bdx, bdy = bx - dx, by - dy
+    cdx, cdy = cx - dx, cy - dy
+    return _sign((adx * adx + ady * ady) * (bdx * cdy - cdx * bdy)
+                 + (bdx * bdx + bdy * bdy) * (cdx * ady - adx * cdy)
+                 + (cdx * cdx + cdy * cdy) * (adx * bdy - bdx * ady))
+
+
+def circleSide(ax, ay, bx, by, cx, cy, dx, dy):
+    '''Position of d relative to the circle through a, b and c (counterclockwise):
+    INSIDE, OUTSIDE or COCIRCULAR'''
+    adx, ady = ax - dx, ay - dy
+    bdx, bdy = bx - dx, by - dy
+    cdx, cdy = cx - dx, cy - dy
+    bc, cb = bdx * cdy, cdx * bdy
+    ca, ac = cdx * ady, adx * cdy
+    ab, ba = adx * bdy, bdx * ady
+    alift = adx * adx + ady * ady
+    blift = bdx * bdx + bdy * bdy
+    clift = cdx * cdx + cdy * cdy
+    det = alift * (bc - cb) + blift * (ca - ac) + clift * (ab - ba)
+    permanent = ((abs(bc) + abs(cb)) * alift + (abs(ca) + abs(ac)) * blift
+                 + (abs(ab) + abs(ba)) * clift)
+    bound = ICCERRBOUND * permanent
+    if permanent > _TINY and math.isfinite(permanent):
+        if det > bound:
+            return INSIDE
+        if -det > bound:
+            return OUTSIDE
+    return _exactInCircle(float(ax), float(ay), float(bx), float(by),
+                          float(cx), float(cy), float(dx), float(dy))
+
+
+def incircle(ax, ay, bx, by, cx, cy, dx, dy):
+    '''In-circle tests for many quadruples of points, given as (broadcastable) coordinate arrays
+
+    Returns an int8 array holding INSIDE (1) where d is inside the circle through
+    the counterclockwise triangle a, b, c, OUTSIDE (-1) where it is outside and
+    COCIRCULAR (0) otherwise.
+    '''
+    coords = np.broadcast_arrays(*[np.asarray(v, dtype=float)
+                                   for v in (ax, ay, bx, by, cx, cy, dx, dy)])
+    ax, ay, bx, by, cx, cy, dx, dy = coords
+    with np.errstate(over='ignore', invalid='ignore', under='ignore'):
+        adx, ady = ax - dx, ay - dy
+        bdx, bdy = bx - dx, by - dy
+        cdx, cdy = cx - dx, cy - dy
+        bc, cb = bdx * cdy, cdx * bdy
+        ca, ac = cdx * ady, adx * cdy
+        ab, ba = adx * bdy, bdx * ady
+        alift = adx * adx + ady * ady
+        blift = bdx * bdx + bdy * bdy
+        clift = cdx * cdx + cdy * cdy
+        det = alift * (bc - cb) + blift * (ca - ac) + clift * (ab - ba)
+        permanent = ((np.abs(bc) + np.abs(cb)) * alift + (np.abs(ca) + np.abs(ac)) * blift
+                     + (np.abs(ab) + np.abs(ba)) * clift)
+        # Overflowed or underflowed terms also go to the exact path
+        certain = ((np.abs(det) > ICCERRBOUND * permanent)
+                   & (permanent > _TINY) & np.isfinite(permanent))
+        result = np.where(certain, np.sign(det), 0).astype(np.int8)
+    ambiguous = np.flatnonzero(~certain.ravel())
+    if len(ambiguous):
+        # Gather the ambiguous coordinates once: ravelling broadcast inputs copies them
+        values = [v.ravel()[ambiguous].tolist() for v in coords]
+        result.ravel()[ambiguous] = [_exactInCircle(*quadruple) for quadruple in zip(*values)]
+    return result
@@ -0,0 +1,102 @@
+'''Uniform grid spatial index over point coordinates'''
+
+import numpy as np
+
+
+class GridIndex:
+    '''Uniform grid over a set of points for range and nearest-neighbour queries
+
+    Points are bucketed into square cells and stored sorted by cell, so the
+    points of a row of cells form one contiguous slice. Queries return arrays
+    of indices into the original coordinate arrays. The index is a snapshot:
+    points added to a Points container later are not included.
+    '''
+    def __init__(self, x, y, cellSize=None):
+        self.x = np.asarray(x, dtype=float)
+        self.y = np.asarray(y, dtype=float)
+        n = len(self.x)
+        self.xmin = self.x.min() if n else 0.0
+        self.ymin = self.y.min() if n else 0.0
+        self.xmax = self.x.max() if n else 0.0
+        self.ymax = self.y.max() if n else 0.0
+        width = self.xmax - self.xmin
+        height = self.ymax - self.ymin
+        if cellSize is None:
+            # Aim for about one point per cell, but keep the number of rows and columns
+            # below about sqrt(n) each so thin point sets do not get a long strip of cells
+            cellSize = max(np.sqrt(width * height / n), max(width, height) / np.sqrt(n)) if n else 0.0
+        self.cellSize = float(cellSize) if cellSize > 0 else 1.0
+        self.nx = int(width // self.cellSize) + 1
+        self.ny = int(height // self.cellSize) + 1
+        cells = self._cell(self.y, self.ymin, self.ny) * self.nx + self._cell(self.x, self.xmin, self.nx)
+        self.order = np.argsort(cells, kind='stable')
+        self.starts = np.searchsorted(cells[self.order], np.arange(self.nx * self.ny + 1))
+
+    def _cell(self, values, origin, count):
+        return np.clip(((values - origin) // self.cellSize).astype(np.intp), 0, count - 1)
+
+    def _cellRange(self, low, high, origin, count):
+        first = int(np.clip((low - origin) // self.cellSize, 0, count - 1))
+        last = int(np.clip((high - origin) // self.cellSize, 0, count - 1))
+        return first, last
+
+    def _candidates(self, xmin, ymin, xmax, ymax):
+        '''Indices of the points in the cells overlapping a rectangle'''
+        # A rectangle off any side of the points would otherwise clamp to the
+        # boundary cells and scan them for nothing
+        if (xmax < self.xmin or ymax < self.ymin or xmin > self.xmax or ymin > self.ymax
+                or len(self.x) == 0):
+            return np.empty(0, dtype=np.intp)
+        cx0, cx1 = self._cellRange(xmin, xmax, self.xmin, self.nx)
+        cy0, cy1 = self._cellRange(ymin, ymax, self.ymin, self.ny)
+        if cx0 == 0 and cx1 == self.nx - 1:
+            # Whole rows of cells are stored contiguously
+            return self.order[self.starts[cy0 * self.nx]:self.starts[(cy1 + 1) * self.nx]]
+        return np.concatenate([self._run(row, cx0, cx1) for row in range(cy0, cy1 + 1)])
+
+    def queryRect(self, xmin, ymin, xmax, ymax):
+        '''Indices of the points inside a closed axis-aligned rectangle'''
+        candidates = self._candidates(xmin, ymin, xmax, ymax)
+        x, y = self.x[candidates], self.y[candidates]
+        return np.sort(candidates[(x >= xmin) & (x <= xmax) & (y >= ymin) & (y <= ymax)])
+
+    def queryRadius(self, x, y, r):
+        '''Indices of the points within distance r of (x, y)'''
+        candidates = self._candidates(x - r, y - r, x + r, y + r)
+        distances = np.hypot(self.x[candidates] - x, self.y[candidates] - y)
+        return np.sort(candidates[distances <= r])
+
+    def nearest(self, x, y):
+        '''Index of the nearest point to each query point, for arrays of queries'''
+        qx = np.atleast_1d(np.asarray(x, dtype=float))
+        qy = np.atleast_1d(np.asarray(y, dtype=float))
+        if len(self.x) == 0:
+            raise ValueError('cannot search an empty index')
+        result = np.empty(len(qx), dtype=np.intp)
+        for idx, (px, py) in enumerate(zip(qx.tolist(), qy.tolist())):
+            result[idx] = self._nearestOne(px, py)
+        return result
+
+    def _run(self, row, first, last):
+        '''Indices of the points in cells first..last of a row of the grid'''
+        return self.order[self.starts[row * self.nx + first]:self.starts[row * self.nx + last + 1]]
+
+    def _nearestOne(self, x, y):
+        # Grow a square of cells around the query's (clamped) cell until it holds a
+        # point. The nearest point is no further away than that one, so it lies in
+        # the rectangle of that radius around the query.
+        cx = int(np.clip((x - self.xmin) // self.cellSize, 0, self.nx - 1))
+        cy = int(np.clip((y - self.ymin) // self.cellSize, 0, self.ny - 1))
+        ring = 0
+        while True:
+            x0, x1 = max(cx - ring, 0), min(cx + ring, self.nx - 1)
+            y0, y1 = max(cy - ring, 0), min(cy + ring, self.ny - 1)
+            candidates = np.concatenate([self._run(row, x0, x1) for row in range(y0, y1 + 1)])
+            if len(candidates):
+                break
+            ring += 1
+        radius = np.hypot(self.x[candidates] - x, self.y[candidates] - y).min()
+        candidates = self._candidates(x - radius, y - radius, x + radius, y + radius)
+        distances = np.hypot(self.x[candidates] - x, self.y[candidates] - y)
+        # Ties go to the lowest index, like a brute force argmin
+        return candidates[distances == distances.min()].min()
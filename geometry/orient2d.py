@@ -0,0 +1,112 @@
+'''Robust orientation predicates for triples of points
+
+orient2d reports whether c lies to the left of, to the right of, or on the
+directed line from a to b. The floating point determinant is used whenever
+Shewchuk's error bound certifies its sign. The remaining (nearly collinear)
+cases are decided exactly: each product of coordinates is split into two
+floats without rounding and the twelve terms are summed with math.fsum,
+falling back to rational arithmetic for coordinates so large or small that
+the split could overflow or underflow.
+'''
+
+import fractions
+import math
+
+import numpy as np
+
+LEFT = 1
+RIGHT = -1
+COLLINEAR = 0
+
+# Relative error bound of the floating point determinant (Shewchuk's ccwerrboundA)
+ERRBOUND = (3.0 + 16.0 * 2.0 ** -53) * 2.0 ** -53
+
+# Veltkamp splitting constant for doubles, 2**27 + 1
+_SPLITTER = 134217729.0
+
+# Coordinates in this range (or zero) can be multiplied exactly as a sum of two doubles
+_TINY = 2.0 ** -400
+_HUGE = 2.0 ** 400
+
+
+def _twoProduct(a, b):
+    '''Return p, e with p + e == a * b exactly (for floats or arrays)'''
+    p = a * b
+    c = _SPLITTER * a
+    ahi = c - (c - a)
+    alo = a - ahi
+    c = _SPLITTER * b
+    bhi = c - (c - b)
+    blo = b - bhi
+    e = alo * blo - (((p - ahi * bhi) - alo * bhi) - ahi * blo)
+    return p, e
+
+
+def _terms(ax, ay, bx, by, cx, cy):
+    '''The determinant expanded as twelve floats that sum to it exactly'''
+    terms = []
+    for u, v, sign in ((ax, by, 1), (ax, cy, -1), (bx, cy, 1),
+                       (bx, ay, -1), (cx, ay, 1), (cx, by, -1)):
+        p, e = _twoProduct(u, v)
+        terms.extend([sign * p, sign * e])
+    return terms
+
+
+def _inRange(*values):
+    return all([v == 0 or _TINY <= abs(v) <= _HUGE for v in values])
+
+
+def _sign(value):
+    return (value > 0) - (value < 0)
+
+
+def _exactOrientation(ax, ay, bx, by, cx, cy):
+    '''Exact sign of the orientation determinant of six Python floats'''
+    if _inRange(ax, ay, bx, by, cx, cy):
+        return _sign(math.fsum(_terms(ax, ay, bx, by, cx, cy)))
+    ax, ay, bx, by, cx, cy = map(fractions.Fraction, (ax, ay, bx, by, cx, cy))
+    return _sign((bx - ax) * (cy - ay) - (by - ay) * (cx - ax))
+
+
+def orientation(ax, ay, bx, by, cx, cy):
+    '''Orientation of a single triple of points: LEFT, RIGHT or COLLINEAR'''
+    left = (bx - ax) * (cy - ay)
+    right = (by - ay) * (cx - ax)
+    det = left - right
+    bound = ERRBOUND * (abs(left) + abs(right))
+    if det > bound:
+        return LEFT
+    if -det > bound:
+        return RIGHT
+    return _exactOrientation(float(ax), float(ay), float(bx), float(by), float(cx), float(cy))
+
+
+def orient2d(ax, ay, bx, by, cx, cy):
+    '''Orientations of many triples of points, given as (broadcastable) coordinate arrays
+
+    Returns an int8 array holding LEFT (1) where c is left of the directed line
+    a -> b (a counterclockwise turn), RIGHT (-1) where it is to the right and
+    COLLINEAR (0) otherwise.
+    '''
+    ax, ay, bx, by, cx, cy = np.broadcast_arrays(*[np.asarray(v, dtype=float)
+                                                   for v in (ax, ay, bx, by, cx, cy)])
+    with np.errstate(over='ignore', invalid='ignore'):
+        left = (bx - ax) * (cy - ay)
+        right = (by - ay) * (cx - ax)
+        det = left - right
+        # Overflowed determinants are not finite and also go to the exact path
+        certain = np.abs(det) > ERRBOUND * (np.abs(left) + np.abs(right))
+        result = np.where(certain, np.sign(det), 0).astype(np.int8)
+    ambiguous = np.flatnonzero(~certain)
+    if len(ambiguous):
+        coords = [v.ravel()[ambiguous] for v in (ax, ay, bx, by, cx, cy)]
+        signs = np.empty(len(ambiguous), dtype=np.int8)
+        safe = np.all([(v == 0) | ((np.abs(v) >= _TINY) & (np.abs(v) <= _HUGE)) for v in coords], axis=0)
+        if np.any(safe):
+            # Split every product at once and only run the exact summation per triple
+            terms = np.array(_terms(*[v[safe] for v in coords]))
+            signs[safe] = [_sign(math.fsum(column)) for column in terms.T.tolist()]
+        for idx in np.flatnonzero(~safe):
+            signs[idx] = _exactOrientation(*[float(v[idx]) for v in coords])
+        result.ravel()[ambiguous] = signs
+    return result
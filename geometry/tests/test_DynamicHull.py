@@ -0,0 +1,107 @@
+import numpy as np
+import pytest
+
+from ..geometry import DynamicHull, Point, Points, hullIndices
+
+
+def reference(x, y):
+    '''Hull vertices from hullIndices, with the repeated point of an all-equal input merged'''
+    idx = hullIndices(np.asarray(x, dtype=float), np.asarray(y, dtype=float))
+    vertices = list(zip(np.asarray(x)[idx].tolist(), np.asarray(y)[idx].tolist()))
+    return vertices[:1] if len(set(vertices)) == 1 else vertices
+
+def vertices(hull):
+    polygon = hull.hull()
+    return list(zip(polygon.points.npx.tolist(), polygon.points.npy.tolist()))
+
+def shoelace(vertices):
+    x = np.array([px for px, _ in vertices])
+    y = np.array([py for _, py in vertices])
+    return -0.5 * float(np.dot(x, np.roll(y, -1)) - np.dot(np.roll(x, -1), y))
+
+def check(hull, x, y):
+    expected = reference(x, y)
+    assert vertices(hull) == expected
+    assert len(hull) == len(expected)
+    assert hull.area() == pytest.approx(shoelace(expected), abs=1e-12)
+    x, y = np.asarray(x, dtype=float), np.asarray(y, dtype=float)
+    for angle in np.linspace(0, 2 * np.pi, 16, endpoint=False):
+        dx, dy = np.cos(angle), np.sin(angle)
+        point = hull.extreme(dx, dy)
+        assert point.x * dx + point.y * dy == pytest.approx((x * dx + y * dy).max())
+    for dx, dy in [(1, 0), (-1, 0), (0, 1), (0, -1)]:
+        point = hull.extreme(dx, dy)
+        assert point.x * dx + point.y * dy == (x * dx + y * dy).max()
+
+def streams():
+    rng = np.random.default_rng(0)
+    t = rng.random(300)
+    return {
+        'uniform': (rng.random(300), rng.random(300)),
+        'grid': (rng.integers(0, 6, 300).astype(float), rng.integers(0, 6, 300).astype(float)),
+        'collinear': (t, 2 * t),
+        'duplicates': (np.full(300, 0.25), np.full(300, 0.75)),
+        'repeated': (np.tile([0.0, 1.0, 0.5, 1.0], 75), np.tile([0.0, 1.0, 0.5, 0.0], 75)),
+        'circle': (np.cos(7 * t), np.sin(7 * t)),
+    }
+
+@pytest.mark.parametrize('name', sorted(streams()))
+@pytest.mark.parametrize('chunkSize', [None, 1, 7, 64])
+def test_add_matches_hull_indices(name, chunkSize):
+    x, y = streams()[name]
+    hull = DynamicHull(chunkSize=chunkSize)
+    for k, (px, py) in enumerate(zip(x.tolist(), y.tolist())):
+        hull.add(px, py)
+        if k in (0, 1, 2, 10, 99):
+            check(hull, x[:k + 1], y[:k + 1])
+    check(hull, x, y)
+
+@pytest.mark.parametrize('name', sorted(streams()))
+@pytest.mark.parametrize('chunkSize', [None, 7, 64])
+def test_extend_matches_hull_indices(name, chunkSize):
+    x, y = streams()[name]
+    hull = DynamicHull(x[:40], y[:40], chunkSize=chunkSize)
+    check(hull, x[:40], y[:40])
+    hull.extend(x[40:200], y[40:200])
+    check(hull, x[:200], y[:200])
+    hull.add(x[200], y[200])
+    hull.extend(x[201:], y[201:])
+    check(hull, x, y)
+
+@pytest.mark.parametrize('chunkSize', [None, 16])
+def test_points_keep_their_hull_up_to_date(chunkSize):
+    rng = np.random.default_rng(1)
+    x, y = rng.random(100), rng.random(100)
+    points = Points.fromNPArray(x, y)
+    hull = points.dynamicHull(chunkSize)
+    check(hull, points.npx, points.npy)
+    points.append(Point(2, 2))
+    check(hull, points.npx, points.npy)
+    points.extend(rng.random(50) * 3, rng.random(50) * 3)
+    check(hull, points.npx, points.npy)
+    # Removing or moving hull vertices shrinks the hull, which needs a rebuild
+    points.pop(int(np.argmax(points.npx)))
+    check(hull, points.npx, points.npy)
+    corner = points[int(np.argmin(points.npx))]
+    corner.x = 0.5
+    check(hull, points.npx, points.npy)
+    corner.y = -5
+    check(hull, points.npx, points.npy)
+    # The input arrays were wrapped, not written to
+    assert np.array_equal(x, Points.fromNPArray(x, y).npx)
+
+def test_empty_hull():
+    hull = DynamicHull()
+    assert len(hull) == 0
+    assert hull.area() == 0
+    with pytest.raises(ValueError):
+        hull.extreme(1, 0)
+    with pytest.raises(ValueError):
+        hull.extend([1, 2], [1])
+
+def test_area_far_from_the_origin():
+    for offset in [1e8, -1e12]:
+        hull = DynamicHull(offset + np.array([0.0, 0, 1, 1, 0.5]), offset + np.array([0.0, 1, 1, 0, 0.5]))
+        assert hull.area() == 1
+    # A degenerate hull has no area, not a negative zero
+    assert str(DynamicHull([1e8, 1e8 + 1], [1e8, 1e8]).area()) == '0.0'
@@ -0,0 +1,168 @@
+import copy
+import pickle
+
+import numpy as np
+import pytest
+
+from ..geometry import Point, Points, Polygon
+from ..orient2d import RIGHT, orientation
+
+
+def uniform_square(n, rng):
+    return rng.random(n), rng.random(n)
+
+def uniform_disk(n, rng):
+    r = np.sqrt(rng.random(n))
+    theta = 2 * np.pi * rng.random(n)
+    return r * np.cos(theta), r * np.sin(theta)
+
+def circle(n, rng):
+    # Up to rounding, every point is a hull vertex
+    theta = 2 * np.pi * rng.random(n)
+    return np.cos(theta), np.sin(theta)
+
+def clustered(n, rng, clusters=10, spread=0.02):
+    centres = rng.random((clusters, 2))
+    labels = rng.integers(clusters, size=n)
+    return (centres[labels, 0] + spread * rng.normal(size=n),
+            centres[labels, 1] + spread * rng.normal(size=n))
+
+def collinear(n, rng):
+    # Doubling is exact, so the points really are on one line
+    x = rng.random(n)
+    return x, 2 * x
+
+DISTRIBUTIONS = {
+    'square': uniform_square,
+    'disk': uniform_disk,
+    'circle': circle,
+    'clustered': clustered,
+    'collinear': collinear,
+}
+
+def reference_hull(x, y):
+    '''Hull vertices as a list of (x, y), by a plain monotone chain with the exact predicate
+
+    Same convention as convexHull: clockwise from the smallest point, collinear points dropped.
+    '''
+    points = sorted(zip(np.asarray(x, dtype=float).tolist(), np.asarray(y, dtype=float).tolist()))
+    if len(points) < 3:
+        return points
+
+    def chain(ordered):
+        kept = []
+        for point in ordered:
+            while len(kept) > 1 and orientation(*kept[-2], *kept[-1], *point) != RIGHT:
+                kept.pop()
+            kept.append(point)
+        return kept
+
+    return chain(points) + chain(reversed(points))[1:-1]
+
+def hull_coordinates(points):
+    hull = points.convexHull()
+    return list(zip(hull.points.npx.tolist(), hull.points.npy.tolist()))
+
+@pytest.mark.parametrize('distribution', sorted(DISTRIBUTIONS))
+@pytest.mark.parametrize('n', [3, 10, 1000])
+def test_hull_matches_reference(distribution, n):
+    rng = np.random.default_rng(n)
+    x, y = DISTRIBUTIONS[distribution](n, rng)
+    assert hull_coordinates(Points.fromNPArray(x, y)) == reference_hull(x, y)
+
+@pytest.mark.parametrize('distribution', sorted(DISTRIBUTIONS))
+def test_chunked_hull_matches_reference(distribution):
+    rng = np.random.default_rng(0)
+    x, y = DISTRIBUTIONS[distribution](5000, rng)
+    hull = Points.fromNPArray(x, y).convexHull(chunkSize=700)
+    assert list(zip(hull.points.npx.tolist(), hull.points.npy.tolist())) == reference_hull(x, y)
+
+def test_hull_of_square_with_duplicates_and_interior_points():
+    x = np.array([0, 0, 1, 1, 0, 0.5, 0.5, 1] * 3, dtype=float)
+    y = np.array([0, 1, 0, 1, 0, 0.5, 0, 0.5] * 3, dtype=float)
+    assert hull_coordinates(Points.fromNPArray(x, y)) == [(0, 0), (0, 1), (1, 1), (1, 0)]
+
+def test_hull_of_collinear_points_is_a_segment():
+    x = np.arange(10, dtype=float)
+    assert hull_coordinates(Points.fromNPArray(x, 2 * x)) == [(0, 0), (9, 18)]
+
+def test_every_circle_point_is_on_the_hull():
+    theta = -2 * np.pi * np.arange(100) / 100
+    points = Points.fromNPArray(np.cos(theta), np.sin(theta))
+    hull = points.convexHull()
+    assert len(hull.points) == 100
+    assert hull.isConvex()
+
+def test_hull_of_hull_is_itself():
+    rng = np.random.default_rng(0)
+    hull = Points.fromNPArray(rng.random(1000), rng.random(1000)).convexHull()
+    assert hull.points.convexHull().points == hull.points
+
+def test_append_and_pop():
+    points = Points.fromNPArray(np.array([0.0, 1.0]), np.array([0.0, 1.0]))
+    for idx in range(100):
+        points.append(Point(idx, -idx))
+    assert len(points) == 102
+    assert points[-1] == Point(99, -99)
+    for idx in reversed(range(100)):
+        assert points.pop() == Point(idx, -idx)
+    assert points == Points([Point(0, 0), Point(1, 1)])
+
+def test_pop_from_front_and_out_of_range():
+    points = Points([Point(0, 0), Point(1, 2), Point(3, 4)])
+    assert points.pop(0) == Point(0, 0)
+    assert list(points.npx) == [1, 3]
+    with pytest.raises(IndexError):
+        points.pop(2)
+
+def test_append_does_not_modify_wrapped_arrays():
+    x = np.array([0.0, 1.0])
+    y = np.array([0.0, 1.0])
+    points = Points.fromNPArray(x, y)
+    points.append(Point(2, 2))
+    points.pop(0)
+    assert list(x) == [0, 1]
+    assert list(points.npx) == [1, 2]
+
+def test_construction_from_points_and_arrays_agree():
+    rng = np.random.default_rng(0)
+    x, y = rng.random(50), rng.random(50)
+    points = Points([Point(px, py) for px, py in zip(x.tolist(), y.tolist())])
+    extended = Points()
+    extended.extend(x, y)
+    assert points == Points.fromNPArray(x, y) == extended
+
+def test_pickle_round_trip(tmp_path):
+    points = Points([Point(0, 0), Point(1, 2)])
+    hull = points.dynamicHull()
+    points.append(Point(3, -1))
+    restored = pickle.loads(pickle.dumps(points))
+    assert restored == points
+    # The restored points have no hulls, but can start following new ones
+    restored.append(Point(5, 5))
+    assert len(hull) == 3
+    assert len(restored.dynamicHull()) == 4
+    np.save(tmp_path / 'points.npy', np.array([[0.0, 1.0], [2.0, 3.0]]))
+    mapped = Points.fromFile(tmp_path / 'points.npy')
+    assert pickle.loads(pickle.dumps(mapped)) == mapped
+
+def test_copies_are_independent():
+    x, y = np.array([0.0, 1.0]), np.array([0.0, 1.0])
+    points = Points.fromNPArray(x, y)
+    hull = points.dynamicHull()
+    for duplicate in [copy.copy(points), copy.deepcopy(points)]:
+        assert duplicate == points
+        duplicate.append(Point(2, -2))
+        duplicate.pop(0)
+        assert list(duplicate.npx) == [1, 2]
+    assert list(points.npx) == [0, 1]
+    assert list(x) == [0, 1]
+    assert len(hull) == 2
+
+def test_is_convex():
+    square = Polygon(Points([Point(0, 0), Point(0, 1), Point(1, 1), Point(1, 0)]))
+    assert square.isConvex()
+    # Counterclockwise, reflex and degenerate polygons are not
+    assert not Polygon(Points([Point(0, 0), Point(1, 0), Point(1, 1), Point(0, 1)])).isConvex()
+    assert not Polygon(Points([Point(0, 0), Point(0, 2), Point(0.5, 0.5), Point(2, 0)])).isConvex()
+    assert not Polygon(Points([Point(0, 0), Point(0, 1), Point(0, 2), Point(1, 0)])).isConvex()
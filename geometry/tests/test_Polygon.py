@@ -0,0 +1,192 @@
+from fractions import Fraction
+
+import numpy as np
+import pytest
+
+from ..geometry import Point, Points, Polygon, _crossingContains
+
+
+def exact_side(ax, ay, bx, by, cx, cy):
+    ax, ay, bx, by, cx, cy = map(Fraction, (ax, ay, bx, by, cx, cy))
+    det = (bx - ax) * (cy - ay) - (by - ay) * (cx - ax)
+    return (det > 0) - (det < 0)
+
+def on_segment(ax, ay, bx, by, cx, cy):
+    return (exact_side(ax, ay, bx, by, cx, cy) == 0
+            and min(ax, bx) <= cx <= max(ax, bx) and min(ay, by) <= cy <= max(ay, by))
+
+def edges(polygon):
+    x, y = polygon.points.npx.tolist(), polygon.points.npy.tolist()
+    return list(zip(x, y, x[1:] + x[:1], y[1:] + y[:1]))
+
+def exact_contains(polygon, qx, qy):
+    '''Crossing parity in rational arithmetic, with the boundary counted as inside'''
+    if any([on_segment(*edge, qx, qy) for edge in edges(polygon)]):
+        return True
+    inside = False
+    for ax, ay, bx, by in edges(polygon):
+        if (ay <= qy < by and exact_side(ax, ay, bx, by, qx, qy) > 0
+                or by <= qy < ay and exact_side(ax, ay, bx, by, qx, qy) < 0):
+            inside = not inside
+    return inside
+
+def random_convex_polygon(rng, n=30):
+    return Points.fromNPArray(rng.integers(-8, 8, n).astype(float),
+                              rng.integers(-8, 8, n).astype(float)).convexHull()
+
+def grid_queries():
+    qx, qy = np.meshgrid(np.arange(-9, 9, 0.5), np.arange(-9, 9, 0.5))
+    return qx.ravel(), qy.ravel()
+
+@pytest.mark.parametrize('seed', range(5))
+def test_fan_matches_exact_reference_both_orientations(seed):
+    clockwise = random_convex_polygon(np.random.default_rng(seed))
+    x, y = clockwise.points.npx, clockwise.points.npy
+    counterclockwise = Polygon(Points.fromNPArray(x[::-1].copy(), y[::-1].copy()))
+    qx, qy = grid_queries()
+    expected = [exact_contains(clockwise, px, py) for px, py in zip(qx.tolist(), qy.tolist())]
+    assert clockwise.contains(qx, qy).tolist() == expected
+    assert counterclockwise.contains(qx, qy).tolist() == expected
+
+@pytest.mark.parametrize('seed', range(5))
+def test_fan_matches_crossing_off_the_boundary(seed):
+    rng = np.random.default_rng(seed)
+    polygon = random_convex_polygon(rng)
+    qx, qy = rng.uniform(-9, 9, 2000), rng.uniform(-9, 9, 2000)
+    px, py = polygon.points.npx, polygon.points.npy
+    assert np.array_equal(polygon.contains(qx, qy), _crossingContains(px, py, qx, qy))
+
+def test_boundary_points_of_convex_polygon_are_inside():
+    square = Polygon(Points([Point(0, 0), Point(0, 2), Point(2, 2), Point(2, 0)]))
+    for point in [Point(0, 0), Point(0, 1), Point(2, 2), Point(1, 2), Point(2, 0.5)]:
+        assert square.contains(point)
+    assert not square.contains(Point(2 + 2 ** -51, 1))
+    assert not square.contains(Point(-1e-300, 1))
+
+def test_nonconvex_polygon_uses_crossing_test():
+    # An L shape, clockwise
+    shape = Polygon(Points([Point(0, 0), Point(0, 4), Point(2, 4), Point(2, 2), Point(4, 2), Point(4, 0)]))
+    assert not shape.isConvex()
+    rng = np.random.default_rng(0)
+    qx, qy = rng.uniform(-1, 5, 2000), rng.uniform(-1, 5, 2000)
+    expected = [exact_contains(shape, px, py) for px, py in zip(qx.tolist(), qy.tolist())]
+    assert shape.contains(qx, qy).tolist() == expected
+    assert shape.contains(Points.fromNPArray(qx, qy)).tolist() == expected
+    assert not shape.contains(Point(3, 3))
+    assert shape.contains(Point(1, 3))
+
+def polygon(*vertices):
+    return Polygon(Points([Point(x, y) for x, y in vertices]))
+
+def vertex_list(polygon):
+    return list(zip(polygon.points.npx.tolist(), polygon.points.npy.tolist()))
+
+def close_polygons(first, second, tolerance=1e-9):
+    '''Whether two polygons agree up to rounding
+
+    Clipping constructs its vertices differently, so where a window vertex lies
+    on a subject edge it can produce two vertices a rounding error apart.
+    Compare the vertex sets within a tolerance, and the areas.
+    '''
+    a = np.column_stack([first.points.npx, first.points.npy])
+    b = np.column_stack([second.points.npx, second.points.npy])
+    if not len(a) or not len(b):
+        return len(a) == len(b)
+    distances = np.hypot(*(a[:, None, :] - b[None, :, :]).transpose(2, 0, 1))
+    return (distances.min(axis=0).max() < tolerance and distances.min(axis=1).max() < tolerance
+            and abs(first.area() - second.area()) < tolerance)
+
+def random_polygon_pairs(count=300):
+    rng = np.random.default_rng(0)
+    for _ in range(count):
+        # Small integer grids give plenty of shared edges, vertices and containment
+        hulls = [Points.fromNPArray(rng.integers(0, 8, 12).astype(float),
+                                    rng.integers(0, 8, 12).astype(float)).convexHull() for _ in range(2)]
+        if all([len(hull.points) >= 3 for hull in hulls]):
+            yield hulls
+
+def test_area_perimeter_centroid():
+    square = polygon((0, 0), (0, 2), (2, 2), (2, 0))
+    assert square.area() == 4
+    assert square.perimeter() == 8
+    assert square.centroid() == Point(1, 1)
+    triangle = polygon((0, 0), (3, 0), (0, 3))
+    assert triangle.area() == 4.5
+    assert triangle.centroid() == Point(1, 1)
+    assert polygon((0, 0), (1, 1), (2, 2)).area() == 0
+    assert polygon((0, 0), (1, 1), (2, 2)).centroid() == Point(1, 1)
+
+def test_area_and_centroid_far_from_the_origin():
+    for offset in [1e8, -1e12]:
+        square = polygon(*[(offset + x, offset + y) for x, y in [(0, 0), (0, 1), (1, 1), (1, 0)]])
+        assert square.area() == 1
+        assert square.centroid() == Point(offset + 0.5, offset + 0.5)
+        # Unlike the square's, this centroid is not the mean of the vertices (1, 1.5)
+        shape = polygon(*[(offset + x, offset + y) for x, y in [(0, 0), (0, 3), (1, 3), (3, 0)]])
+        assert shape.area() == 6
+        assert shape.centroid().x - offset == pytest.approx(13 / 12, abs=abs(np.spacing(offset)))
+        assert shape.centroid().y - offset == pytest.approx(5 / 4, abs=abs(np.spacing(offset)))
+
+def test_intersection_matches_clip_both_ways():
+    for p, q in random_polygon_pairs():
+        expected = p.intersection(q)
+        assert q.intersection(p).points == expected.points
+        assert close_polygons(p.clip(q), expected)
+        assert close_polygons(q.clip(p), expected)
+        if len(expected.points) >= 3:
+            assert expected.isConvex()
+            assert expected.area() <= min(p.area(), q.area()) + 1e-9
+
+def test_minkowski_sum_is_hull_of_vertex_sums():
+    for p, q in random_polygon_pairs():
+        sx = np.add.outer(p.points.npx, q.points.npx).ravel()
+        sy = np.add.outer(p.points.npy, q.points.npy).ravel()
+        expected = Points.fromNPArray(sx, sy).convexHull()
+        assert p.minkowskiSum(q).points == expected.points
+        assert q.minkowskiSum(p).points == expected.points
+
+def test_touching_polygons():
+    square = polygon((0, 0), (0, 1), (1, 1), (1, 0))
+    edge_neighbour = polygon((1, 0), (1, 1), (2, 1), (2, 0))
+    corner_neighbour = polygon((1, 1), (1, 2), (2, 2), (2, 1))
+    assert vertex_list(square.intersection(edge_neighbour)) == [(1, 0), (1, 1)]
+    assert vertex_list(square.intersection(corner_neighbour)) == [(1, 1)]
+    assert vertex_list(square.clip(edge_neighbour)) == [(1, 0), (1, 1)]
+    assert vertex_list(square.clip(corner_neighbour)) == [(1, 1)]
+
+def test_shared_vertices():
+    # Both boundaries start at (1, 0), and (3, 1) lies on an edge of the triangle
+    triangle = polygon((1, 0), (4, 4), (4, 0))
+    hexagon = polygon((0, 0), (0, 2), (1, 3), (2, 3), (3, 1), (1, 0))
+    expected = [(1, 0), (2.5, 2), (3, 1)]
+    assert vertex_list(triangle.intersection(hexagon)) == expected
+    assert vertex_list(hexagon.intersection(triangle)) == expected
+
+def test_nested_and_disjoint_polygons():
+    outer = polygon((0, 0), (0, 4), (4, 4), (4, 0))
+    inner = polygon((1, 1), (1, 2), (2, 2), (2, 1))
+    far = polygon((10, 10), (10, 11), (11, 11), (11, 10))
+    assert outer.intersection(inner).points == inner.points
+    assert inner.intersection(outer).points == inner.points
+    assert outer.clip(inner).points == inner.points
+    assert inner.clip(outer).points == inner.points
+    assert len(outer.intersection(far).points) == 0
+    assert len(far.clip(outer).points) == 0
+
+def test_non_strictly_convex_input_is_rejected():
+    square = polygon((0, 0), (0, 1), (1, 1), (1, 0))
+    with_midpoint = polygon((0, 0), (0, 0.5), (0, 1), (1, 1), (1, 0))
+    reflex = polygon((0, 0), (0, 2), (0.5, 0.5), (2, 0))
+    segment = polygon((0, 0), (1, 1))
+    for bad in [with_midpoint, reflex, segment]:
+        with pytest.raises(ValueError):
+            square.intersection(bad)
+        with pytest.raises(ValueError):
+            bad.intersection(square)
+        with pytest.raises(ValueError):
+            square.clip(bad)
+        with pytest.raises(ValueError):
+            square.minkowskiSum(bad)
+    # Only the window has to be convex
+    # The notch cuts (1/3, 1), (1, 1), (1, 1/3), (0.5, 0.5) out of the unit square
+    assert reflex.clip(square).area() == pytest.approx(2 / 3)
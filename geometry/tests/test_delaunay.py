@@ -0,0 +1,165 @@
+from fractions import Fraction
+
+import numpy as np
+import pytest
+
+from ..delaunay import Triangulation
+from ..geometry import Points
+from ..incircle import COCIRCULAR, INSIDE, OUTSIDE, circleSide, incircle
+
+
+def random_points():
+    rng = np.random.default_rng(0)
+    return rng.random(200), rng.random(200)
+
+def grid_points():
+    # Every 2x2 cell of a grid is cocircular, and some points are repeated
+    rng = np.random.default_rng(1)
+    x, y = rng.integers(0, 6, 80).astype(float), rng.integers(0, 6, 80).astype(float)
+    return x, y
+
+def cocircular_points():
+    # The 12 integer points at distance 5 from the origin, and the centre
+    ring = [(5, 0), (4, 3), (3, 4), (0, 5), (-3, 4), (-4, 3),
+            (-5, 0), (-4, -3), (-3, -4), (0, -5), (3, -4), (4, -3)]
+    x, y = np.array(ring + [(0, 0)], dtype=float).T
+    return x, y
+
+def collinear_points():
+    x = np.random.default_rng(2).integers(0, 20, 30).astype(float)
+    return x, 2 * x + 1
+
+POINT_SETS = {
+    'random': random_points,
+    'grid': grid_points,
+    'cocircular': cocircular_points,
+    'cocircular ring': lambda: tuple(v[:-1] for v in cocircular_points()),
+    'collinear': collinear_points,
+}
+
+@pytest.fixture(params=sorted(POINT_SETS))
+def triangulation(request):
+    x, y = POINT_SETS[request.param]()
+    return Triangulation(x, y, seed=3)
+
+def triangle_areas(t):
+    x, y, tri = t.x, t.y, t.triangles
+    return ((x[tri[:, 1]] - x[tri[:, 0]]) * (y[tri[:, 2]] - y[tri[:, 0]])
+            - (y[tri[:, 1]] - y[tri[:, 0]]) * (x[tri[:, 2]] - x[tri[:, 0]])) / 2
+
+def prim_weight(x, y):
+    '''Minimum spanning tree weight by Prim's algorithm on the complete graph'''
+    distances = np.hypot(x[:, None] - x[None, :], y[:, None] - y[None, :])
+    best = distances[0].copy()
+    done = np.zeros(len(x), dtype=bool)
+    done[0] = True
+    total = 0.0
+    for _ in range(len(x) - 1):
+        nearest = np.flatnonzero(~done)[np.argmin(best[~done])]
+        total += best[nearest]
+        done[nearest] = True
+        best = np.minimum(best, distances[nearest])
+    return total
+
+def exact_circle_side(ax, ay, bx, by, cx, cy, dx, dy):
+    ax, ay, bx, by, cx, cy, dx, dy = map(Fraction, (ax, ay, bx, by, cx, cy, dx, dy))
+    rows = [(px - dx, py - dy) for px, py in ((ax, ay), (bx, by), (cx, cy))]
+    (adx, ady), (bdx, bdy), (cdx, cdy) = rows
+    det = ((adx * adx + ady * ady) * (bdx * cdy - cdx * bdy)
+           + (bdx * bdx + bdy * bdy) * (cdx * ady - adx * cdy)
+           + (cdx * cdx + cdy * cdy) * (adx * bdy - bdx * ady))
+    return (det > 0) - (det < 0)
+
+def test_no_point_is_inside_a_circumcircle(triangulation):
+    t = triangulation
+    tri = t.triangles
+    x, y = t.x[:, None], t.y[:, None]
+    sides = incircle(t.x[tri[:, 0]], t.y[tri[:, 0]], t.x[tri[:, 1]], t.y[tri[:, 1]],
+                     t.x[tri[:, 2]], t.y[tri[:, 2]], x, y)
+    assert not np.any(sides == INSIDE)
+
+def test_triangles_are_counterclockwise_and_tile_the_hull(triangulation):
+    t = triangulation
+    areas = triangle_areas(t)
+    assert np.all(areas > 0)
+    hull = Points.fromNPArray(t.x, t.y).convexHull()
+    hullArea = hull.area() if len(hull.points) >= 3 else 0
+    assert areas.sum() == pytest.approx(hullArea, rel=1e-12, abs=0)
+
+def test_neighbors_are_symmetric(triangulation):
+    t = triangulation
+    hullEdges = 0
+    for i, (triangle, adjacent) in enumerate(zip(t.triangles.tolist(), t.neighbors.tolist())):
+        for k, j in enumerate(adjacent):
+            edge = {triangle[(k + 1) % 3], triangle[(k + 2) % 3]}
+            if j < 0:
+                hullEdges += 1
+                continue
+            back = t.neighbors[j].tolist().index(i)
+            other = t.triangles[j].tolist()
+            assert {other[(back + 1) % 3], other[(back + 2) % 3]} == edge
+    if len(t.triangles):
+        # Euler: a triangulation of v vertices with h on the hull has 2v - 2 - h triangles
+        vertices = len(np.unique(t.triangles))
+        assert len(t.triangles) == 2 * vertices - 2 - hullEdges
+
+def test_mst_matches_prim(triangulation):
+    t = triangulation
+    tree = t.mst()
+    assert tree.shape == (len(t.x) - 1, 2)
+    weight = np.hypot(t.x[tree[:, 0]] - t.x[tree[:, 1]], t.y[tree[:, 0]] - t.y[tree[:, 1]]).sum()
+    assert weight == pytest.approx(prim_weight(t.x, t.y), rel=1e-12)
+    # The tree spans every point
+    assert len(np.unique(tree)) == len(t.x)
+
+def test_collinear_points_have_no_triangles():
+    x, y = collinear_points()
+    t = Triangulation(x, y)
+    assert t.triangles.shape == (0, 3)
+    assert len(t.edges()) == len(np.unique(x)) - 1
+
+def test_circle_side_of_nearly_cocircular_points():
+    # d is nudged off the circle through a, b and c by single ulps, far from the
+    # origin so that the floating point determinant cannot decide
+    for offset in [0.0, 1e6, 2.0 ** 40]:
+        a, b, c = (offset + 1, offset), (offset, offset + 1), (offset - 1, offset)
+        for step in range(-3, 4):
+            dy = offset - 1
+            for _ in range(abs(step)):
+                dy = float(np.nextafter(dy, step * np.inf))
+            # d starts at the bottom of the circle, so moving it up moves it inside
+            expected = INSIDE if dy > offset - 1 else OUTSIDE if dy < offset - 1 else COCIRCULAR
+            assert exact_circle_side(*a, *b, *c, offset, dy) == expected
+            assert circleSide(*a, *b, *c, offset, dy) == expected
+            assert incircle(*a, *b, *c, offset, dy) == expected
+
+def test_circle_side_matches_exact_on_perturbed_cocircular_points():
+    rng = np.random.default_rng(4)
+    ring = np.array(cocircular_points())[:, :-1]
+    # Counterclockwise triangles a, b, c and a fourth point d, all on one circle
+    chosen = np.sort(rng.random((500, 12)).argsort(axis=1)[:, :3], axis=1)
+    fourth = rng.integers(0, 12, 500)
+    scale = 2.0 ** rng.integers(-20, 20, 500)
+    # Integer offsets keep every coordinate exact, so the points really are cocircular
+    offset = rng.integers(0, 10 ** 6, 500).astype(float)
+    x = offset[:, None] + scale[:, None] * ring[0][np.column_stack([chosen, fourth])]
+    y = offset[:, None] + scale[:, None] * ring[1][np.column_stack([chosen, fourth])]
+    # Nudge d by a few ulps so that quadruples sit on and on either side of the circle
+    x[:, 3] += rng.integers(-2, 3, 500) * np.spacing(x[:, 3])
+    coords = [x[:, 0], y[:, 0], x[:, 1], y[:, 1], x[:, 2], y[:, 2], x[:, 3], y[:, 3]]
+    quadruples = list(zip(*[c.tolist() for c in coords]))
+    expected = [exact_circle_side(*q) for q in quadruples]
+    assert set(expected) == {INSIDE, OUTSIDE, COCIRCULAR}
+    assert [circleSide(*q) for q in quadruples] == expected
+    assert incircle(*coords).tolist() == expected
+
+def test_incircle_broadcasts_cocircular_batches():
+    # Scalar a, b and c against a column of points on their circle: every element
+    # needs the exact path, which gathers the broadcast coordinates once
+    x, y = cocircular_points()
+    dx = np.tile(x[3:-1], 1000)[:, None]
+    dy = np.tile(y[3:-1], 1000)[:, None]
+    sides = incircle(x[0], y[0], x[1], y[1], x[2], y[2], dx, dy)
+    assert sides.shape == (9000, 1)
+    assert np.all(sides == COCIRCULAR)
+    assert incircle(x[0], y[0], x[1], y[1], x[2], y[2], 0.0, [0.0, 10.0]).tolist() == [INSIDE, OUTSIDE]
@@ -0,0 +1,89 @@
+import numpy as np
+import pytest
+
+from .. import geometry
+from ..geometry import Point, Points
+
+
+def random_points(n=1000, seed=0):
+    rng = np.random.default_rng(seed)
+    return np.column_stack([rng.random(n), rng.random(n)])
+
+def coordinates(polygon):
+    return list(zip(polygon.points.npx.tolist(), polygon.points.npy.tolist()))
+
+@pytest.mark.parametrize('mmap', [True, False])
+def test_npy_and_raw_files(tmp_path, mmap):
+    data = random_points()
+    np.save(tmp_path / 'points.npy', data)
+    data.tofile(tmp_path / 'points.bin')
+    for name in ['points.npy', 'points.bin']:
+        points = Points.fromFile(tmp_path / name, mmap=mmap)
+        assert np.array_equal(points.npx, data[:, 0])
+        assert np.array_equal(points.npy, data[:, 1])
+
+def test_file_errors(tmp_path):
+    np.arange(3, dtype=np.float64).tofile(tmp_path / 'odd.bin')
+    with pytest.raises(ValueError, match='odd number'):
+        Points.fromFile(tmp_path / 'odd.bin')
+    np.save(tmp_path / 'float32.npy', random_points().astype(np.float32))
+    with pytest.raises(ValueError, match='float32'):
+        Points.fromFile(tmp_path / 'float32.npy')
+    np.save(tmp_path / 'columns.npy', np.zeros((4, 3)))
+    with pytest.raises(ValueError, match=r'\(n, 2\)'):
+        Points.fromFile(tmp_path / 'columns.npy')
+
+@pytest.mark.parametrize('mmap', [True, False])
+def test_empty_file(tmp_path, mmap):
+    (tmp_path / 'empty.bin').write_bytes(b'')
+    points = Points.fromFile(tmp_path / 'empty.bin', mmap=mmap)
+    assert len(points) == 0
+    points.append(Point(1, 2))
+    assert list(points.npx) == [1]
+
+def test_modifying_mapped_points_copies_them(tmp_path):
+    data = random_points(100)
+    path = tmp_path / 'points.bin'
+    data.tofile(path)
+    before = path.read_bytes()
+    points = Points.fromFile(path)
+    points[0].x = 5.0
+    points[1].y = -5.0
+    points.append(Point(7, 7))
+    points.pop(2)
+    assert path.read_bytes() == before
+    assert points[0].x == 5.0 and points[1].y == -5.0 and len(points) == 100
+    # Each container has its own copy once modified
+    other = Points.fromFile(path)
+    other.pop(0)
+    assert path.read_bytes() == before
+    assert np.array_equal(Points.fromFile(path).npx, data[:, 0])
+
+def test_chunk_workers_map_the_file_by_path(tmp_path, monkeypatch):
+    data = random_points(5000)
+    path = tmp_path / 'points.npy'
+    np.save(path, data)
+    expected = coordinates(Points.fromNPArray(data[:, 0], data[:, 1]).convexHull())
+    sources = []
+    chunkHull = geometry._chunkHull
+
+    def recording(task):
+        sources.append(task[0])
+        return chunkHull(task)
+    monkeypatch.setattr(geometry, '_chunkHull', recording)
+    points = Points.fromFile(path)
+    assert coordinates(points.convexHull(chunkSize=512)) == expected
+    assert len(sources) == 10 and all([source == str(path) for source in sources])
+    # Once modified, chunks are handed over as arrays instead
+    sources.clear()
+    points.append(Point(0.5, 0.5))
+    assert coordinates(points.convexHull(chunkSize=512)) == expected
+    assert sources and not any([isinstance(source, str) for source in sources])
+
+def test_chunked_hull_on_a_process_pool(tmp_path):
+    data = random_points(5000)
+    path = tmp_path / 'points.bin'
+    data.tofile(path)
+    expected = coordinates(Points.fromNPArray(data[:, 0], data[:, 1]).convexHull())
+    assert coordinates(Points.fromFile(path).convexHull(chunkSize=700, processes=2)) == expected
+    assert coordinates(Points.fromFile(path).convexHull(processes=2)) == expected
@@ -0,0 +1,72 @@
+import numpy as np
+import pytest
+
+from ..index import GridIndex
+
+
+def point_sets():
+    rng = np.random.default_rng(0)
+    x = rng.random(2000)
+    return {
+        'uniform': (x, rng.random(2000)),
+        'thin': (x, 1e-9 * rng.random(2000)),
+        'line': (x, np.zeros(2000)),
+        'clustered': (np.concatenate([rng.normal(0, 1e-3, 1000), rng.normal(100, 1e-3, 1000)]),
+                      np.concatenate([rng.normal(0, 1e-3, 1000), rng.normal(50, 1e-3, 1000)])),
+        'duplicates': (np.repeat(rng.random(50), 20), np.repeat(rng.random(50), 20)),
+        'single': (np.array([0.5]), np.array([0.5])),
+    }
+
+def queries(x, y, rng, count=200):
+    # Queries spread well beyond the points' bounding box
+    cx, cy = (x.min() + x.max()) / 2, (y.min() + y.max()) / 2
+    spread = max(x.max() - x.min(), y.max() - y.min(), 1.0)
+    return cx + spread * rng.uniform(-2, 2, count), cy + spread * rng.uniform(-2, 2, count)
+
+@pytest.mark.parametrize('name', sorted(point_sets()))
+def test_nearest_matches_brute_force(name):
+    x, y = point_sets()[name]
+    qx, qy = queries(x, y, np.random.default_rng(1))
+    expected = [np.argmin(np.hypot(x - px, y - py)) for px, py in zip(qx, qy)]
+    assert GridIndex(x, y).nearest(qx, qy).tolist() == expected
+    # Query points on top of input points find themselves (or an equal duplicate)
+    found = GridIndex(x, y).nearest(x[:100], y[:100])
+    assert np.array_equal(x[found], x[:100]) and np.array_equal(y[found], y[:100])
+
+@pytest.mark.parametrize('name', sorted(point_sets()))
+def test_range_queries_match_brute_force(name):
+    x, y = point_sets()[name]
+    index = GridIndex(x, y)
+    rng = np.random.default_rng(2)
+    qx, qy = queries(x, y, rng, 50)
+    spread = max(x.max() - x.min(), y.max() - y.min(), 1.0)
+    for px, py, r in zip(qx, qy, spread * rng.random(50)):
+        assert index.queryRadius(px, py, r).tolist() == np.flatnonzero(np.hypot(x - px, y - py) <= r).tolist()
+        xmin, xmax, ymin, ymax = px - r, px + r / 2, py - r / 3, py + r
+        expected = np.flatnonzero((x >= xmin) & (x <= xmax) & (y >= ymin) & (y <= ymax))
+        assert index.queryRect(xmin, ymin, xmax, ymax).tolist() == expected.tolist()
+
+def test_queries_outside_the_grid_and_on_its_edges():
+    x, y = np.array([0.0, 1.0, 0.0, 1.0]), np.array([0.0, 0.0, 1.0, 1.0])
+    index = GridIndex(x, y, cellSize=0.25)
+    assert index.queryRect(2, 2, 3, 3).tolist() == []
+    assert index.queryRect(-3, -3, -2, -2).tolist() == []
+    assert index.queryRect(1, 1, 5, 5).tolist() == [3]
+    assert index.queryRect(-5, -5, 5, 5).tolist() == [0, 1, 2, 3]
+    assert index.queryRadius(2, 0, 1).tolist() == [1]
+    assert index.nearest([-10, 10, 0.5], [-10, 10, 0.5]).tolist() == [0, 3, 0]
+
+def test_rectangles_off_the_grid_scan_no_cells():
+    rng = np.random.default_rng(0)
+    index = GridIndex(rng.random(100), rng.random(100))
+    for rect in [(2, 0, 3, 1), (0, 2, 1, 3), (-3, 0, -2, 1), (0, -3, 1, -2)]:
+        assert len(index._candidates(*rect)) == 0
+        assert index.queryRect(*rect).tolist() == []
+    assert index.queryRadius(5, 0.5, 1).tolist() == []
+
+def test_empty_index():
+    index = GridIndex([], [])
+    assert index.queryRect(0, 0, 1, 1).tolist() == []
+    assert index.queryRadius(0, 0, 1).tolist() == []
+    with pytest.raises(ValueError):
+        index.nearest(0, 0)
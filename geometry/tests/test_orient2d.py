@@ -0,0 +1,54 @@
+from fractions import Fraction
+
+import numpy as np
+import pytest
+
+from ..geometry import hullIndices
+from ..orient2d import COLLINEAR, LEFT, RIGHT, orient2d, orientation
+
+
+def exact(ax, ay, bx, by, cx, cy):
+    ax, ay, bx, by, cx, cy = map(Fraction, (ax, ay, bx, by, cx, cy))
+    det = (bx - ax) * (cy - ay) - (by - ay) * (cx - ax)
+    return (det > 0) - (det < 0)
+
+def nearly_collinear_grid(size=64):
+    # Shewchuk's test: perturb (0.5, 0.5) by multiples of 2^-53 around the line y = x
+    k = np.arange(size) * 2.0 ** -53
+    cx, cy = np.meshgrid(0.5 + k, 0.5 + k)
+    return 12.0, 12.0, 24.0, 24.0, cx.ravel(), cy.ravel()
+
+def test_nearly_collinear_triples_are_exact():
+    ax, ay, bx, by, cx, cy = nearly_collinear_grid()
+    expected = [exact(ax, ay, bx, by, px, py) for px, py in zip(cx.tolist(), cy.tolist())]
+    assert orient2d(ax, ay, bx, by, cx, cy).tolist() == expected
+    assert [orientation(ax, ay, bx, by, px, py) for px, py in zip(cx.tolist(), cy.tolist())] == expected
+    assert set(expected) == {LEFT, RIGHT, COLLINEAR}
+
+@pytest.mark.parametrize('scale', [2.0 ** 600, 2.0 ** -600, 1e300, 1e-300])
+def test_huge_and_tiny_coordinates_use_the_rational_fallback(scale):
+    ax, ay, bx, by, cx, cy = nearly_collinear_grid(16)
+    cx, cy = cx * scale, cy * scale
+    ax, ay, bx, by = ax * scale, ay * scale, bx * scale, by * scale
+    expected = [exact(ax, ay, bx, by, px, py) for px, py in zip(cx.tolist(), cy.tolist())]
+    assert orient2d(ax, ay, bx, by, cx, cy).tolist() == expected
+    assert [orientation(ax, ay, bx, by, px, py) for px, py in zip(cx.tolist(), cy.tolist())] == expected
+
+def test_overflowing_determinant_is_exact():
+    big = 1e300
+    assert orientation(-big, -big, big, big, -big, big) == LEFT
+    assert orient2d(-big, -big, big, big, big, -big).tolist() == RIGHT
+
+def test_orient2d_broadcasts_to_int8():
+    result = orient2d(0, 0, 1, 0, np.array([[0.5], [0.5]]), np.array([1.0, 0.0, -1.0]))
+    assert result.dtype == np.int8
+    assert result.tolist() == [[LEFT, COLLINEAR, RIGHT]] * 2
+
+def test_hull_of_collinear_points_uses_the_extremes():
+    rng = np.random.default_rng(0)
+    x = rng.random(10000)
+    assert hullIndices(x, 2 * x).tolist() == [np.argmin(x), np.argmax(x)]
+    # One point off the line gives a triangle
+    y = 2 * x
+    y[17] += 1e-9
+    assert sorted(hullIndices(x, y).tolist()) == sorted([np.argmin(x), np.argmax(x), 17])
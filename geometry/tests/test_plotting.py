@@ -0,0 +1,119 @@
+import matplotlib
+
+matplotlib.use('Agg')
+
+import matplotlib.pyplot as plt  # noqa: E402
+import numpy as np  # noqa: E402
+import pytest  # noqa: E402
+from matplotlib.collections import LineCollection, PolyCollection  # noqa: E402
+
+from ..geometry import Line, Point, Points, Polygon, plotLines  # noqa: E402
+
+
+@pytest.fixture
+def axes():
+    figure, axes = plt.subplots(figsize=(2, 1.5), dpi=100)
+    yield axes
+    plt.close(figure)
+
+def random_points(n=100000, seed=0):
+    rng = np.random.default_rng(seed)
+    return Points.fromNPArray(rng.normal(size=n), rng.normal(size=n))
+
+def drawn_offsets(axes):
+    (collection,) = axes.collections
+    return collection.get_offsets()
+
+def visible_pixels(axes, x, y):
+    '''The pixel of the axes holding each of the points that are in view'''
+    bbox = axes.bbox
+    pixels = np.floor(axes.transData.transform(np.column_stack([x, y])) - [bbox.x0, bbox.y0])
+    visible = ((pixels[:, 0] >= 0) & (pixels[:, 0] < bbox.width)
+               & (pixels[:, 1] >= 0) & (pixels[:, 1] < bbox.height))
+    return list(map(tuple, pixels[visible].tolist()))
+
+def occupied_pixels(axes, x, y):
+    return set(visible_pixels(axes, x, y))
+
+def test_polygon_is_drawn_as_one_path(axes):
+    square = Polygon(Points([Point(0, 0), Point(0, 1), Point(1, 1), Point(1, 0)]))
+    square.plotBoundary(axes)
+    (line,) = axes.lines
+    assert line.get_xydata().tolist() == [[0, 0], [0, 1], [1, 1], [1, 0], [0, 0]]
+    assert len(drawn_offsets(axes)) == 4
+    square.plot(axes)
+    assert len(axes.lines) == 2
+    assert len(axes.patches) == 1
+
+def test_lines_are_drawn_as_one_collection(axes):
+    lines = [Line(Point(idx, 0), Point(idx, 1)) for idx in range(50)]
+    plotLines(lines, axes)
+    (segments, endpoints) = axes.collections
+    assert isinstance(segments, LineCollection)
+    assert len(segments.get_segments()) == 50
+    assert len(endpoints.get_offsets()) == 100
+    assert axes.get_xlim()[1] >= 49
+
+def test_decimation_keeps_one_point_per_pixel_and_the_extremes(axes):
+    points = random_points()
+    points.plot(axes, decimate=True)
+    offsets = drawn_offsets(axes)
+    x, y = points.npx, points.npy
+    width, height = int(np.ceil(axes.bbox.width)), int(np.ceil(axes.bbox.height))
+    assert len(offsets) <= (width + 2) * (height + 2) + 4
+    # Only the extremal points can share a pixel with another kept point
+    pixels = visible_pixels(axes, offsets[:, 0], offsets[:, 1])
+    assert len(pixels) - len(set(pixels)) <= 4
+    # Every pixel the full scatter would cover is still covered, and no more
+    assert occupied_pixels(axes, offsets[:, 0], offsets[:, 1]) == occupied_pixels(axes, x, y)
+    extremes = [np.argmin(x), np.argmax(x), np.argmin(y), np.argmax(y)]
+    kept = set(map(tuple, np.asarray(offsets).tolist()))
+    assert all([(x[idx], y[idx]) in kept for idx in extremes])
+    # The view is what a full scatter would autoscale to
+    figure, full = plt.subplots(figsize=(2, 1.5), dpi=100)
+    points.plot(full)
+    assert full.get_xlim() == axes.get_xlim()
+    assert full.get_ylim() == axes.get_ylim()
+    plt.close(figure)
+
+def test_decimation_follows_the_view_limits(axes):
+    points = random_points()
+    # Zoomed in, a pixel covers much less data than the points' bounding box suggests
+    axes.set_xlim(-0.1, 0.1)
+    axes.set_ylim(-0.1, 0.1)
+    points.plot(axes, decimate=True)
+    offsets = drawn_offsets(axes)
+    assert occupied_pixels(axes, offsets[:, 0], offsets[:, 1]) == occupied_pixels(axes, points.npx, points.npy)
+    assert axes.get_xlim() == (-0.1, 0.1)
+
+def test_decimation_through_pyplot():
+    figure = plt.figure(figsize=(2, 1.5), dpi=100)
+    try:
+        points = random_points(10000)
+        points.plot(plt, decimate=True)
+        assert len(drawn_offsets(plt.gca())) < len(points)
+        plotLines([Line(Point(0, 0), Point(1, 1))], plt)
+        assert len(plt.gca().collections) == 3
+    finally:
+        plt.close(figure)
+
+def test_other_destinations_draw_every_point():
+    class Recorder:
+        def scatter(self, x, y, **kwargs):
+            self.x, self.y = x, y
+    points = random_points(1000)
+    destination = Recorder()
+    points.plot(destination, decimate=True)
+    assert len(destination.x) == 1000
+
+def test_density_map(axes):
+    points = random_points(10000)
+    points.plot(axes, bins=20)
+    (hexagons,) = axes.collections
+    assert isinstance(hexagons, PolyCollection)
+    # Only occupied bins are drawn, coloured on a log scale
+    counts = hexagons.get_array()
+    assert 0 < len(counts) <= 2 * 21 * 21
+    assert np.all(counts >= 1)
+    assert counts.sum() == len(points)
+    assert isinstance(hexagons.norm, matplotlib.colors.LogNorm)
@@ -1,6 +1,13 @@
 from .topology import (
     TopSpace,
+    OpenSets,
     TopFunction,
+    find_homeomorphism,
     Function,
     Set,
+)
+
+from .enumeration import (
+    enumerate_topologies,
+    count_topologies,
 )
\ No newline at end of file
@@ -0,0 +1,191 @@
+'''Benchmark TopSpace construction and queries on random finite spaces
+
+Each operation is timed on random spaces of increasing numbers of points,
+together with the peak memory it allocates (from tracemalloc) and a scaling
+exponent: the slope of log(seconds) against log(size), where size is the input
+that drives the operation's cost (open sets for validation, basis elements
+for from_basis, points otherwise). Polynomial operations keep a steady
+exponent, while exponential ones show local exponents that keep growing with
+the size. Operations with a time budget are also timed once at the budget's
+size, and the run fails if they take longer. The report is printed as JSON.
+
+Run from the repository root:
+
+    python -m topology.benchmarks.operations [operation ...]
+'''
+
+import json
+import math
+import sys
+import time
+import tracemalloc
+
+from common import Set
+
+from topology.benchmarks.spaces import (
+    random_function,
+    random_homeomorphism,
+    random_space,
+    random_subsets,
+)
+from topology.topology import TopSpace
+
+# Queries per timing for the operations that are cheap on their own
+QUERIES = 1000
+
+
+def _open_sets(top):
+    return Set(*list(top.open_sets))
+
+
+def _basis(top):
+    return Set(*top.neighbourhoods.values())
+
+
+def _setup_init(n, seed):
+    top = random_space(n, density=0.3, seed=seed)
+    space, open_sets = top.space, _open_sets(top)
+    return len(open_sets), lambda: TopSpace(space, open_sets)
+
+
+def _setup_from_basis(n, seed):
+    top = random_space(n, density=0.3, seed=seed)
+    space, basis = top.space, _basis(top)
+    # from_basis adds the empty set to its argument, so give it a fresh copy each time
+    return len(basis), lambda: TopSpace.from_basis(space, Set(*basis))
+
+
+def _setup_from_subbasis(n, seed):
+    top = random_space(n, density=0.5, seed=seed)
+    space, subbasis = top.space, _basis(top)
+    return len(subbasis), lambda: TopSpace.from_subbasis(space, Set(*subbasis))
+
+
+def _setup_mul(n, seed):
+    top1 = random_space(n, density=0.2, seed=seed)
+    top2 = random_space(n, density=0.2, seed=seed + 1)
+    return n * n, lambda: top1 * top2
+
+
+def _setup_is_closed(n, seed):
+    top = random_space(n, density=0.2, ties=0.1, seed=seed)
+    subsets = random_subsets(top, QUERIES, seed=seed)
+    return n, lambda: [top.is_closed(subset) for subset in subsets]
+
+
+def _setup_is_continuous(n, seed):
+    domain = random_space(n, density=0.2, ties=0.1, seed=seed)
+    codomain = random_space(n, density=0.2, ties=0.1, seed=seed + 1)
+    functions = [random_function(domain, codomain, seed=seed + idx) for idx in range(QUERIES // 100)]
+    # A homeomorphism is continuous, so every preimage gets checked at least once
+    functions.append(random_homeomorphism(domain, seed=seed))
+    return n, lambda: [f.is_continuous for f in functions]
+
+
+def _setup_is_homeomorphism(n, seed):
+    domain = random_space(n, density=0.2, ties=0.1, seed=seed)
+    functions = [random_homeomorphism(domain, seed=seed + idx) for idx in range(QUERIES // 100)]
+    return n, lambda: [f.is_homeomorphism for f in functions]
+
+
+# Operation name -> (setup taking a number of points and a seed and returning the
+# size of the input and a callable to time, numbers of points)
+OPERATIONS = {
+    '__init__': (_setup_init, [4, 8, 12, 16, 20, 24]),
+    'from_basis': (_setup_from_basis, [4, 6, 8, 10, 12]),
+    'from_subbasis': (_setup_from_subbasis, [2, 4, 6, 8, 10]),
+    '__mul__': (_setup_mul, [4, 8, 16, 32, 48, 64, 96]),
+    'is_closed': (_setup_is_closed, [16, 64, 256, 1024]),
+    'is_continuous': (_setup_is_continuous, [16, 32, 64, 128, 256]),
+    'is_homeomorphism': (_setup_is_homeomorphism, [16, 32, 64, 128, 256]),
+}
+
+# Operation name -> (number of points, seconds): one call at that many points must
+# not take longer. Products of two 64-point spaces took 2.6s when the product's
+# neighbourhoods were transposed bit by bit.
+BUDGETS = {
+    '__mul__': (64, 0.25),
+}
+
+
+def _time(function, min_seconds=0.05):
+    '''Seconds per call, repeating calls that are too quick to time on their own'''
+    number = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(number):
+            function()
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_seconds:
+            return elapsed / number
+        number *= 2
+
+
+def _peak_memory(function) -> int:
+    '''Peak number of bytes allocated during one call'''
+    tracemalloc.start()
+    try:
+        function()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def _slope(xs, ys):
+    '''Least squares slope of log(ys) against log(xs), or None if all xs are equal'''
+    xs = [math.log(x) for x in xs]
+    ys = [math.log(y) for y in ys]
+    x_mean = sum(xs) / len(xs)
+    y_mean = sum(ys) / len(ys)
+    variance = sum([(x - x_mean) ** 2 for x in xs])
+    if not variance:
+        return None
+    return sum([(x - x_mean) * (y - y_mean) for x, y in zip(xs, ys)]) / variance
+
+
+def benchmark(operations=None, seed=0) -> dict:
+    '''Time each operation at its sizes and fit scaling exponents'''
+    report = {}
+    for name in operations or OPERATIONS:
+        setup, sizes = OPERATIONS[name]
+        runs = []
+        for n in sizes:
+            size, function = setup(n, seed)
+            runs.append({'points': n, 'size': size, 'seconds': _time(function),
+                         'peak_bytes': _peak_memory(function)})
+        sizes = [run['size'] for run in runs]
+        seconds = [run['seconds'] for run in runs]
+        report[name] = {
+            'runs': runs,
+            'exponent': _slope(sizes, seconds),
+            'local_exponents': [_slope(sizes[idx:idx + 2], seconds[idx:idx + 2])
+                                for idx in range(len(runs) - 1)],
+            'memory_exponent': _slope(sizes, [run['peak_bytes'] for run in runs]),
+        }
+        if name in BUDGETS:
+            points, limit = BUDGETS[name]
+            seconds = _time(setup(points, seed)[1])
+            report[name]['budget'] = {'points': points, 'seconds': seconds, 'limit': limit,
+                                      'passed': seconds <= limit}
+    return report
+
+
+def over_budget(report: dict) -> list:
+    '''Names of the operations in a report that took longer than their budget'''
+    return [name for name, result in report.items()
+            if 'budget' in result and not result['budget']['passed']]
+
+
+def main(argv):
+    unknown = [name for name in argv if name not in OPERATIONS]
+    if unknown:
+        raise ValueError('unknown operations {} (choose from {})'.format(unknown, list(OPERATIONS)))
+    report = benchmark(argv)
+    print(json.dumps(report, indent=2))
+    failed = over_budget(report)
+    if failed:
+        sys.exit('over budget: {}'.format(', '.join(failed)))
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
@@ -0,0 +1,74 @@
+'''Seeded generators of random finite topological spaces
+
+Finite topologies are the same thing as preorders, so spaces are generated as
+random preorders: the points are shuffled, consecutive points are tied into
+one class with probability ties, and each class lies below each later class
+with probability density before the relation is closed transitively. Higher
+densities give larger minimal neighbourhoods and so fewer open sets; an
+antichain (density 0) on n points has all 2^n subsets open.
+'''
+
+import random
+
+from common import Set
+
+from topology.topology import TopFunction, TopSpace
+
+
+def random_preorder(n: int, density: float = 0.2, ties: float = 0.0, seed=None) -> list:
+    '''Get the minimal neighbourhood bitmask of each of the points 0, ..., n - 1 of a random preorder'''
+    if not 0 <= density <= 1 or not 0 <= ties <= 1:
+        raise ValueError('density and ties must be probabilities')
+    rng = random.Random(seed)
+    points = list(range(n))
+    rng.shuffle(points)
+    classes = []
+    for point in points:
+        if classes and rng.random() < ties:
+            classes[-1].append(point)
+        else:
+            classes.append([point])
+    # Later classes are closed already, so each class only has to absorb their neighbourhoods
+    above = [0] * len(classes)
+    for idx in reversed(range(len(classes))):
+        above[idx] = sum([1 << point for point in classes[idx]])
+        for later in range(idx + 1, len(classes)):
+            if rng.random() < density:
+                above[idx] |= above[later]
+    neighbourhoods = [0] * n
+    for idx, points in enumerate(classes):
+        for point in points:
+            neighbourhoods[point] = above[idx]
+    return neighbourhoods
+
+
+def random_space(n: int, density: float = 0.2, ties: float = 0.0, seed=None) -> TopSpace:
+    '''Get a random topological space on the points 0, ..., n - 1'''
+    points = tuple(range(n))
+    return TopSpace._from_neighbourhood_masks(Set(*points), points, random_preorder(n, density, ties, seed))
+
+
+def random_subsets(top: TopSpace, count: int, seed=None) -> list:
+    '''Get count random subsets of a space, each point included with probability 1/2'''
+    rng = random.Random(seed)
+    points = list(top.space)
+    return [Set(*[point for point in points if rng.random() < 0.5]) for _ in range(count)]
+
+
+def random_function(domain: TopSpace, codomain: TopSpace, seed=None) -> TopFunction:
+    '''Get a random function between two spaces (not continuous in general)'''
+    rng = random.Random(seed)
+    images = list(codomain.space)
+    return TopFunction({point: rng.choice(images) for point in domain.space}, domain, codomain)
+
+
+def random_homeomorphism(top: TopSpace, seed=None) -> TopFunction:
+    '''Get a homeomorphism from a space onto a copy of it with its points relabelled at random'''
+    rng = random.Random(seed)
+    points = list(top.space)
+    labels = ['p{}'.format(idx) for idx in range(len(points))]
+    rng.shuffle(labels)
+    relabel = dict(zip(points, labels))
+    copy = TopSpace.from_neighbourhoods(Set(*labels), {relabel[point]: Set(*[relabel[other] for other in nbhd])
+                                                       for point, nbhd in top.neighbourhoods.items()})
+    return TopFunction(relabel, top, copy)
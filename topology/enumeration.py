@@ -0,0 +1,264 @@
+'''Enumeration of all topologies on a finite set
+
+A topology on n points is the same thing as a preorder on them (its
+specialization preorder), so topologies are generated as preorders, given by
+the bitmask of each point's minimal neighbourhood. Preorders on n + 1 points are
+built from preorders on n points by adding one point. Up to homeomorphism, each
+class is produced once by canonical augmentation: a child is only kept by the
+parent obtained by deleting the last point of the child's canonical labelling.
+
+The search is sharded on the partial preorders at a fixed depth, so shards can
+be expanded on a process pool and completed shards recorded in a checkpoint.
+'''
+
+import json
+import multiprocessing
+import os
+
+from common import Set
+
+from .topology import (
+    TopSpace,
+    _bits,
+    _refine_colours,
+    _upsets,
+)
+
+
+def _transpose(neighbourhoods) -> list:
+    '''For each point, get the bitmask of the points whose neighbourhood contains it'''
+    dependents = [0] * len(neighbourhoods)
+    for idx, mask in enumerate(neighbourhoods):
+        for other in _bits(mask):
+            dependents[other] |= 1 << idx
+    return dependents
+
+
+def _extensions(neighbourhoods):
+    '''Yield every preorder on n + 1 points that restricts to the given one on the first n
+
+    The new point's neighbourhood is an open set A of the old preorder (plus the
+    point itself), and the points below it form a closed set whose neighbourhoods
+    all contain A.
+    '''
+    n = len(neighbourhoods)
+    dependents = _transpose(neighbourhoods)
+    new_bit = 1 << n
+    for above in _upsets(range(n), neighbourhoods, dependents):
+        lower = [idx for idx in range(n) if not above & ~neighbourhoods[idx]]
+        for below in _upsets(lower, dependents, neighbourhoods):
+            yield tuple([mask | new_bit if below >> idx & 1 else mask
+                         for idx, mask in enumerate(neighbourhoods)] + [above | new_bit])
+
+
+def _are_twins(neighbourhoods, dependents, i, j) -> bool:
+    '''Check whether swapping points i and j is an automorphism of a preorder'''
+    others = ~((1 << i) | (1 << j))
+    return (neighbourhoods[i] & others == neighbourhoods[j] & others
+            and dependents[i] & others == dependents[j] & others
+            and neighbourhoods[i] >> j & 1 == neighbourhoods[j] >> i & 1)
+
+
+def _canonical_form(neighbourhoods, dependents=None, colours=None):
+    '''Relabel a preorder so that isomorphic preorders get equal bitmask tuples
+
+    Points are placed in order of their refined colours, and among the orderings
+    which respect colours the one with the largest relation code is chosen,
+    pruning any branch whose code prefix is already smaller than the best one.
+    Twins (points whose swap is an automorphism) give identical codes, so only
+    one of each twin class is tried at each position.
+
+    Returns the canonical bitmasks and the ordering of the original points.
+    '''
+    n = len(neighbourhoods)
+    if dependents is None:
+        dependents = _transpose(neighbourhoods)
+    if colours is None:
+        colours = _refine_colours((neighbourhoods, dependents))[0]
+    twin_class = list(range(n))
+    for i in range(n):
+        if twin_class[i] != i:
+            continue
+        for j in range(i + 1, n):
+            if (twin_class[j] == j and colours[i] == colours[j]
+                    and _are_twins(neighbourhoods, dependents, i, j)):
+                twin_class[j] = i
+    slots = sorted(colours)
+    best = None
+    best_order = None
+    order = []
+    rows = []
+    used = 0
+
+    def search():
+        nonlocal best, best_order, used
+        depth = len(order)
+        if depth == n:
+            if best is None or tuple(rows) > best:
+                best = tuple(rows)
+                best_order = list(order)
+            return
+        for point in range(n):
+            if used >> point & 1 or colours[point] != slots[depth]:
+                continue
+            # Only the first unused member of each twin class needs to be tried
+            if any([twin_class[other] == twin_class[point] and not used >> other & 1
+                    for other in range(point)]):
+                continue
+            row = 0
+            for position, other in enumerate(order):
+                row |= ((neighbourhoods[point] >> other & 1) << (2 * position)
+                        | (neighbourhoods[other] >> point & 1) << (2 * position + 1))
+            rows.append(row)
+            if best is None or tuple(rows) >= best[:depth + 1]:
+                order.append(point)
+                used |= 1 << point
+                search()
+                used &= ~(1 << point)
+                order.pop()
+            rows.pop()
+
+    search()
+    position = {point: idx for idx, point in enumerate(best_order)}
+    canonical = tuple([sum([1 << position[other] for other in _bits(neighbourhoods[point])])
+                       for point in best_order])
+    return canonical, best_order
+
+
+def _canonical_children(parent):
+    '''Yield the children of a canonical preorder which have it as their canonical parent
+
+    Every isomorphism class on n + 1 points has exactly one canonical parent (delete
+    the last point of its canonical labelling), so across all parents each class is
+    yielded once, in canonical form.
+    '''
+    n = len(parent)
+    seen = set()
+    for child in _extensions(parent):
+        dependents = _transpose(child)
+        colours = _refine_colours((child, dependents))[0]
+        # The canonical last point always has the largest colour, and some extension of
+        # the canonical parent adds exactly that point, so other extensions can be skipped
+        if colours[n] != max(colours):
+            continue
+        canonical, _ = _canonical_form(child, dependents, colours)
+        if canonical in seen:
+            continue
+        seen.add(canonical)
+        reduced = tuple([mask & ~(1 << n) for mask in canonical[:n]])
+        if _canonical_form(reduced)[0] == parent:
+            yield canonical
+
+
+def _expand(shard, n: int, up_to_homeomorphism: bool) -> list:
+    '''Get every preorder on n points below a partial preorder in the search tree'''
+    children = _canonical_children if up_to_homeomorphism else _extensions
+    results = []
+    stack = [shard]
+    while stack:
+        node = stack.pop()
+        if len(node) == n:
+            results.append(node)
+        else:
+            stack.extend(children(node))
+    return results
+
+
+def _expand_shard(task):
+    shard_idx, shard, n, up_to_homeomorphism = task
+    return shard_idx, _expand(shard, n, up_to_homeomorphism)
+
+
+def _shards(depth: int, up_to_homeomorphism: bool) -> list:
+    '''Get the partial preorders on depth points that the search is sharded on'''
+    level = [()]
+    for _ in range(depth):
+        children = _canonical_children if up_to_homeomorphism else _extensions
+        level = [child for node in level for child in children(node)]
+    return level
+
+
+def _read_checkpoint(checkpoint: str, settings: dict) -> dict:
+    '''Get the completed shards (and their result counts) from a checkpoint file'''
+    if checkpoint is None or not os.path.exists(checkpoint):
+        return {}
+    with open(checkpoint) as f:
+        state = json.load(f)
+    if state['settings'] != settings:
+        raise ValueError('checkpoint {} was written for a different enumeration'.format(checkpoint))
+    return {int(shard_idx): count for shard_idx, count in state['done'].items()}
+
+
+def _write_checkpoint(checkpoint: str, settings: dict, done: dict) -> None:
+    # Write to a temporary file first so an interrupted write never corrupts the checkpoint
+    tmp = checkpoint + '.tmp'
+    with open(tmp, 'w') as f:
+        json.dump({'settings': settings, 'done': done}, f)
+    os.replace(tmp, checkpoint)
+
+
+def _enumerate_shards(n: int, up_to_homeomorphism: bool, processes: int,
+                      checkpoint: str, shard_depth: int):
+    '''Yield (shard index, preorders) for each shard not already completed in the checkpoint
+
+    The shard is recorded as completed once the consumer asks for the next one.
+    '''
+    if n < 0:
+        raise ValueError('the number of points must be nonnegative')
+    if shard_depth is None:
+        shard_depth = max(0, n - 3)
+    if not 0 <= shard_depth <= n:
+        raise ValueError('shard_depth must be between 0 and n')
+    settings = {'n': n, 'up_to_homeomorphism': up_to_homeomorphism, 'shard_depth': shard_depth}
+    done = _read_checkpoint(checkpoint, settings)
+    tasks = [(shard_idx, shard, n, up_to_homeomorphism)
+             for shard_idx, shard in enumerate(_shards(shard_depth, up_to_homeomorphism))
+             if shard_idx not in done]
+    if processes and processes > 1:
+        with multiprocessing.Pool(processes) as pool:
+            for shard_idx, results in pool.imap_unordered(_expand_shard, tasks):
+                yield shard_idx, results
+                done[shard_idx] = len(results)
+                if checkpoint is not None:
+                    _write_checkpoint(checkpoint, settings, done)
+    else:
+        for task in tasks:
+            shard_idx, results = _expand_shard(task)
+            yield shard_idx, results
+            done[shard_idx] = len(results)
+            if checkpoint is not None:
+                _write_checkpoint(checkpoint, settings, done)
+
+
+def enumerate_topologies(n: int, up_to_homeomorphism: bool = True, processes: int = None,
+                         checkpoint: str = None, shard_depth: int = None):
+    '''Generate every topology on the points 0, ..., n - 1 as a stream of TopSpaces
+
+    With up_to_homeomorphism, one representative of each homeomorphism class is
+    generated (OEIS A001930); otherwise every labelled topology is (OEIS A000798).
+    Shards of the search are expanded on a pool of processes if processes > 1,
+    so results arrive shard by shard in no particular order.
+
+    If checkpoint names a file, completed shards are recorded there and skipped
+    when the enumeration is restarted with the same arguments. A shard counts
+    as completed once all of its topologies have been consumed, so an
+    interrupted shard is generated again in full.
+    '''
+    for _, results in _enumerate_shards(n, up_to_homeomorphism, processes, checkpoint, shard_depth):
+        for neighbourhoods in results:
+            yield TopSpace._from_neighbourhood_masks(Set(*range(n)), range(n), list(neighbourhoods))
+
+
+def count_topologies(n: int, up_to_homeomorphism: bool = True, processes: int = None,
+                     checkpoint: str = None, shard_depth: int = None) -> int:
+    '''Count the topologies on n points, optionally up to homeomorphism
+
+    Takes the same arguments as enumerate_topologies, but does not build TopSpaces.
+    Counts from shards completed in an earlier run are read back from the checkpoint.
+    '''
+    settings = {'n': n, 'up_to_homeomorphism': up_to_homeomorphism,
+                'shard_depth': max(0, n - 3) if shard_depth is None else shard_depth}
+    count = sum(_read_checkpoint(checkpoint, settings).values())
+    for _, results in _enumerate_shards(n, up_to_homeomorphism, processes, checkpoint, shard_depth):
+        count += len(results)
+    return count
@@ -0,0 +1,79 @@
+from ..topology import TopSpace, TopFunction, Set, find_homeomorphism
+
+
+def sierpinski():
+    space = Set(0, 1)
+    return TopSpace(space, Set(Set(), Set(1), space))
+
+def test_identity_is_continuous():
+    X = sierpinski()
+    f = TopFunction({0: 0, 1: 1}, X, X)
+    assert f.is_continuous
+    assert f.is_homeomorphism
+
+def test_swap_is_not_continuous():
+    X = sierpinski()
+    f = TopFunction({0: 1, 1: 0}, X, X)
+    assert not f.is_continuous
+    assert not f.is_homeomorphism
+
+def test_constant_map_is_continuous():
+    X = sierpinski()
+    f = TopFunction({0: 1, 1: 1}, X, X)
+    assert f.is_continuous
+
+def test_continuous_bijection_need_not_be_homeomorphism():
+    space = Set(0, 1)
+    discrete = TopSpace(space, space.powerset)
+    X = sierpinski()
+    f = TopFunction({0: 0, 1: 1}, discrete, X)
+    assert f.is_continuous
+    assert not f.is_homeomorphism
+    assert not f.inverse.is_continuous
+
+def test_preimage_and_fiber():
+    X = sierpinski()
+    f = TopFunction({0: 1, 1: 1}, X, X)
+    assert f.fiber(1) == Set(0, 1)
+    assert f.fiber(0) == Set()
+    assert f.preimage(Set(0)) == Set()
+    assert f.preimage(Set(1)) == Set(0, 1)
+    assert not f.is_injective
+    assert not f.is_surjective
+
+def test_continuity_on_subbasis():
+    space = Set(1, 2, 3)
+    X = TopSpace(space, space.powerset)
+    Y = TopSpace.from_subbasis(Set(1, 2, 3), Set(Set(1, 2), Set(2, 3)))
+    f = TopFunction({1: 1, 2: 2, 3: 3}, Y, X)
+    assert not f.is_continuous_on(Set(Set(1), Set(2), Set(3)))
+    g = f.inverse
+    assert g.is_continuous_on(Set(Set(1, 2), Set(2, 3)))
+    assert g.is_continuous
+
+def test_find_homeomorphism():
+    X = TopSpace.from_neighbourhoods(Set(1, 2, 3, 4), {
+        1: Set(1), 2: Set(1, 2), 3: Set(3), 4: Set(3, 4)})
+    Y = TopSpace.from_neighbourhoods(Set('a', 'b', 'c', 'd'), {
+        'a': Set('a', 'd'), 'b': Set('b', 'c'), 'c': Set('c'), 'd': Set('d')})
+    f = find_homeomorphism(X, Y)
+    assert f is not None
+    assert f.is_homeomorphism
+    assert f.inverse.is_homeomorphism
+
+def test_find_homeomorphism_deeper_than_the_recursion_limit():
+    # Seven chains of 160 points, relabelled by a permutation
+    n = 1120
+    X = TopSpace.from_neighbourhoods(Set(*range(n)), {idx: Set(*range(idx, n, 7)) for idx in range(n)})
+    relabel = {idx: 'p{}'.format(idx * 11 % n) for idx in range(n)}
+    Y = TopSpace.from_neighbourhoods(Set(*relabel.values()), {
+        relabel[idx]: Set(*[relabel[other] for other in range(idx, n, 7)]) for idx in range(n)})
+    f = find_homeomorphism(X, Y)
+    assert f is not None
+    assert f.is_homeomorphism
+
+def test_find_homeomorphism_between_non_homeomorphic_spaces():
+    X = TopSpace.from_neighbourhoods(Set(1, 2, 3), {1: Set(1), 2: Set(1, 2), 3: Set(1, 3)})
+    Y = TopSpace.from_neighbourhoods(Set(1, 2, 3), {1: Set(1, 2, 3), 2: Set(2), 3: Set(3)})
+    assert find_homeomorphism(X, Y) is None
+    assert find_homeomorphism(X, sierpinski()) is None
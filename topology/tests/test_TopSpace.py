@@ -1,6 +1,12 @@
+import json
+import logging
+import pickle
+
 import pytest
 
-from ..topology import TopSpace, Set
+from common import instrumentation
+
+from ..topology import TopFunction, TopSpace, Set
 
 
 def test_create_empty_topology():
@@ -106,4 +112,210 @@ def test_create_topology_from_basis():
 
 def test_create_topology_from_invalid_basis():
     # TODO
-    pass
\ No newline at end of file
+    pass
+
+def test_minimal_neighbourhoods():
+    space = Set(1, 2, 3)
+    open_sets = Set(Set(), space, Set(1), Set(1, 2))
+    X = TopSpace(space, open_sets)
+    assert X.neighbourhoods == {1: Set(1), 2: Set(1, 2), 3: space}
+
+def test_create_topology_from_neighbourhoods():
+    space = Set(1, 2, 3)
+    X = TopSpace.from_neighbourhoods(space, {1: Set(1), 2: Set(1, 2), 3: space})
+    assert X.space == space
+    assert X.open_sets == Set(Set(), space, Set(1), Set(1, 2))
+    assert X == TopSpace(space, Set(Set(), space, Set(1), Set(1, 2)))
+
+def test_create_topology_from_invalid_neighbourhoods():
+    space = Set(1, 2, 3)
+    with pytest.raises(ValueError):
+        TopSpace.from_neighbourhoods(space, {1: Set(1), 2: Set(2)})
+    with pytest.raises(ValueError):
+        TopSpace.from_neighbourhoods(space, {1: Set(2), 2: Set(2), 3: Set(3)})
+    with pytest.raises(ValueError):
+        TopSpace.from_neighbourhoods(space, {1: Set(1, 2), 2: Set(2, 3), 3: Set(3)})
+
+def test_open_sets_are_enumerated_lazily():
+    space = Set(*range(5))
+    X = TopSpace.from_neighbourhoods(space, {i: Set(i) for i in space})
+    assert len(X.open_sets) == 32
+    assert X.open_sets == space.powerset
+    assert Set(0, 3) in X.open_sets
+    assert Set(7) not in X.open_sets
+
+def test_is_open_and_is_closed():
+    space = Set(1, 2, 3)
+    X = TopSpace.from_neighbourhoods(space, {1: Set(1), 2: Set(1, 2), 3: space})
+    assert X.is_open(Set(1, 2))
+    assert not X.is_open(Set(2))
+    assert X.is_closed(Set(3))
+    assert X.is_closed(Set(2, 3))
+    assert not X.is_closed(Set(1))
+    with pytest.raises(ValueError):
+        X.is_open(Set(4))
+
+def test_closure_counterexample_is_reported():
+    space = Set(1, 2, 3)
+    open_sets = Set(Set(), space, Set(1, 2), Set(2, 3))
+    with pytest.raises(ValueError, match='intersections'):
+        TopSpace(space, open_sets)
+
+def test_validate_topology_in_parallel():
+    space = Set(*range(6))
+    X = TopSpace(space, space.powerset, processes=2)
+    assert len(X.open_sets) == 64
+    open_sets = space.powerset
+    open_sets.discard(Set(0, 5))
+    # Either counterexample may be found first, depending on worker timing
+    with pytest.raises(ValueError, match='unions|intersections'):
+        TopSpace(space, open_sets, processes=2)
+
+def test_pickle_round_trip():
+    space = Set(1, 2, 3)
+    X = TopSpace(space, Set(Set(), Set(1), Set(1, 2), space))
+    assert X.closure(Set(1)) == space
+    Y = pickle.loads(pickle.dumps(X))
+    assert Y.open_sets == X.open_sets
+    assert Y.closure(Set(1)) == space
+    assert Y.derived_set(Set(3)) == Set()
+    product = pickle.loads(pickle.dumps(X * X))
+    assert len(product.open_sets) == len((X * X).open_sets)
+
+def test_closure_cache_is_bounded():
+    space = Set(*range(6))
+    X = TopSpace(space, space.powerset)
+    X.cache_size = 2
+    for point in range(6):
+        assert X.closure(Set(point)) == Set(point)
+    assert len(X._closure_cache) == 2
+
+def test_closure_interior_boundary():
+    space = Set(1, 2, 3)
+    X = TopSpace.from_neighbourhoods(space, {1: Set(1), 2: Set(1, 2), 3: space})
+    assert X.closure(Set(1)) == space
+    assert X.closure(Set(2)) == Set(2, 3)
+    assert X.closure(Set()) == Set()
+    assert X.interior(Set(1, 3)) == Set(1)
+    assert X.interior(Set(2, 3)) == Set()
+    assert X.boundary(Set(1, 2)) == Set(3)
+    assert X.derived_set(Set(1)) == Set(2, 3)
+    assert X.derived_set(Set(3)) == Set()
+    assert X.is_dense(Set(1))
+    assert not X.is_dense(Set(2, 3))
+
+def test_batched_queries_match_single_queries():
+    space = Set(*range(4))
+    X = TopSpace.from_neighbourhoods(space, {0: Set(0), 1: Set(0, 1), 2: Set(2), 3: space})
+    subsets = list(space.powerset)
+    masks = [X.to_mask(subset) for subset in subsets]
+    assert [X.from_mask(m) for m in X.closures(masks)] == [X.closure(s) for s in subsets]
+    assert [X.from_mask(m) for m in X.interiors(masks)] == [X.interior(s) for s in subsets]
+    assert [X.from_mask(m) for m in X.boundaries(masks)] == [X.boundary(s) for s in subsets]
+    assert [X.from_mask(m) for m in X.derived_sets(masks)] == [X.derived_set(s) for s in subsets]
+    assert X.are_dense(masks) == [X.is_dense(s) for s in subsets]
+    assert all([X.is_closed(X.closure(s)) for s in subsets])
+    assert all([X.is_open(X.interior(s)) for s in subsets])
+
+def test_product_topology():
+    space = Set(0, 1)
+    X = TopSpace(space, Set(Set(), Set(1), space))
+    Y = TopSpace(space, space.powerset)
+    product = X * Y
+    assert product.space == Set((0, 0), (0, 1), (1, 0), (1, 1))
+    assert product.neighbourhoods[(0, 1)] == Set((0, 1), (1, 1))
+    basis = Set(*[Set(*[(a, b) for a in U for b in V]) for U in X.open_sets for V in Y.open_sets])
+    assert product == TopSpace.from_basis(product.space, basis)
+
+def test_subspace_topology():
+    space = Set(1, 2, 3)
+    X = TopSpace.from_neighbourhoods(space, {1: Set(1), 2: Set(1, 2), 3: space})
+    A = X.subspace(Set(2, 3))
+    assert A.space == Set(2, 3)
+    assert A.neighbourhoods == {2: Set(2), 3: Set(2, 3)}
+    with pytest.raises(ValueError):
+        X.subspace(Set(4))
+
+def test_quotient_topology():
+    space = Set(1, 2, 3, 4)
+    X = TopSpace.from_neighbourhoods(space, {1: Set(1), 2: Set(1, 2), 3: Set(3), 4: Set(3, 4)})
+    Q = X.quotient([Set(1, 4), Set(2), Set(3)])
+    assert Q.space == Set(Set(1, 4), Set(2), Set(3))
+    assert Q.neighbourhoods == {
+        Set(1, 4): Set(Set(1, 4), Set(3)),
+        Set(2): Set(Set(1, 4), Set(2), Set(3)),
+        Set(3): Set(Set(3)),
+    }
+    with pytest.raises(ValueError):
+        X.quotient([Set(1, 2), Set(2, 3, 4)])
+    with pytest.raises(ValueError):
+        X.quotient([Set(1, 2)])
+
+def test_connected_components():
+    space = Set(1, 2, 3, 4, 5)
+    X = TopSpace.from_neighbourhoods(space, {
+        1: Set(1), 2: Set(1, 2), 3: Set(3), 4: Set(3, 4), 5: Set(3, 5)})
+    assert X.connected_components == Set(Set(1, 2), Set(3, 4, 5))
+    assert X.path_components == X.connected_components
+    assert not X.is_connected
+    assert X.subspace(Set(3, 4, 5)).is_connected
+    assert TopSpace(Set(), Set(Set())).is_connected
+
+def test_specialization_order():
+    space = Set(0, 1)
+    X = TopSpace(space, Set(Set(), Set(1), space))
+    assert X.specialization_order == Set((0, 0), (0, 1), (1, 1))
+
+def test_separation_axioms_and_kolmogorov_quotient():
+    space = Set(1, 2, 3)
+    X = TopSpace.from_neighbourhoods(space, {1: Set(1, 2), 2: Set(1, 2), 3: space})
+    assert not X.is_T0
+    assert not X.is_T1
+    Q = X.kolmogorov_quotient
+    assert Q.space == Set(Set(1, 2), Set(3))
+    assert Q.neighbourhoods == {Set(1, 2): Set(Set(1, 2)), Set(3): Q.space}
+    assert Q.is_T0
+    assert not Q.is_T1
+    assert TopSpace(space, space.powerset).is_T1
+
+def test_fingerprint():
+    space = Set(1, 2, 3)
+    X = TopSpace.from_neighbourhoods(space, {1: Set(1), 2: Set(1, 2), 3: Set(1, 3)})
+    Y = TopSpace.from_neighbourhoods(Set('a', 'b', 'c'), {'a': Set('a', 'c'), 'b': Set('b', 'c'), 'c': Set('c')})
+    Z = TopSpace.from_neighbourhoods(space, {1: space, 2: Set(2), 3: Set(3)})
+    assert X.fingerprint == Y.fingerprint
+    assert X.fingerprint != Z.fingerprint
+
+def test_instrumented_phases():
+    space = Set(1, 2, 3)
+    with instrumentation.recording() as stats:
+        X = TopSpace.from_basis(space, Set(Set(1), Set(2), Set(3)))
+        f = TopFunction({1: 1, 2: 1, 3: 2}, X, X)
+        assert f.fiber(1) == Set(1, 2)
+        TopSpace.pairwise_unions(Set(Set(1), Set(1, 2)))
+    assert stats['TopSpace.from_basis']['calls'] == 1
+    assert stats['TopSpace.__init__']['calls'] == 1
+    assert stats['TopSpace.closure_check']['calls'] == 1
+    assert stats['TopFunction.fiber']['calls'] == 1
+    assert stats['TopSpace.pairwise_unions']['calls'] >= 1
+    assert stats['TopSpace.from_basis']['seconds'] >= stats['TopSpace.__init__']['seconds']
+    exported = json.loads(stats.to_json())
+    assert exported['phases']['TopSpace.__init__']['calls'] == 1
+
+def test_slow_construction_is_logged_with_sizes(caplog):
+    space = Set(1, 2, 3)
+    with caplog.at_level(logging.WARNING, logger='common.instrumentation'):
+        with instrumentation.recording(slow_threshold=0) as stats:
+            TopSpace(space, Set(Set(), Set(1), space))
+    assert {'phase': 'TopSpace.__init__', 'seconds': stats['TopSpace.__init__']['seconds'],
+            'sizes': {'points': 3, 'open_sets': 3}} in stats.slow
+    assert 'TopSpace.__init__ took' in caplog.text
+
+def test_product_transpose_matches_neighbourhoods():
+    X = TopSpace.from_neighbourhoods(Set(1, 2, 3), {1: Set(1), 2: Set(1, 2), 3: Set(1, 3)})
+    Y = TopSpace.from_neighbourhoods(Set('a', 'b'), {'a': Set('a', 'b'), 'b': Set('b')})
+    product = X * Y
+    # Transposing the product's neighbourhoods directly gives the same dependents
+    transposed = TopSpace._from_neighbourhood_masks(product.space, product._points, product._neighbourhoods)
+    assert product._dependents == transposed._dependents
+    assert product.closure(Set((1, 'b'))) == Set((1, 'a'), (1, 'b'), (2, 'a'), (2, 'b'), (3, 'a'), (3, 'b'))
@@ -0,0 +1,38 @@
+import json
+
+import pytest
+
+from ..topology import find_homeomorphism
+from ..enumeration import enumerate_topologies, count_topologies
+
+
+def test_count_topologies_up_to_homeomorphism():
+    # OEIS A001930
+    assert [count_topologies(n) for n in range(6)] == [1, 1, 3, 9, 33, 139]
+
+def test_count_labelled_topologies():
+    # OEIS A000798
+    assert [count_topologies(n, up_to_homeomorphism=False) for n in range(6)] == [1, 1, 4, 29, 355, 6942]
+
+def test_enumerated_topologies_are_pairwise_non_homeomorphic():
+    spaces = list(enumerate_topologies(4))
+    assert len(spaces) == 33
+    for idx, X in enumerate(spaces):
+        for Y in spaces[idx + 1:]:
+            assert find_homeomorphism(X, Y) is None
+
+def test_enumerate_topologies_in_parallel():
+    assert count_topologies(5, processes=2) == 139
+    assert len(list(enumerate_topologies(4, up_to_homeomorphism=False, processes=2))) == 355
+
+def test_enumeration_resumes_from_checkpoint(tmp_path):
+    checkpoint = str(tmp_path / 'checkpoint.json')
+    stream = enumerate_topologies(5, checkpoint=checkpoint, shard_depth=3)
+    for _ in range(40):
+        next(stream)
+    stream.close()
+    with open(checkpoint) as f:
+        assert json.load(f)['done']
+    assert count_topologies(5, checkpoint=checkpoint, shard_depth=3) == 139
+    with pytest.raises(ValueError):
+        count_topologies(5, checkpoint=checkpoint, shard_depth=2)
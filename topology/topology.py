@@ -1,23 +1,171 @@
 '''Classes for topological spaces and functions between them'''
 
+import collections
+import collections.abc
+import concurrent.futures
 import copy
+import functools
 import itertools
+import multiprocessing
 
 from common import (
     Function,
     Set,
 )
+from common.instrumentation import instrument
+
+
+def _bits(mask: int):
+    '''Yield the indices of the set bits of a bitmask'''
+    while mask:
+        low = mask & -mask
+        yield low.bit_length() - 1
+        mask ^= low
+
+
+def _upsets(indices, above, below):
+    '''Enumerate the subsets of indices closed under the relation above, as bitmasks
+
+    above[i] is everything that must be included along with i, and below[i] is
+    everything that must be excluded along with i. Every branch of the search
+    produces a result, so this runs in time linear in the number of subsets found.
+    '''
+    stack = [(0, 0, 0)]
+    while stack:
+        depth, included, excluded = stack.pop()
+        if depth == len(indices):
+            yield included
+            continue
+        bit = 1 << indices[depth]
+        if not included & bit:
+            stack.append((depth + 1, included, excluded | below[indices[depth]]))
+        if not excluded & bit:
+            stack.append((depth + 1, included | above[indices[depth]], excluded))
+
+
+def _unclosed_pair_in_rows(masks: list, mask_set: set, rows, stop=None):
+    '''Find a pair of masks whose union or intersection is missing from mask_set
+
+    Only pairs (masks[i], masks[j]) with i in rows and j > i are checked.
+    Returns (operation, mask1, mask2) for the first counterexample, or None.
+    '''
+    for i in rows:
+        if stop is not None and stop.is_set():
+            return None
+        mask1 = masks[i]
+        for mask2 in masks[i + 1:]:
+            intersection = mask1 & mask2
+            # Nested sets are trivially closed under unions and intersections
+            if intersection == mask1 or intersection == mask2:
+                continue
+            if mask1 | mask2 not in mask_set:
+                return ('unions', mask1, mask2)
+            if intersection not in mask_set:
+                return ('intersections', mask1, mask2)
+    return None
+
+
+# State shared with closure-checking worker processes, set by _init_closure_worker
+_worker_masks = None
+_worker_mask_set = None
+_worker_stop = None
+
+
+def _init_closure_worker(masks: list, stop) -> None:
+    global _worker_masks, _worker_mask_set, _worker_stop
+    _worker_masks = masks
+    _worker_mask_set = set(masks)
+    _worker_stop = stop
+
+
+def _closure_worker(rows: range):
+    counterexample = _unclosed_pair_in_rows(_worker_masks, _worker_mask_set, rows, _worker_stop)
+    if counterexample is not None:
+        _worker_stop.set()
+    return counterexample
+
+
+@instrument('TopSpace.closure_check', sizes=lambda masks, processes=None: {'open_sets': len(masks)})
+def _unclosed_pair(masks: set, processes: int = None):
+    '''Find a pair of open set bitmasks that breaks closure under unions or intersections
+
+    With processes > 1 the O(k^2) pair space is split by rows across a process
+    pool, and all workers stop as soon as any of them finds a counterexample.
+    '''
+    masks = sorted(masks)
+    if not processes or processes < 2 or len(masks) < 2:
+        return _unclosed_pair_in_rows(masks, set(masks), range(len(masks)))
+    # Interleave rows so every shard gets a similar share of the triangular pair space
+    shards = [range(start, len(masks), processes * 8) for start in range(processes * 8)]
+    stop = multiprocessing.Event()
+    with concurrent.futures.ProcessPoolExecutor(processes, initializer=_init_closure_worker,
+                                                initargs=(masks, stop)) as executor:
+        futures = [executor.submit(_closure_worker, shard) for shard in shards]
+        for future in concurrent.futures.as_completed(futures):
+            counterexample = future.result()
+            if counterexample is not None:
+                for pending in futures:
+                    pending.cancel()
+                return counterexample
+    return None
+
+
+class OpenSets(collections.abc.Set):
+    '''Lazily enumerated view of the open sets of a TopSpace
+
+    Membership is an up-set test against the minimal neighbourhoods and
+    nothing is stored; iterating enumerates the open sets on demand.
+    '''
+
+    def __init__(self, top) -> None:
+        self._top = top
+        self._len = None
+
+    def __contains__(self, subset) -> bool:
+        if not isinstance(subset, Set) or not subset <= self._top.space:
+            return False
+        return self._top.is_open(subset)
+
+    def __iter__(self):
+        for mask in self._top._open_masks():
+            yield self._top.from_mask(mask)
+
+    def __len__(self) -> int:
+        if self._len is None:
+            self._len = sum(1 for _ in self._top._open_masks())
+        return self._len
+
+    def __repr__(self):
+        return '{{{}}}'.format(', '.join(map(repr, self)))
 
 
 class TopSpace:
     '''Topological space
 
+    A finite topology is stored as the minimal open neighbourhood of each point
+    (equivalently its specialization preorder) rather than as its open sets,
+    which are the unions of minimal neighbourhoods.
+
     Attributes:
-        open_sets (Set[Set]): the open sets in the topology
         space (Set): the underlying space
+
+    Properties:
+        open_sets (OpenSets): a lazily enumerated view of the open sets in the topology
+        neighbourhoods (dict): each point's minimal open neighbourhood
+        specialization_order (Set): pairs (x, y) with x in the closure of {y}
+        connected_components (Set[Set]): the connected components of the space
+        path_components (Set[Set]): the path components of the space
+        kolmogorov_quotient (TopSpace): the T0 quotient of the space
+        is_connected, is_path_connected, is_T0, is_T1 (bool): structural properties
+        fingerprint (tuple): homeomorphism invariants for quickly telling spaces apart
     '''
 
-    def __init__(self, space: Set, open_sets: Set) -> None:
+    # Number of subsets whose closure and derived set are remembered per space
+    cache_size = 4096
+
+    @instrument('TopSpace.__init__', sizes=lambda self, space, open_sets, processes=None:
+                {'points': len(space), 'open_sets': len(open_sets)})
+    def __init__(self, space: Set, open_sets: Set, processes: int = None) -> None:
         # Check that all open sets are of type Set
         if not all([isinstance(x, Set) for x in open_sets]):
             raise TypeError('all open sets must be of type Set')
@@ -30,14 +178,120 @@ class TopSpace:
         # Check that every open set is a subset of the space
         if not all([open_set <= space for open_set in open_sets]):
             raise ValueError('all open sets must be subsets of the space')
-        # Check pairwise unions
-        if not self.pairwise_unions(open_sets):
-            raise ValueError('open sets must be closed under unions')
-        # Check pairwise intersections
-        if not self.pairwise_intersections(open_sets):
-            raise ValueError('open sets must be closed under intersections')
-        self.open_sets = open_sets
+        self._index_points(space)
+        # Encode the open sets as bitmasks so closure can be checked with bit operations
+        masks = set([self.to_mask(open_set) for open_set in open_sets])
+        # Check pairwise unions and intersections
+        counterexample = _unclosed_pair(masks, processes)
+        if counterexample is not None:
+            operation, mask1, mask2 = counterexample
+            raise ValueError('open sets must be closed under {} (counterexample: {} and {})'.format(
+                operation, self.from_mask(mask1), self.from_mask(mask2)))
+        # The minimal neighbourhood of a point is the intersection of the open sets containing it
+        neighbourhoods = [self._full] * len(self._points)
+        for mask in masks:
+            for idx in _bits(mask):
+                neighbourhoods[idx] &= mask
+        self._set_neighbourhoods(neighbourhoods)
+
+    def _index_points(self, space: Set, points=None) -> None:
+        '''Fix an ordering of the points (space's own unless given) so subsets can be
+        encoded as bitmasks'''
         self.space = space
+        self._points = tuple(space if points is None else points)
+        self._index = {point: idx for idx, point in enumerate(self._points)}
+        self._full = (1 << len(self._points)) - 1
+
+    def _set_neighbourhoods(self, neighbourhoods: list, dependents: list = None) -> None:
+        '''Store the minimal neighbourhoods (as bitmasks) and their transpose, which is
+        computed unless given'''
+        self._neighbourhoods = neighbourhoods
+        # _dependents[x] holds every point whose minimal neighbourhood contains x
+        if dependents is None:
+            dependents = [0] * len(neighbourhoods)
+            for idx, mask in enumerate(neighbourhoods):
+                for other in _bits(mask):
+                    dependents[other] |= 1 << idx
+        self._dependents = dependents
+        # Repeated closure queries are served from per-space LRU caches keyed by subset.
+        # Plain OrderedDicts keep spaces picklable and free of reference cycles.
+        self._closure_cache = collections.OrderedDict()
+        self._derived_cache = collections.OrderedDict()
+
+    def _cached(self, cache: collections.OrderedDict, compute, mask: int) -> int:
+        '''Look a subset up in an LRU cache, computing and storing its value on a miss'''
+        if mask in cache:
+            cache.move_to_end(mask)
+            return cache[mask]
+        value = cache[mask] = compute(mask)
+        if len(cache) > self.cache_size:
+            cache.popitem(last=False)
+        return value
+
+    def _closure_mask(self, mask: int) -> int:
+        return self._cached(self._closure_cache, self._compute_closure_mask, mask)
+
+    def _derived_mask(self, mask: int) -> int:
+        return self._cached(self._derived_cache, self._compute_derived_mask, mask)
+
+    def _compute_closure_mask(self, mask: int) -> int:
+        '''A point is in the closure of A exactly when its minimal neighbourhood meets A'''
+        closure = 0
+        for idx in _bits(mask):
+            closure |= self._dependents[idx]
+        return closure
+
+    def _compute_derived_mask(self, mask: int) -> int:
+        '''A point is a limit point of A when its minimal neighbourhood meets A minus itself'''
+        derived = 0
+        for idx in _bits(mask):
+            derived |= self._dependents[idx] & ~(1 << idx)
+        return derived
+
+    def _interior_mask(self, mask: int) -> int:
+        # The interior is the complement of the closure of the complement
+        return self._full & ~self._closure_mask(self._full & ~mask)
+
+    @classmethod
+    def _from_neighbourhood_masks(cls, space: Set, points: tuple, neighbourhoods: list,
+                                  dependents: list = None):
+        '''Construct a topological space from already validated neighbourhood bitmasks'''
+        top = cls.__new__(cls)
+        top._index_points(space, points)
+        top._set_neighbourhoods(neighbourhoods, dependents)
+        return top
+
+    @property
+    def open_sets(self) -> OpenSets:
+        '''The open sets in the topology, enumerated on demand'''
+        return OpenSets(self)
+
+    @property
+    def neighbourhoods(self) -> dict:
+        '''Each point's minimal open neighbourhood'''
+        return {point: self.from_mask(mask)
+                for point, mask in zip(self._points, self._neighbourhoods)}
+
+    def to_mask(self, subset) -> int:
+        '''Encode a subset of the space as a bitmask'''
+        mask = 0
+        for point in subset:
+            if point not in self._index:
+                raise ValueError('{} is not in the space'.format(point))
+            mask |= 1 << self._index[point]
+        return mask
+
+    def from_mask(self, mask: int) -> Set:
+        '''Decode a bitmask into a subset of the space'''
+        return Set(*[self._points[idx] for idx in _bits(mask)])
+
+    def _open_masks(self):
+        '''Enumerate the open sets as bitmasks'''
+        return _upsets(range(len(self._points)), self._neighbourhoods, self._dependents)
+
+    def _is_open_mask(self, mask: int) -> bool:
+        '''Check whether a bitmask is an up-set of the specialization preorder'''
+        return all([not self._neighbourhoods[idx] & ~mask for idx in _bits(mask)])
 
     def __contains__(self, element):
         '''Check whether an element is in the topological space'''
@@ -49,20 +303,185 @@ class TopSpace:
     def __mul__(self, other):
         '''Given two topological spaces, return their product space'''
         # Create the product space from the cartestian product of self.space and other.space
-        product_space = itertools.product(self.space, other.space)
-        # Create a basis for the product topology from the cartesian products of open sets
-        product_basis = [itertools.product(set1, set2)
-                         for set1 in self.open_sets
-                         for set2 in other.open_sets]
-        # Create a topology from the basis
-        product = TopSpace.from_basis(product_space, list(map(set, product_basis)))
+        points = tuple(itertools.product(self._points, other._points))
+        width = len(other._points)
+        # The minimal neighbourhood of (x, y) is N(x) x N(y). Spreading N(x) out to one bit
+        # per row of width len(other) turns that product into a single multiplication.
+        # The transpose is a product in the same way, D((x, y)) = D(x) x D(y), which
+        # saves transposing the product's neighbourhoods bit by bit.
+        def products(left, right):
+            spread = [sum([1 << (idx * width) for idx in _bits(mask)]) for mask in left]
+            return [row * mask for row in spread for mask in right]
+        neighbourhoods = products(self._neighbourhoods, other._neighbourhoods)
+        dependents = products(self._dependents, other._dependents)
+        product = TopSpace._from_neighbourhood_masks(Set(*points), points, neighbourhoods, dependents)
         return product
 
+    def subspace(self, subset: Set):
+        '''Get a subset of the space with the subspace topology'''
+        if not subset <= self.space:
+            raise ValueError('{} is not a subset of the space'.format(subset))
+        # Relabel the points of subset and intersect their neighbourhoods with it
+        kept = [idx for idx, point in enumerate(self._points) if point in subset]
+        relabel = {idx: new_idx for new_idx, idx in enumerate(kept)}
+        subset_mask = self.to_mask(subset)
+        neighbourhoods = [sum([1 << relabel[other] for other in _bits(self._neighbourhoods[idx] & subset_mask)])
+                          for idx in kept]
+        points = [self._points[idx] for idx in kept]
+        return TopSpace._from_neighbourhood_masks(subset, points, neighbourhoods)
+
+    def quotient(self, partition):
+        '''Get the quotient space whose points are the blocks of a partition of the space'''
+        blocks = list(partition)
+        # Check that the blocks are disjoint Sets which cover the space
+        if not all([isinstance(block, Set) for block in blocks]):
+            raise TypeError('all blocks of the partition must be of type Set')
+        block_of = {}
+        for block_idx, block in enumerate(blocks):
+            if not block:
+                raise ValueError('blocks of a partition must be nonempty')
+            for point in block:
+                if point not in self.space:
+                    raise ValueError('{} is not in the space'.format(point))
+                if point in block_of:
+                    raise ValueError('blocks of a partition must be disjoint')
+                block_of[point] = block_idx
+        if len(block_of) != len(self._points):
+            raise ValueError('the blocks of a partition must cover the space')
+        # A set of blocks is open when its preimage is, i.e. when it contains every block
+        # that meets N(x) for x in one of its blocks. Minimal neighbourhoods of blocks are
+        # the sets of blocks reachable along that relation.
+        point_blocks = [block_of[point] for point in self._points]
+        direct = [0] * len(blocks)
+        for idx, mask in enumerate(self._neighbourhoods):
+            for other in _bits(mask):
+                direct[point_blocks[idx]] |= 1 << point_blocks[other]
+        neighbourhoods = []
+        for block_idx in range(len(blocks)):
+            reached = frontier = 1 << block_idx
+            while frontier:
+                step = 0
+                for other in _bits(frontier):
+                    step |= direct[other]
+                frontier = step & ~reached
+                reached |= frontier
+            neighbourhoods.append(reached)
+        return TopSpace._from_neighbourhood_masks(Set(*blocks), blocks, neighbourhoods)
+
+    @functools.cached_property
+    def specialization_order(self) -> Set:
+        '''The specialization preorder, as pairs (x, y) with x in the closure of {y}'''
+        # x is in the closure of {y} exactly when y is in the minimal neighbourhood of x
+        return Set(*[(self._points[idx], self._points[other])
+                     for idx, mask in enumerate(self._neighbourhoods) for other in _bits(mask)])
+
+    @functools.cached_property
+    def _component_masks(self) -> list:
+        '''Bitmasks of the connected components, found by union-find over the preorder'''
+        parent = list(range(len(self._points)))
+
+        def find(idx):
+            while parent[idx] != idx:
+                parent[idx] = parent[parent[idx]]
+                idx = parent[idx]
+            return idx
+
+        for idx, mask in enumerate(self._neighbourhoods):
+            for other in _bits(mask):
+                root, other_root = find(idx), find(other)
+                if root != other_root:
+                    parent[other_root] = root
+        components = collections.defaultdict(int)
+        for idx in range(len(self._points)):
+            components[find(idx)] |= 1 << idx
+        return list(components.values())
+
+    @functools.cached_property
+    def connected_components(self) -> Set:
+        '''The connected components of the space'''
+        return Set(*[self.from_mask(mask) for mask in self._component_masks])
+
+    @property
+    def path_components(self) -> Set:
+        '''The path components of the space
+
+        Finite spaces are locally path connected, so these are the connected components.
+        '''
+        return self.connected_components
+
+    @property
+    def is_connected(self) -> bool:
+        '''Check whether the space is connected'''
+        return len(self._component_masks) <= 1
+
+    @property
+    def is_path_connected(self) -> bool:
+        '''Check whether the space is path connected'''
+        return self.is_connected
+
+    @functools.cached_property
+    def _equivalence_classes(self) -> dict:
+        '''Group the points into the strongly connected components of the preorder
+
+        The preorder is transitive, so these are just the points sharing a minimal
+        neighbourhood, keyed by that neighbourhood.
+        '''
+        classes = collections.defaultdict(int)
+        for idx, mask in enumerate(self._neighbourhoods):
+            classes[mask] |= 1 << idx
+        return classes
+
+    @functools.cached_property
+    def kolmogorov_quotient(self):
+        '''The T0 quotient, whose points are the classes of topologically indistinguishable points'''
+        classes = self._equivalence_classes
+        blocks = [self.from_mask(mask) for mask in classes.values()]
+        class_of = [0] * len(self._points)
+        for class_idx, mask in enumerate(classes.values()):
+            for idx in _bits(mask):
+                class_of[idx] = class_idx
+        # The condensation of the preorder is a partial order on the classes
+        neighbourhoods = []
+        for nbhd in classes:
+            mask = 0
+            for idx in _bits(nbhd):
+                mask |= 1 << class_of[idx]
+            neighbourhoods.append(mask)
+        return TopSpace._from_neighbourhood_masks(Set(*blocks), blocks, neighbourhoods)
+
+    @property
+    def is_T0(self) -> bool:
+        '''Check whether distinct points always have distinct neighbourhoods'''
+        return len(self._equivalence_classes) == len(self._points)
+
+    @property
+    def is_T1(self) -> bool:
+        '''Check whether points are closed (for finite spaces, whether the space is discrete)'''
+        return all([mask == 1 << idx for idx, mask in enumerate(self._neighbourhoods)])
+
+    @functools.cached_property
+    def fingerprint(self) -> tuple:
+        '''A compact homeomorphism invariant: spaces with different fingerprints are not homeomorphic
+
+        It records the number of points, the sorted sizes of the connected components
+        and of the T0 classes, and the histogram of (|N(x)|, |{y : x in N(y)}|).
+        '''
+        sizes = collections.Counter([(bin(nbhd).count('1'), bin(dep).count('1'))
+                                     for nbhd, dep in zip(self._neighbourhoods, self._dependents)])
+        return (len(self._points),
+                tuple(sorted([bin(mask).count('1') for mask in self._component_masks])),
+                tuple(sorted([bin(mask).count('1') for mask in self._equivalence_classes.values()])),
+                tuple(sorted(sizes.items())))
+
     def __eq__(self, other) -> bool:
         '''Check whether two topological spaces are equal'''
         # Topological spaces are equal if their underlying spaces are equal
-        # and they have the same open sets
-        return self.space == other.space and self.open_sets == other.open_sets
+        # and every point has the same minimal neighbourhood
+        if self.space != other.space:
+            return False
+        return all([self.from_mask(self._neighbourhoods[self._index[point]])
+                     == other.from_mask(other._neighbourhoods[other._index[point]])
+                     for point in self._points])
 
     def __le__(self, other) -> bool:
         '''Check whether a space is a subset of another'''
@@ -92,12 +511,59 @@ class TopSpace:
         except:
             return other < self.space
 
+    def is_open(self, subset: Set) -> bool:
+        '''Check whether a subset of a topological space is open'''
+        # A set is open if it contains the minimal neighbourhood of each of its points
+        return self._is_open_mask(self.to_mask(subset))
+
     def is_closed(self, subset: Set) -> bool:
         '''Check whether a subset of a topological space is closed'''
         # A set is closed if its complement is open
-        return self.space - subset in self.open_sets
+        return self._is_open_mask(self._full & ~self.to_mask(subset))
+
+    def closure(self, subset: Set) -> Set:
+        '''Get the closure of a subset (the smallest closed set containing it)'''
+        return self.from_mask(self._closure_mask(self.to_mask(subset)))
+
+    def interior(self, subset: Set) -> Set:
+        '''Get the interior of a subset (the largest open set contained in it)'''
+        return self.from_mask(self._interior_mask(self.to_mask(subset)))
+
+    def boundary(self, subset: Set) -> Set:
+        '''Get the boundary of a subset (its closure minus its interior)'''
+        mask = self.to_mask(subset)
+        return self.from_mask(self._closure_mask(mask) & ~self._interior_mask(mask))
+
+    def derived_set(self, subset: Set) -> Set:
+        '''Get the derived set of a subset (the set of its limit points)'''
+        return self.from_mask(self._derived_mask(self.to_mask(subset)))
+
+    def is_dense(self, subset: Set) -> bool:
+        '''Check whether a subset is dense (its closure is the whole space)'''
+        return self._closure_mask(self.to_mask(subset)) == self._full
+
+    def closures(self, masks) -> list:
+        '''Get the closures of many subsets, given and returned as bitmasks (see to_mask)'''
+        return [self._closure_mask(mask) for mask in masks]
+
+    def interiors(self, masks) -> list:
+        '''Get the interiors of many subsets, given and returned as bitmasks'''
+        return [self._interior_mask(mask) for mask in masks]
+
+    def boundaries(self, masks) -> list:
+        '''Get the boundaries of many subsets, given and returned as bitmasks'''
+        return [self._closure_mask(mask) & ~self._interior_mask(mask) for mask in masks]
+
+    def derived_sets(self, masks) -> list:
+        '''Get the derived sets of many subsets, given and returned as bitmasks'''
+        return [self._derived_mask(mask) for mask in masks]
+
+    def are_dense(self, masks) -> list:
+        '''Check whether each of many subsets, given as bitmasks, is dense'''
+        return [self._closure_mask(mask) == self._full for mask in masks]
 
     @staticmethod
+    @instrument('TopSpace.pairwise_unions', sizes=lambda subsets: {'subsets': len(subsets)})
     def pairwise_unions(subsets: Set) -> bool:
         '''Check whether a collection of subsets is closed under pairwise unions'''
         # Loop through all distinct pairs of sets in subsets
@@ -108,6 +574,7 @@ class TopSpace:
         return True
 
     @staticmethod
+    @instrument('TopSpace.pairwise_intersections', sizes=lambda subsets: {'subsets': len(subsets)})
     def pairwise_intersections(subsets: Set) -> bool:
         '''Check whether a collection of subsets is closed under pairwise intersections'''
         # Loop through all distinct pairs of sets in subsets
@@ -147,6 +614,8 @@ class TopSpace:
         return True
 
     @classmethod
+    @instrument('TopSpace.from_subbasis', sizes=lambda cls, space, subbasis:
+                {'points': len(space), 'subbasis': len(subbasis)})
     def from_subbasis(cls, space: Set, subbasis: Set):
         '''Construct a topological space from a subbasis
 
@@ -175,6 +644,36 @@ class TopSpace:
         return top
 
     @classmethod
+    def from_neighbourhoods(cls, space: Set, neighbourhoods: dict):
+        '''Construct a topological space from the minimal open neighbourhood of each point
+
+        The neighbourhoods must describe a preorder: every point lies in its own
+        neighbourhood and the neighbourhood of any point in N(x) is contained in N(x).
+        '''
+        # Check that every point has a neighbourhood
+        if not all([point in neighbourhoods for point in space]):
+            raise ValueError('every point must have a minimal neighbourhood')
+        if not all([point in space for point in neighbourhoods]):
+            raise ValueError('neighbourhoods must be indexed by points of the space')
+        # Check that all neighbourhoods are of type Set
+        if not all([isinstance(x, Set) for x in neighbourhoods.values()]):
+            raise TypeError('all neighbourhoods must be of type Set')
+        top = cls.__new__(cls)
+        top._index_points(space)
+        masks = [top.to_mask(neighbourhoods[point]) for point in top._points]
+        for idx, mask in enumerate(masks):
+            # Check that each point is in its own neighbourhood
+            if not mask >> idx & 1:
+                raise ValueError('{} is not in its own neighbourhood'.format(top._points[idx]))
+            # Check that the specialization preorder is transitive
+            if any([masks[other] & ~mask for other in _bits(mask)]):
+                raise ValueError('the neighbourhood of {} is not open'.format(top._points[idx]))
+        top._set_neighbourhoods(masks)
+        return top
+
+    @classmethod
+    @instrument('TopSpace.from_basis', sizes=lambda cls, space, basis:
+                {'points': len(space), 'basis': len(basis)})
     def from_basis(cls, space: Set, basis: Set):
         '''Construct a topological space from a basis
 
@@ -220,6 +719,11 @@ class TopFunction(Function):
         if not isinstance(domain, TopSpace) or not isinstance(codomain, TopSpace):
             raise TypeError('domain and codomain must be of type TopSpace')
         super().__init__(mapping, domain, codomain)
+        # Index the mapping once so preimages are unions of precomputed fiber bitmasks
+        self._images = [codomain._index[mapping[point]] for point in domain._points]
+        self._fibers = [0] * len(codomain._points)
+        for idx, image in enumerate(self._images):
+            self._fibers[image] |= 1 << idx
 
     def __matmul__(self, other):
         '''Create a new function from the composition self . other'''
@@ -234,12 +738,59 @@ class TopFunction(Function):
         mapping = {v: k for k, v in self.mapping.items()}
         return TopFunction(mapping, self.codomain, self.domain)
 
+    @instrument('TopFunction.fiber', sizes=lambda self, value: {'domain': len(self.domain._points)})
+    def fiber(self, value):
+        '''Get the preimage of a single value in the codomain'''
+        if value not in self.codomain:
+            raise ValueError('{} is not in the codomain'.format(value))
+        return self.domain.from_mask(self._fibers[self.codomain._index[value]])
+
+    def preimage(self, subset: Set):
+        '''Get the preimage of a subset of the codomain'''
+        if not subset <= self.codomain.space:
+            raise ValueError('{} if not a subset of the codomain'.format(subset))
+        return self.domain.from_mask(self.preimage_mask(self.codomain.to_mask(subset)))
+
+    def preimage_mask(self, mask: int) -> int:
+        '''Get the preimage of a subset of the codomain, given and returned as a bitmask'''
+        preimage = 0
+        for idx in _bits(mask):
+            preimage |= self._fibers[idx]
+        return preimage
+
+    def image_mask(self, mask: int) -> int:
+        '''Get the image of a subset of the domain, given and returned as a bitmask'''
+        image = 0
+        for idx in _bits(mask):
+            image |= 1 << self._images[idx]
+        return image
+
+    @property
+    def is_injective(self):
+        '''Check whether the function is an injection'''
+        return len(set(self._images)) == len(self._images)
+
+    @property
+    def is_surjective(self):
+        '''Check whether the function is a surjection'''
+        return all(self._fibers)
+
+    def is_continuous_on(self, subbasis) -> bool:
+        '''Check continuity against a basis or subbasis of the codomain's topology
+
+        A function is continuous as soon as the preimage of every subbasis element
+        is open, so only len(subbasis) preimages need to be tested.
+        '''
+        masks = [self.codomain.to_mask(subset) for subset in subbasis]
+        return all([self.domain._is_open_mask(self.preimage_mask(mask)) for mask in masks])
+
     @property
     def is_continuous(self):
         '''Check whether a function between topological spaces is continuous'''
-        # Check that the preimage of any open set is open
-        return all([self.preimage(open_set) in self.domain.open_sets
-                    for open_set in self.codomain.open_sets])
+        # The minimal neighbourhoods form a basis of the codomain, so it is enough
+        # to check that each of their preimages is open
+        return all([self.domain._is_open_mask(self.preimage_mask(mask))
+                    for mask in self.codomain._neighbourhoods])
 
     @property
     def is_homeomorphism(self):
@@ -247,10 +798,100 @@ class TopFunction(Function):
         # Check that the function is bijective
         if not self.is_bijective:
             return False
-        # Check that the function is continuous
-        if not self.is_continuous:
-            return False
-        # Check that the function's inverse is continuous
-        if not self.inverse.is_continuous:
-            return False
-        return True
\ No newline at end of file
+        # A bijection is a homeomorphism exactly when it maps every minimal
+        # neighbourhood onto the minimal neighbourhood of the image point
+        codomain_neighbourhoods = self.codomain._neighbourhoods
+        return all([self.image_mask(mask) == codomain_neighbourhoods[self._images[idx]]
+                    for idx, mask in enumerate(self.domain._neighbourhoods)])
+
+
+def _refine_colours(*preorders) -> list:
+    '''Label the points of several preorders with isomorphism-invariant colours
+
+    Each preorder is given as a pair (neighbourhoods, dependents) of bitmask lists.
+    Points start out coloured by the sizes of their minimal neighbourhood and its
+    transpose, and colours are refined by the colours of those neighbours until
+    stable. Colour ids are numbered in sorted order of their signatures, so they
+    do not depend on how the points are labelled and are comparable across the
+    preorders: any isomorphism between them must preserve colours.
+    '''
+    colours = [[(bin(nbhd).count('1'), bin(dep).count('1'))
+                for nbhd, dep in zip(neighbourhoods, dependents)]
+               for neighbourhoods, dependents in preorders]
+    classes = None
+    while True:
+        ids = {colour: idx for idx, colour in
+               enumerate(sorted(set([colour for space_colours in colours for colour in space_colours])))}
+        colours = [[ids[colour] for colour in space_colours] for space_colours in colours]
+        if len(ids) == classes:
+            return colours
+        classes = len(ids)
+        colours = [[(space_colours[idx],
+                     tuple(sorted([space_colours[other] for other in _bits(nbhd)])),
+                     tuple(sorted([space_colours[other] for other in _bits(dep)])))
+                    for idx, (nbhd, dep) in enumerate(zip(neighbourhoods, dependents))]
+                   for (neighbourhoods, dependents), space_colours in zip(preorders, colours)]
+
+
+def _point_invariants(*spaces) -> list:
+    '''Label the points of several spaces with shared homeomorphism-invariant colours'''
+    return _refine_colours(*[(top._neighbourhoods, top._dependents) for top in spaces])
+
+
+def find_homeomorphism(X: TopSpace, Y: TopSpace):
+    '''Search for a homeomorphism from X to Y, returning a TopFunction or None
+
+    Candidate images are restricted to points with the same refined invariants
+    (neighbourhood-size histograms and their refinements), and partial maps are
+    extended one point at a time, checking the preorder against the points
+    already mapped.
+    '''
+    if X.fingerprint != Y.fingerprint:
+        return None
+    colours_X, colours_Y = _point_invariants(X, Y)
+    if sorted(colours_X) != sorted(colours_Y):
+        return None
+    candidates = collections.defaultdict(list)
+    for idx, colour in enumerate(colours_Y):
+        candidates[colour].append(idx)
+    # Map the most constrained points first
+    order = sorted(range(len(colours_X)), key=lambda idx: len(candidates[colours_X[idx]]))
+    images = [None] * len(order)
+    used = 0
+
+    def consistent(idx, image):
+        for other in order:
+            if images[other] is None:
+                return True
+            if ((X._neighbourhoods[idx] >> other & 1) != (Y._neighbourhoods[image] >> images[other] & 1)
+                    or (X._neighbourhoods[other] >> idx & 1) != (Y._neighbourhoods[images[other]] >> image & 1)):
+                return False
+        return True
+
+    # Depth-first search over an explicit stack of (depth, remaining candidates), so
+    # that large spaces do not run into the recursion limit
+    stack = [(0, iter(candidates[colours_X[order[0]]]))] if order else []
+    found = not order
+    while stack:
+        depth, remaining = stack[-1]
+        idx = order[depth]
+        if images[idx] is not None:
+            # Backtracking: undo this point's last image before trying the next one
+            used &= ~(1 << images[idx])
+            images[idx] = None
+        for image in remaining:
+            if not used >> image & 1 and consistent(idx, image):
+                break
+        else:
+            stack.pop()
+            continue
+        images[idx] = image
+        used |= 1 << image
+        if depth + 1 == len(order):
+            found = True
+            break
+        stack.append((depth + 1, iter(candidates[colours_X[order[depth + 1]]])))
+    if not found:
+        return None
+    mapping = {X._points[idx]: Y._points[image] for idx, image in enumerate(images)}
+    return TopFunction(mapping, X, Y)